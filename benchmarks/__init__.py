@@ -0,0 +1,6 @@
+#!/usr/bin/env python3
+
+#
+# Benchmarks for the draft sheet hot paths. Run from the repository root:
+#   python3 -m benchmarks.bench_validation
+#
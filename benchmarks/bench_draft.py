@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from winona.logic.species_catalog import SpeciesCatalog
+from winona.logic.draft_engine import DraftManager, iter_bits
+from .fixtures import SAMPLE_GAMEMASTER, build_fixture_db
+
+def parse_arguments(argv):
+    """Parses command-line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark the bitset draft engine")
+    parser.add_argument("--gamemaster", default=SAMPLE_GAMEMASTER, help="Gamemaster JSON to build the catalog from")
+    parser.add_argument("--drafts", type=int, default=500, help="Drafts run side by side")
+    parser.add_argument("--players", type=int, default=8, help="Players per draft")
+    parser.add_argument("--ban-rounds", type=int, default=1, help="Ban rounds per draft")
+    parser.add_argument("--pick-rounds", type=int, default=6, help="Pick rounds per draft")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the moves")
+    return parser.parse_args(argv)
+
+def main(argv):
+    args = parse_arguments(argv)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_manager = build_fixture_db(os.path.join(tmp_dir, "bench.db"), args.gamemaster)
+        try:
+            catalog = SpeciesCatalog(db_manager)
+        finally:
+            db_manager.close()
+
+    rng = random.Random(args.seed)
+    manager = DraftManager(catalog)
+    for tournament_id in range(args.drafts):
+        for player in range(args.players):
+            manager.join(tournament_id, player, f"Trainer{player}")
+        manager.start(tournament_id, ban_rounds=args.ban_rounds, pick_rounds=args.pick_rounds)
+
+    moves = 0
+    move_seconds = 0.0
+    listing_seconds = 0.0
+    listings = 0
+    # interleave the drafts, one move each per pass, as concurrent tournaments would
+    active = list(manager.drafts.values())
+    while active:
+        still_active = []
+        for draft in active:
+            start = time.perf_counter()
+            available = list(iter_bits(draft.available_mask()))
+            listing_seconds += time.perf_counter() - start
+            listings += 1
+            species_id_str = catalog.species[rng.choice(available)].species_id_str
+            player = draft.current_player
+            start = time.perf_counter()
+            if draft.status == "banning":
+                draft.ban(player, species_id_str)
+            else:
+                draft.pick(player, species_id_str)
+            move_seconds += time.perf_counter() - start
+            moves += 1
+            if draft.current_player is not None:
+                still_active.append(draft)
+        active = still_active
+
+    checks = 100000
+    draft = manager.get(0)
+    start = time.perf_counter()
+    for i in range(checks):
+        draft.is_available(i % len(catalog))
+    check_seconds = time.perf_counter() - start
+
+    print(f"{len(catalog)} species, {args.drafts} drafts x {args.players} players")
+    print(f"  moves                {moves:8d}  {move_seconds * 1e6 / moves:8.2f} us each")
+    print(f"  available listings   {listings:8d}  {listing_seconds * 1e6 / listings:8.2f} us each")
+    print(f"  availability checks  {checks:8d}  {check_seconds * 1e6 / checks:8.2f} us each")
+    return
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from winona.logic.species_catalog import SpeciesCatalog
+from winona.logic.species_matcher import match_pokemon_batch
+from winona.logic.species_search import SpeciesSearch
+from .bench_validation import best_time
+from .fixtures import SAMPLE_GAMEMASTER, build_fixture_db
+from .sheet_generator import make_typo
+
+DEFAULT_LIMITS = [8, 16, 32, 64]
+DEFAULT_BATCHES = [1, 4, 16, 256]
+
+def parse_arguments(argv):
+    """Parses command-line arguments."""
+    parser = argparse.ArgumentParser(description="Time fuzzy matching and measure the trigram index used by autocomplete")
+    parser.add_argument("--gamemaster", default=SAMPLE_GAMEMASTER, help="Gamemaster JSON to build the catalog from")
+    parser.add_argument("--queries", type=int, default=2000, help="Misspelled names to match")
+    parser.add_argument("--typos", type=int, default=2, help="Most typos applied to each name")
+    parser.add_argument("--limits", type=int, nargs="+", default=DEFAULT_LIMITS, help="Trigram result limits to check")
+    parser.add_argument("--batches", type=int, nargs="+", default=DEFAULT_BATCHES, help="Batch sizes to time")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing runs; the best is reported")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the queries")
+    return parser.parse_args(argv)
+
+def make_queries(catalog, count, typos, seed):
+    """
+    Returns (query, intended_name) pairs. Every query has at least one typo,
+    so none of them resolve through the catalog's exact lookups.
+    """
+    rng = random.Random(seed)
+    queries = []
+    while len(queries) < count:
+        name = rng.choice(catalog.names)
+        query = name
+        for _ in range(rng.randint(1, typos)):
+            query = make_typo(query, rng)
+        if catalog.get_by_name(query) is None:
+            queries.append((query, name))
+    return queries
+
+def trigram_recall(catalog, pairs, limit):
+    """
+    Returns the fraction of queries whose intended name is among the trigram index's top limit targets.
+    """
+    index = catalog.trigram_index
+    # the index's targets are positions in catalog.names
+    position_of_name = {name: i for i, name in enumerate(catalog.names)}
+    found = 0
+    for query, name in pairs:
+        if position_of_name[name] in {target for target, _ in index.ranked(query, limit=limit)}:
+            found += 1
+    return found / len(pairs)
+
+def time_batches(catalog, values, batch_size, repeat):
+    """
+    Returns microseconds per query when values are matched batch_size at a time.
+    """
+    batches = [values[i:i + batch_size] for i in range(0, len(values), batch_size)]
+    def run():
+        for batch in batches:
+            match_pokemon_batch(batch, catalog)
+        return
+    return best_time(run, repeat) * 1e6 / len(values)
+
+def time_autocomplete(catalog, pairs):
+    """
+    Times SpeciesSearch.search() on every prefix of every query, the way
+    Discord sends one autocomplete request per keystroke.
+
+    Returns:
+        (searches, mean_seconds, max_seconds)
+    """
+    search = SpeciesSearch(catalog)
+    search.search("")
+    timings = []
+    for query, name in pairs:
+        for end in range(1, len(query) + 1):
+            start = time.perf_counter()
+            search.search(query[:end])
+            timings.append(time.perf_counter() - start)
+    return len(timings), sum(timings) / len(timings), max(timings)
+
+def main(argv):
+    args = parse_arguments(argv)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_manager = build_fixture_db(os.path.join(tmp_dir, "bench.db"), args.gamemaster)
+        try:
+            catalog = SpeciesCatalog(db_manager)
+        finally:
+            db_manager.close()
+
+    pairs = make_queries(catalog, args.queries, args.typos, args.seed)
+    values = [query for query, name in pairs]
+    intended = [name for query, name in pairs]
+    unique = len(set(values))
+    index_seconds = best_time(lambda: SpeciesCatalog(species=catalog.species).trigram_index, args.repeat)
+
+    print(f"{len(catalog)} species, {len(values)} queries ({unique} distinct), "
+          f"index build {index_seconds * 1000:.2f} ms")
+    seconds = best_time(lambda: match_pokemon_batch(values, catalog), args.repeat)
+    matches = match_pokemon_batch(values, catalog)
+    correct = sum(1 for value, name in zip(values, intended) if matches[value] == [name])
+    print(f"  full scan: {seconds * 1000:.2f} ms, {seconds * 1e6 / unique:.1f} us/query, "
+          f"{100.0 * correct / len(values):.1f}% intended")
+
+    print(f"\n  {'batch':>8s} {'us/query':>10s}")
+    for batch_size in args.batches:
+        print(f"  {batch_size:8d} {time_batches(catalog, values, batch_size, args.repeat):10.1f}")
+
+    print(f"\n  {'trigram top-k':>14s} {'intended found':>15s}")
+    for limit in args.limits:
+        print(f"  {limit:14d} {100.0 * trigram_recall(catalog, pairs, limit):14.1f}%")
+
+    searches, mean_seconds, max_seconds = time_autocomplete(catalog, pairs[:200])
+    print(f"\n  autocomplete: {searches} keystrokes, mean {mean_seconds * 1e6:.1f} us, "
+          f"max {max_seconds * 1e6:.1f} us")
+    return
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from winona.logic.species_catalog import SpeciesCatalog
+from winona.logic.species_matcher import match_pokemon_batch
+from winona.logic.sheet_validation import parse_bans_aux, parse_picks_aux, validate_draft_sheet_aux
+from winona.logic.sheet_validation import extract_picks
+from .fixtures import build_fixture_db
+from .sheet_generator import generate_draft_sheet
+
+DEFAULT_SIZES = [16, 64, 256, 1000, 10000]
+
+def parse_arguments(argv):
+    """Parses command-line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark draft sheet validation")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Sheet sizes (trainers) to run")
+    parser.add_argument("--picks", type=int, default=6, help="PICK columns per sheet")
+    parser.add_argument("--typo-rate", type=float, default=0.05, help="Chance a cell is misspelled")
+    parser.add_argument("--duplicate-rate", type=float, default=0.02, help="Chance a pick repeats an earlier one")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing runs per stage; the best is reported")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the sheet generator")
+    return parser.parse_args(argv)
+
+def best_time(func, repeat):
+    """
+    Returns the fastest of repeat wall-clock runs of func(), in seconds.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def peak_memory(func):
+    """
+    Returns the peak bytes allocated by Python while func() runs.
+    Measured in a separate run, since tracemalloc slows everything down.
+    """
+    tracemalloc.start()
+    try:
+        func()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+def run_size(db_manager, catalog, n_trainers, args):
+    """
+    Times every stage for one sheet size.
+
+    Returns:
+        A list of (stage, seconds, peak_bytes).
+    """
+    sheet_df = generate_draft_sheet(catalog, n_trainers, picks=args.picks, typo_rate=args.typo_rate,
+                                    duplicate_rate=args.duplicate_rate, seed=args.seed)
+    values = extract_picks(sheet_df)["value"].tolist()
+    stages = [
+        ("catalog_build", lambda: SpeciesCatalog(db_manager)),
+        ("parse_bans_aux", lambda: parse_bans_aux(catalog, sheet_df)),
+        ("extract_picks", lambda: extract_picks(sheet_df)),
+        ("parse_picks_aux", lambda: parse_picks_aux(sheet_df)),
+        ("match_picks", lambda: match_pokemon_batch(values, catalog)),
+        ("validate_draft_sheet_aux", lambda: validate_draft_sheet_aux(catalog, sheet_df)),
+    ]
+    results = []
+    for name, func in stages:
+        seconds = best_time(func, args.repeat)
+        peak = peak_memory(func)
+        results.append((name, seconds, peak))
+    return results
+
+def report(n_trainers, n_species, results):
+    print(f"\n{n_trainers} trainers, {n_species} species")
+    print(f"  {'stage':28s} {'wall ms':>10s} {'peak KiB':>10s}")
+    for name, seconds, peak in results:
+        print(f"  {name:28s} {seconds * 1000:10.2f} {peak / 1024:10.1f}")
+    return
+
+def main(argv):
+    args = parse_arguments(argv)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_manager = build_fixture_db(os.path.join(tmp_dir, "bench.db"))
+        try:
+            catalog = SpeciesCatalog(db_manager)
+            for n_trainers in args.sizes:
+                results = run_size(db_manager, catalog, n_trainers, args)
+                report(n_trainers, len(catalog), results)
+        finally:
+            db_manager.close()
+    return
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+
+import os
+
+from winona.database import DatabaseManager
+from winona.cli.ingest_pokemon_list import load_json, species_from_entry
+
+# A few hundred entries in pvpoke's pokemon.json format, with regional,
+# shadow and mega forms, so benchmarks do not need the pvpoke checkout.
+SAMPLE_GAMEMASTER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "gamemaster_sample.json")
+
+def build_fixture_db(db_file, source_json=SAMPLE_GAMEMASTER):
+    """
+    Creates a species database from a gamemaster file.
+
+    Args:
+        db_file (str): Path of the SQLite file to create or replace.
+        source_json (str): Gamemaster JSON to ingest.
+
+    Returns:
+        An open DatabaseManager for db_file. The caller closes it.
+    """
+    data = load_json(source_json)
+    db_manager = DatabaseManager(db_file)
+    db_manager.replace_pokemon_species_table([species_from_entry(entry) for entry in data])
+    db_manager.migrate()
+    return db_manager
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+import random
+
+import pandas as pd
+
+def make_typo(text, rng):
+    """
+    Returns text with one small, human-looking mistake.
+    """
+    if len(text) < 2:
+        return text + text
+    i = rng.randrange(len(text) - 1)
+    kind = rng.randrange(5)
+    if kind == 0:
+        # swap two neighbours
+        return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+    elif kind == 1:
+        # drop a character
+        return text[:i] + text[i + 1:]
+    elif kind == 2:
+        # double a character
+        return text[:i] + text[i] + text[i:]
+    elif kind == 3:
+        return text.lower()
+    else:
+        # trailing space, common when pasting
+        return text + " "
+
+def ban_string(catalog, dex):
+    """
+    Returns the well formed ban string for a dex number.
+    """
+    return ",".join(sorted(p.species_id_str.lower() for p in catalog.get_by_dex(dex)))
+
+def generate_draft_sheet(catalog, n_trainers, picks=6, typo_rate=0.05, duplicate_rate=0.02, seed=0):
+    """
+    Builds a DataFrame shaped like the draft Google Sheet.
+
+    Columns are Trainer, BAN and PICK 1..PICK n. Picks are drawn from the
+    catalog without replacement until it runs out, then reshuffled, so
+    large sheets also contain natural duplicates.
+
+    Args:
+        catalog (SpeciesCatalog): Source of names and ban strings.
+        n_trainers (int): Number of rows.
+        picks (int): Number of PICK columns.
+        typo_rate (float): Chance that a pick or ban cell is misspelled.
+        duplicate_rate (float): Chance that a pick repeats an earlier pick.
+        seed (int): Random seed, so runs are comparable.
+
+    Returns:
+        A pandas DataFrame.
+    """
+    rng = random.Random(seed)
+    names = list(catalog.names)
+    dexes = sorted(catalog.by_dex)
+    trainers = [f"Trainer{i:05d}" for i in range(n_trainers)]
+
+    bans = []
+    for _ in trainers:
+        ban = ban_string(catalog, rng.choice(dexes))
+        if rng.random() < typo_rate:
+            ban = make_typo(ban, rng)
+        bans.append(ban)
+
+    pool = []
+    taken = []
+    columns = {}
+    for n in range(1, picks + 1):
+        column = []
+        for _ in trainers:
+            if taken and rng.random() < duplicate_rate:
+                name = rng.choice(taken)
+            else:
+                if not pool:
+                    pool = names[:]
+                    rng.shuffle(pool)
+                name = pool.pop()
+            taken.append(name)
+            if rng.random() < typo_rate:
+                name = make_typo(name, rng)
+            column.append(name)
+        columns[f"PICK {n}"] = column
+
+    data = {"Trainer": trainers, "BAN": bans}
+    data.update(columns)
+    return pd.DataFrame(data)
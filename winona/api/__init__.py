@@ -1,3 +1,3 @@
 #!/usr/bin/env python3
 
-from .google_api import read_public_google_sheet
+from .google_api import read_public_google_sheet, read_public_google_sheet_async
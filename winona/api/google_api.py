@@ -1,7 +1,85 @@
 #!/usr/bin/env python3
 
+import asyncio
+import io
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 
+# seconds allowed for one download, connect through parse
+DEFAULT_FETCH_TIMEOUT = 20.0
+# downloads allowed to run at the same time from the bot
+MAX_CONCURRENT_FETCHES = 4
+# most bytes taken from one socket read; the deadline is checked between reads
+FETCH_CHUNK_BYTES = 64 * 1024
+
+_max_concurrent_fetches = MAX_CONCURRENT_FETCHES
+# one thread per download slot, created on first use; a timed-out download keeps its slot until it returns
+_fetch_executor = None
+
+def set_max_concurrent_fetches(count):
+    """
+    Changes how many sheet downloads may run at the same time.
+
+    Args:
+      count: The new limit. Only affects downloads started afterwards.
+    """
+    global _max_concurrent_fetches, _fetch_executor
+    _max_concurrent_fetches = count
+    if _fetch_executor is not None:
+        _fetch_executor.shutdown(wait=False)
+        _fetch_executor = None
+    return
+
+def _get_fetch_executor():
+    global _fetch_executor
+    if _fetch_executor is None:
+        _fetch_executor = ThreadPoolExecutor(max_workers=_max_concurrent_fetches,
+                                             thread_name_prefix="winona-sheet-fetch")
+    return _fetch_executor
+
+def google_sheet_csv_url(public_url):
+    """
+    Converts a Google Sheet edit URL to its CSV export URL.
+    """
+    csv_export_url = public_url.replace('/edit#gid=', '/export?format=csv&gid=')
+    csv_export_url = csv_export_url.replace('/edit?gid=', '/export?format=csv&gid=')
+    return csv_export_url
+
+def _set_read_timeout(response, seconds):
+    # urlopen's timeout is per socket operation; shrink it to what is left of the deadline
+    sock = getattr(getattr(response.fp, "raw", None), "_sock", None)
+    if sock is not None:
+        sock.settimeout(seconds)
+    return
+
+def download_public_google_sheet(public_url, timeout=DEFAULT_FETCH_TIMEOUT):
+    """
+    Downloads and parses a publicly viewable Google Sheet. Blocks, and raises on error.
+
+    Args:
+      public_url: The public URL of the Google Sheet.
+      timeout: Seconds allowed for the whole download. Raises TimeoutError past it.
+
+    Returns:
+      A pandas DataFrame containing the sheet data.
+    """
+    deadline = time.monotonic() + timeout
+    chunks = []
+    with urllib.request.urlopen(google_sheet_csv_url(public_url), timeout=timeout) as response:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"download took longer than {timeout}s")
+            _set_read_timeout(response, remaining)
+            chunk = response.read1(FETCH_CHUNK_BYTES)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return pd.read_csv(io.BytesIO(b"".join(chunks)))
+
 def read_public_google_sheet(public_url):
     """
     Reads the contents of a publicly viewable Google Sheet into a pandas DataFrame.
@@ -14,12 +92,34 @@ def read_public_google_sheet(public_url):
     """
     df = None
     try:
-        # The key part is to modify the URL to the CSV export format
-        csv_export_url = public_url.replace('/edit#gid=', '/export?format=csv&gid=')
-        csv_export_url = public_url.replace('/edit?gid=', '/export?format=csv&gid=')
+        df = download_public_google_sheet(public_url)
+    except Exception as e:
+        print(f"An error occurred: {e}")
+    return df
+
+async def read_public_google_sheet_async(public_url, timeout=DEFAULT_FETCH_TIMEOUT):
+    """
+    Reads a publicly viewable Google Sheet without blocking the event loop.
 
-        # Read the CSV data directly into a pandas DataFrame
-        df = pd.read_csv(csv_export_url)
+    The download and pd.read_csv run on a pool of MAX_CONCURRENT_FETCHES
+    threads; the rest wait their turn. Each download gives up once timeout
+    seconds have passed since it started. Cancelling the caller stops the
+    wait immediately, but a running download keeps its thread, and so its
+    place in the limit, until it returns.
+
+    Args:
+      public_url: The public URL of the Google Sheet.
+      timeout: Seconds allowed for the download once it has started.
+
+    Returns:
+      A pandas DataFrame containing the sheet data, or None if an error occurs.
+    """
+    df = None
+    try:
+        df = await asyncio.get_running_loop().run_in_executor(
+            _get_fetch_executor(), download_public_google_sheet, public_url, timeout)
+    except TimeoutError:
+        print(f"Timed out after {timeout}s reading {public_url}")
     except Exception as e:
         print(f"An error occurred: {e}")
     return df
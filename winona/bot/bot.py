@@ -7,9 +7,34 @@ import atexit
 
 import argparse
 import sys
+import time
 
 from ..database import DatabaseManager
+from ..database.async_database_manager import AsyncDatabaseManager
+from ..logic.species_catalog import SpeciesCatalog
+from ..logic.species_search import SpeciesSearch
+from ..logic.sheet_cache import SheetCache
+from ..logic.match_memo import MatchMemo
+from ..logic.draft_engine import DraftManager, STATUS_COMPLETE
+from ..logic.draft_log import DraftLog
+from .channel_registry import ChannelRegistry
+from .tournament_registry import TournamentRegistry
+from .draft_queue import DraftQueue
+from .report_renderer import ReportCache
+from .job_runner import JobRunner
 from ..cli.cli import g_sheet_url
+from ..utils.metrics import Metrics
+
+METRICS_FILE_SECONDS = 15
+
+def command_name(ctx) -> str:
+    return getattr(ctx, "invoke_target", None) or "unknown"
+
+def command_latency(ctx) -> float:
+    """
+    Seconds since Discord created the interaction, taken from its snowflake id.
+    """
+    return max(0.0, time.time() - ctx.id.created_at.timestamp())
 
 def parse_arguments(argv):
     """Parses command-line arguments."""
@@ -20,6 +45,35 @@ def parse_arguments(argv):
         help="Database filename",
         default="winona.db"
     )
+    parser.add_argument(
+        "--sheet-ttl",
+        help="Seconds a downloaded Google Sheet is reused before fetching it again",
+        type=float,
+        default=60.0
+    )
+    parser.add_argument(
+        "--job-workers",
+        help="Slow commands that may run at the same time",
+        type=int,
+        default=4
+    )
+    parser.add_argument(
+        "--metrics-file",
+        help="Write Prometheus metrics to this file every few seconds",
+        default=None
+    )
+    parser.add_argument(
+        "--metrics-port",
+        help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics; 0 disables",
+        type=int,
+        default=0
+    )
+    parser.add_argument(
+        "--guild-poll",
+        help="Seconds between checks for guild channel changes made outside the bot",
+        type=float,
+        default=10.0
+    )
 
     return parser.parse_args(argv)
 
@@ -33,7 +87,7 @@ def getenv_int(token):
     return i
 
 def getenv_int_list(token):
-    strings = os.getenv(token)
+    strings = os.getenv(token) or ""
     numbers = []
     for s in strings.split(','):
         i = -1
@@ -47,29 +101,86 @@ def getenv_int_list(token):
 
 class WinonaBot:
     def __init__(self, args=None):
+        dotenv.load_dotenv()
         if args is not None:
             db_file = args.db_file
             if os.path.exists(db_file):
                 self.db_manager = DatabaseManager(db_file)
+                self.db_manager.migrate()
             else:
                 raise Exception(f"{db_file} does not exist.")
         else:
             self.db_manager = None
         self.sheet_url = g_sheet_url
 
+        # command latency, errors, sheet and database timings; see /winona admin stats
+        self.metrics = Metrics()
+        self.metrics.describe("winona_command_seconds", "Seconds from the interaction to the end of its handler.")
+        self.metrics.describe("winona_command_errors_total", "Commands whose handler raised.")
+        self.metrics.describe("winona_sheet_fetch_seconds", "Seconds spent downloading the draft sheet.")
+        self.metrics.describe("winona_db_call_seconds", "Seconds a database call ran on its worker thread.")
+        self.metrics.describe("winona_cache_hits_total", "Lookups answered from a cache.")
+        self.metrics.describe("winona_cache_misses_total", "Lookups a cache could not answer.")
+
+        # command handlers await this instead of calling db_manager directly
         if self.db_manager:
-            admin_channel_ids = []
-            tournament_channel_ids = []
-            for guild in self.db_manager.get_all_guilds():
-                admin_channel_ids.append(guild.admin_channel_id)
-                tournament_channel_ids += guild.tournament_channel_ids
-            self.ADMIN_CHANNEL_IDS = admin_channel_ids
-            self.TOURNAMENT_CHANNEL_IDS = tournament_channel_ids
+            self.async_db = AsyncDatabaseManager(self.db_manager, metrics=self.metrics)
         else:
-            self.ADMIN_CHANNEL_IDS = getenv_int_list("ADMIN_CHANNEL_ID")
-            self.TOURNAMENT_CHANNEL_IDS = getenv_int_list("TOURNAMENT_CHANNEL_ID")
+            self.async_db = None
+
+        # built once; reload with self.species_catalog.reload()
+        if self.db_manager:
+            self.species_catalog = SpeciesCatalog(self.db_manager)
+        else:
+            self.species_catalog = SpeciesCatalog()
+        # species autocomplete; rebuilds its indexes when the catalog reloads
+        self.species_search = SpeciesSearch(self.species_catalog)
+        # fuzzy match results, persisted and keyed by the catalog version
+        self.match_memo = MatchMemo(self.species_catalog, self.db_manager)
+
+        # shared by every sheet command and autocomplete callback
+        if args is not None:
+            self.sheet_cache = SheetCache(ttl=args.sheet_ttl, metrics=self.metrics)
+        else:
+            self.sheet_cache = SheetCache(metrics=self.metrics)
+        # tournaments by guild; writes go to the database first
+        self.tournament_registry = TournamentRegistry(self.db_manager)
+        # drafts run by the bot, by tournament id; unfinished logged drafts pick up where they left off,
+        # finished ones are read from the log when first asked for
+        if self.db_manager:
+            self.draft_manager = DraftManager(self.species_catalog, DraftLog(self.db_manager, autoflush=False))
+            self.draft_manager.recover([tournament.tournament_id for tournament in self.tournament_registry.list_all()
+                                        if tournament.draft_status != STATUS_COMPLETE])
+        else:
+            self.draft_manager = DraftManager(self.species_catalog)
+        # changes to one draft run one at a time, bursts share a transaction
+        self.draft_queue = DraftQueue(self.draft_manager, self.async_db)
+        # sheet url -> IncrementalDraftValidator, kept between validate-draft-sheet runs
+        self.draft_validators = {}
+        # paginated reports by id, so page buttons never re-run validation
+        self.report_cache = ReportCache()
+        # slow commands defer, then wait their turn here, round-robin between guilds
+        if args is not None:
+            self.job_runner = JobRunner(max_workers=args.job_workers)
+        else:
+            self.job_runner = JobRunner()
+
+        # per-guild channel sets for the command checks; the env lists cover unknown guilds
+        self.channel_registry = ChannelRegistry(self.db_manager,
+                                                getenv_int_list("ADMIN_CHANNEL_ID"),
+                                                getenv_int_list("TOURNAMENT_CHANNEL_ID"))
+        if args is not None:
+            self.guild_poll_seconds = args.guild_poll
+        else:
+            self.guild_poll_seconds = 10.0
+        if args is not None:
+            self.metrics_file = args.metrics_file
+            self.metrics_port = args.metrics_port
+        else:
+            self.metrics_file = None
+            self.metrics_port = 0
+        self.metrics.add_collector(self.collect_metrics)
 
-        dotenv.load_dotenv()
         # used in Client constructor
         self.TOKEN = os.getenv("BOT_TOKEN")
         # self.GUILD_ID = getenv_int_list("GUILD_ID")
@@ -92,10 +203,50 @@ class WinonaBot:
         self.client.load_extension("winona.bot.commands.reload_command")
         self.client.load_extension("winona.bot.commands.list_users_command")
         self.client.load_extension("winona.bot.commands.spreadsheet_commands")
+        self.client.load_extension("winona.bot.commands.species_commands")
+        self.client.load_extension("winona.bot.commands.draft_commands")
+        self.client.load_extension("winona.bot.commands.admin_commands")
 
 
         atexit.register(self.cleanup)
 
+        # pick up guild channel edits made with the CLI without a restart
+        @interactions.Task.create(interactions.IntervalTrigger(seconds=self.guild_poll_seconds))
+        async def poll_guild_config():
+            if await self.async_db.run(self.channel_registry.poll):
+                print("Guild channel configuration reloaded.")
+            return
+
+        @interactions.Task.create(interactions.IntervalTrigger(seconds=METRICS_FILE_SECONDS))
+        async def write_metrics_file():
+            try:
+                self.metrics.write_prometheus(self.metrics_file)
+            except OSError as e:
+                print(f"Unable to write {self.metrics_file}: {e}")
+            return
+
+        @self.client.listen()
+        async def on_startup():
+            if self.db_manager and self.guild_poll_seconds > 0:
+                poll_guild_config.start()
+            if self.metrics_file:
+                write_metrics_file.start()
+            if self.metrics_port > 0:
+                self.metrics.start_http_server(self.metrics_port)
+                print(f"Serving metrics on http://127.0.0.1:{self.metrics_port}/metrics")
+            return
+
+        @self.client.listen(interactions.events.CommandCompletion)
+        async def on_command_completion(event):
+            self.metrics.observe("winona_command_seconds", command_latency(event.ctx), command=command_name(event.ctx))
+            return
+
+        @self.client.listen(interactions.events.CommandError)
+        async def on_command_error(event):
+            self.metrics.inc("winona_command_errors_total", command=command_name(event.ctx),
+                             error=type(event.error).__name__)
+            return
+
         @self.client.listen()
         async def on_ready():
             print("Bot is ready!")
@@ -109,8 +260,27 @@ class WinonaBot:
         return
 
 
+    def collect_metrics(self):
+        """
+        Cache hit counts and job queue sizes, read by self.metrics when it renders.
+        """
+        caches = [("sheet", self.sheet_cache), ("match_memo", self.match_memo), ("report", self.report_cache)]
+        for name, cache in caches:
+            yield "winona_cache_hits_total", "counter", {"cache": name}, cache.hits
+            yield "winona_cache_misses_total", "counter", {"cache": name}, cache.misses
+        yield "winona_jobs_queued", "gauge", {}, self.job_runner.queue_depth()
+        yield "winona_jobs_running", "gauge", {}, self.job_runner.running
+        return
+
     def cleanup(self):
         print("Cleaning up...")
+        # cancel queued and running jobs before the database they use goes away
+        self.job_runner.shutdown()
+        self.metrics.stop_http_server()
+        if self.async_db:
+            self.async_db.shutdown()
+        if self.db_manager:
+            self.db_manager.close()
         return
 
     def run(self):
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+from typing import Dict, FrozenSet, Iterable, Optional
+
+
+class ChannelRegistry:
+    """
+    The admin and tournament channels of every guild, as frozensets keyed by guild id.
+
+    Channel checks look up the invoking guild's sets, so a channel id from
+    one server never grants access in another. reload() rebuilds all of the
+    sets from the database and swaps them in at once; poll() reloads
+    only when the guild config version, bumped by every write to the guild
+    tables, has changed. Draft picks, memo writes and other commits do not
+    trigger a reload.
+
+    Guilds missing from the table, and direct messages, fall back to the
+    channel ids given at construction (from the environment).
+    """
+
+    def __init__(self, db_manager=None, fallback_admin_ids: Iterable[int] = (),
+                 fallback_tournament_ids: Iterable[int] = ()):
+        """
+        Initializes the registry and loads the guilds table.
+
+        Args:
+            db_manager (DatabaseManager, optional): Source of the guilds table.
+            fallback_admin_ids (iterable): Admin channels for guilds not in the table.
+            fallback_tournament_ids (iterable): Tournament channels for guilds not in the table.
+        """
+        self.db_manager = db_manager
+        self.fallback_admin_ids: FrozenSet[int] = frozenset(fallback_admin_ids)
+        self.fallback_tournament_ids: FrozenSet[int] = frozenset(fallback_tournament_ids)
+        self.admin_channels: Dict[int, FrozenSet[int]] = {}
+        self.tournament_channels: Dict[int, FrozenSet[int]] = {}
+        self._data_version = None
+        self._config_version = None
+        if db_manager is not None:
+            self.reload()
+        return
+
+    def reload(self):
+        """
+        Rereads every guild's channels from the database.
+        """
+        # read the versions first, so a commit made during the reload is seen by the next poll
+        data_version = self.db_manager.get_data_version()
+        config_version = self.db_manager.get_guild_config_version()
+        admin_channels = {}
+        tournament_channels = {}
+        for guild in self.db_manager.get_all_guilds():
+            admin_ids = [guild.admin_channel_id] if guild.admin_channel_id else []
+            admin_channels[guild.guild_id] = frozenset(admin_ids)
+            tournament_channels[guild.guild_id] = frozenset(guild.tournament_channel_ids)
+        self.admin_channels = admin_channels
+        self.tournament_channels = tournament_channels
+        self._data_version = data_version
+        self._config_version = config_version
+        return
+
+    def poll(self) -> bool:
+        """
+        Reloads if a guild or its channels changed since the last load.
+
+        PRAGMA data_version is checked first: it is cheap and does not hit
+        the tables, and when it has not moved nothing at all was committed.
+
+        Returns:
+            True if the registry was reloaded.
+        """
+        if self.db_manager is None:
+            return False
+        data_version = self.db_manager.get_data_version()
+        if data_version == self._data_version:
+            return False
+        self._data_version = data_version
+        if self.db_manager.get_guild_config_version() == self._config_version:
+            return False
+        self.reload()
+        return True
+
+    def admin_channel_ids(self, guild_id: Optional[int]) -> FrozenSet[int]:
+        """
+        Returns the admin channels of a guild.
+        """
+        if guild_id is None:
+            return self.fallback_admin_ids
+        return self.admin_channels.get(int(guild_id), self.fallback_admin_ids)
+
+    def tournament_channel_ids(self, guild_id: Optional[int]) -> FrozenSet[int]:
+        """
+        Returns the tournament channels of a guild.
+        """
+        if guild_id is None:
+            return self.fallback_tournament_ids
+        return self.tournament_channels.get(int(guild_id), self.fallback_tournament_ids)
+
+    def is_admin_channel(self, guild_id: Optional[int], channel_id: int) -> bool:
+        return int(channel_id) in self.admin_channel_ids(guild_id)
+
+    def is_tournament_channel(self, guild_id: Optional[int], channel_id: int) -> bool:
+        return int(channel_id) in self.tournament_channel_ids(guild_id)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+import interactions
+from .checks import admin_channel_check
+from ..job_runner import percentile
+
+MAX_COMMAND_FIELDS = 20
+
+def format_timing(histogram):
+    return (f"{histogram.count} runs, p50 {histogram.quantile(0.5) * 1000:.0f} ms, "
+            f"p95 {histogram.quantile(0.95) * 1000:.0f} ms")
+
+def hit_rate(hits, misses):
+    total = hits + misses
+    return f"{hits / total:.0%} of {total}" if total else "unused"
+
+class AdminCommands(interactions.Extension):
+    def __init__(self, client):
+        self.client: interactions.Client = client
+
+    @interactions.slash_command(
+        name="winona",
+        description="Winona Bot commands.",
+        group_name="admin",
+        group_description="Bot administration commands.",
+        sub_cmd_name="jobs",
+        sub_cmd_description="Shows queued and running slow commands and how long they take.",
+    )
+    @interactions.check(admin_channel_check)
+    async def admin_jobs(self, ctx: interactions.SlashContext):
+        runner = ctx.client.winona.job_runner
+        by_guild = runner.queue_depth_by_guild()
+        description = (f"Running: {runner.running}/{runner.max_workers}\n"
+                       f"Queued: {runner.queue_depth()} in {len(by_guild)} servers")
+        if ctx.guild_id is not None:
+            description += f" ({by_guild.get(int(ctx.guild_id), 0)} here)"
+        embed = interactions.Embed(title="Jobs", description=description, color=0x00FF00)
+        for name in sorted(runner.stats):
+            stats = runner.stats[name]
+            value = (f"Done: {stats.completed}, failed: {stats.failed}\n"
+                     f"Wait p50/p95: {percentile(stats.wait_seconds, 0.5) * 1000:.0f}/"
+                     f"{percentile(stats.wait_seconds, 0.95) * 1000:.0f} ms\n"
+                     f"Run p50/p95: {percentile(stats.run_seconds, 0.5) * 1000:.0f}/"
+                     f"{percentile(stats.run_seconds, 0.95) * 1000:.0f} ms")
+            embed.add_field(name=name, value=value, inline=True)
+        await ctx.send(embeds=embed)
+
+    @interactions.slash_command(
+        name="winona",
+        description="Winona Bot commands.",
+        group_name="admin",
+        group_description="Bot administration commands.",
+        sub_cmd_name="stats",
+        sub_cmd_description="Shows command latency, errors, sheet and database timings and cache hit rates.",
+    )
+    @interactions.check(admin_channel_check)
+    async def admin_stats(self, ctx: interactions.SlashContext):
+        metrics = ctx.client.winona.metrics
+        commands = metrics.histograms("winona_command_seconds")
+        errors = {}
+        for labels, count in metrics.counters("winona_command_errors_total").items():
+            command = dict(labels)["command"]
+            errors[command] = errors.get(command, 0) + count
+
+        total = sum(histogram.count for histogram in commands.values())
+        embed = interactions.Embed(
+            title="Stats",
+            description=f"{total} commands, {int(sum(errors.values()))} errors",
+            color=0x00FF00,
+        )
+        by_count = sorted(commands.items(), key=lambda item: -item[1].count)
+        for labels, histogram in by_count[:MAX_COMMAND_FIELDS]:
+            command = dict(labels)["command"]
+            value = format_timing(histogram)
+            if errors.get(command):
+                value += f", {int(errors[command])} errors"
+            embed.add_field(name=command, value=value, inline=False)
+
+        fetches = metrics.histograms("winona_sheet_fetch_seconds")
+        if fetches:
+            value = "\n".join(f"{dict(labels)['result']}: {format_timing(histogram)}"
+                              for labels, histogram in sorted(fetches.items()))
+            embed.add_field(name="Sheet downloads", value=value, inline=False)
+
+        calls = metrics.histograms("winona_db_call_seconds")
+        if calls:
+            slowest = sorted(calls.items(), key=lambda item: -item[1].quantile(0.95))[:5]
+            value = "\n".join(f"{dict(labels)['call']}: {format_timing(histogram)}" for labels, histogram in slowest)
+            embed.add_field(name=f"Database ({sum(h.count for h in calls.values())} calls, slowest)",
+                            value=value, inline=False)
+
+        collected = metrics.collected()
+        hits = collected.get("winona_cache_hits_total", ("counter", {}))[1]
+        misses = collected.get("winona_cache_misses_total", ("counter", {}))[1]
+        value = "\n".join(f"{dict(labels)['cache']}: {hit_rate(count, misses.get(labels, 0))}"
+                          for labels, count in sorted(hits.items()))
+        if value:
+            embed.add_field(name="Cache hit rates", value=value, inline=False)
+        await ctx.send(embeds=embed)
+
+def setup(client: interactions.Client):
+    AdminCommands(client)
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+
+import copy
+import interactions
+from .checks import admin_channel_check, tournament_channel_check
+from .species_commands import species_choices
+from ...logic.draft_engine import DraftError, ORDER_SNAKE, ORDER_LINEAR, DEFAULT_PICK_ROUNDS, ACTION_BAN
+from ...logic.draft_engine import STATUS_COMPLETE
+
+MAX_FIELD_LENGTH = 1024
+
+def join_limited(names, limit=MAX_FIELD_LENGTH):
+    """
+    Joins names with commas, stopping before the text passes limit characters.
+    """
+    text = ""
+    for i, name in enumerate(names):
+        item = name if i == 0 else ", " + name
+        if len(text) + len(item) > limit - 4:
+            return text + ", ..."
+        text += item
+    return text
+
+class DraftCommands(interactions.Extension):
+    def __init__(self, client):
+        self.client: interactions.Client = client
+
+    def find_tournament(self, ctx, tournament_id: int):
+        """
+        Returns the invoking guild's tournament, or None. Tournament ids are global,
+        so this is what keeps one server from reaching another server's draft.
+        """
+        if ctx.guild_id is None:
+            return None
+        return ctx.client.winona.tournament_registry.get(ctx.guild_id, tournament_id)
+
+    async def get_draft(self, ctx, tournament):
+        """
+        Returns the tournament's draft, or None. Finished drafts are not recovered
+        at startup, so they are read from the log the first time they are asked for.
+        """
+        draft = ctx.client.winona.draft_manager.get(tournament.tournament_id)
+        if draft is None and tournament.draft_status == STATUS_COMPLETE:
+            draft = await ctx.client.winona.draft_queue.load(tournament.tournament_id)
+        return draft
+
+    async def save_draft_status(self, ctx, tournament, draft):
+        """
+        Writes the tournament's draft_status when the draft moves to a new phase.
+        """
+        if tournament.draft_status != draft.status:
+            # the cached tournament is shared; the registry swaps the copy in once it is saved
+            changed = copy.copy(tournament)
+            changed.draft_status = draft.status
+            registry = ctx.client.winona.tournament_registry
+            if not await ctx.client.winona.async_db.run(registry.update, changed):
+                print(f"Tournament {tournament.tournament_id}: could not save draft status '{draft.status}'.")
+        return
+
+    @interactions.slash_command(
+        name="winona",
+        description="Winona Bot commands.",
+        group_name="draft",
+        group_description="Draft commands.",
+        sub_cmd_name="join",
+        sub_cmd_description="Join a tournament's draft before it starts.",
+    )
+    @interactions.slash_option(
+        name="tournament_id",
+        description="The tournament's ID.",
+        opt_type=interactions.OptionType.INTEGER,
+        required=True,
+    )
+    @interactions.check(tournament_channel_check)
+    async def draft_join(self, ctx: interactions.SlashContext, tournament_id: int):
+        tournament = self.find_tournament(ctx, tournament_id)
+        if tournament is None:
+            await ctx.send(f"There is no tournament {tournament_id}.")
+            return
+        try:
+            manager = ctx.client.winona.draft_manager
+            count = await ctx.client.winona.draft_queue.submit(tournament_id, manager.join, tournament_id,
+                                                               int(ctx.author.id), ctx.author.display_name,
+                                                               tournament.max_players)
+        except DraftError as e:
+            await ctx.send(f"{e}")
+            return
+        await ctx.send(f"{ctx.author.display_name} joined {tournament.tournament_name} ({count} players).")
+
+    @interactions.slash_command(
+        name="winona",
+        description="Winona Bot commands.",
+        group_name="draft",
+        group_description="Draft commands.",
+        sub_cmd_name="start",
+        sub_cmd_description="Start a tournament's draft with the players who joined.",
+    )
+    @interactions.slash_option(
+        name="tournament_id",
+        description="The tournament's ID.",
+        opt_type=interactions.OptionType.INTEGER,
+        required=True,
+    )
+    @interactions.slash_option(
+        name="order",
+        description="Snake reverses the order every round. Defaults to snake.",
+        opt_type=interactions.OptionType.STRING,
+        required=False,
+        choices=[
+            interactions.SlashCommandChoice(name="snake", value=ORDER_SNAKE),
+            interactions.SlashCommandChoice(name="linear", value=ORDER_LINEAR),
+        ],
+    )
+    @interactions.slash_option(
+        name="pick_rounds",
+        description=f"Picks per player. Defaults to {DEFAULT_PICK_ROUNDS}.",
+        opt_type=interactions.OptionType.INTEGER,
+        required=False,
+    )
+    @interactions.check(admin_channel_check)
+    async def draft_start(self, ctx: interactions.SlashContext, tournament_id: int, order: str = ORDER_SNAKE,
+                          pick_rounds: int = DEFAULT_PICK_ROUNDS):
+        tournament = self.find_tournament(ctx, tournament_id)
+        if tournament is None:
+            await ctx.send(f"There is no tournament {tournament_id}.")
+            return
+        try:
+            manager = ctx.client.winona.draft_manager
+            draft = await ctx.client.winona.draft_queue.submit(tournament_id, manager.start, tournament_id, order,
+                                                               tournament.ban_rounds or 0, pick_rounds)
+        except DraftError as e:
+            await ctx.send(f"{e}")
+            return
+        await self.save_draft_status(ctx, tournament, draft)
+        players = ", ".join(draft.name_of(player) for player in draft.players)
+        await ctx.send(f"Draft for {tournament.tournament_name} started ({order}): {players}. "
+                       f"{draft.name_of(draft.current_player)} is up.")
+
+    async def submit(self, ctx, tournament_id: int, species: str, banning: bool):
+        tournament = self.find_tournament(ctx, tournament_id)
+        draft = await self.get_draft(ctx, tournament) if tournament is not None else None
+        if draft is None:
+            await ctx.send(f"Tournament {tournament_id} has no running draft.")
+            return
+        player = int(ctx.author.id)
+        manager = ctx.client.winona.draft_manager
+        queue = ctx.client.winona.draft_queue
+        try:
+            if banning:
+                removed = await queue.submit(tournament_id, manager.ban, tournament_id, player, species)
+                message = f"{draft.name_of(player)} banned {', '.join(p.name for p in removed)}."
+            else:
+                picked = await queue.submit(tournament_id, manager.pick, tournament_id, player, species)
+                message = f"{draft.name_of(player)} picked {picked.name}."
+        except DraftError as e:
+            await ctx.send(f"{e}")
+            return
+        await self.save_draft_status(ctx, tournament, draft)
+        if draft.current_player is None:
+            message += " The draft is complete."
+        else:
+            message += f" {draft.name_of(draft.current_player)} is up."
+        await ctx.send(message)
+
+    @interactions.slash_command(
+        name="winona",
+        description="Winona Bot commands.",
+        group_name="draft",
+        group_description="Draft commands.",
+        sub_cmd_name="ban",
+        sub_cmd_description="Ban a species, with all its forms, on your turn.",
+    )
+    @interactions.slash_option(
+        name="tournament_id",
+        description="The tournament's ID.",
+        opt_type=interactions.OptionType.INTEGER,
+        required=True,
+    )
+    @interactions.slash_option(
+        name="species",
+        description="The species to ban.",
+        opt_type=interactions.OptionType.STRING,
+        required=True,
+        autocomplete=True,
+    )
+    @interactions.check(tournament_channel_check)
+    async def draft_ban(self, ctx: interactions.SlashContext, tournament_id: int, species: str):
+        await self.submit(ctx, tournament_id, species, banning=True)
+
+    @interactions.slash_command(
+        name="winona",
+        description="Winona Bot commands.",
+        group_name="draft",
+        group_description="Draft commands.",
+        sub_cmd_name="pick",
+        sub_cmd_description="Pick a species on your turn.",
+    )
+    @interactions.slash_option(
+        name="tournament_id",
+        description="The tournament's ID.",
+        opt_type=interactions.OptionType.INTEGER,
+        required=True,
+    )
+    @interactions.slash_option(
+        name="species",
+        description="The species to pick.",
+        opt_type=interactions.OptionType.STRING,
+        required=True,
+        autocomplete=True,
+    )
+    @interactions.check(tournament_channel_check)
+    async def draft_pick(self, ctx: interactions.SlashContext, tournament_id: int, species: str):
+        await self.submit(ctx, tournament_id, species, banning=False)
+
+    @draft_ban.autocomplete("species")
+    async def draft_ban_species_autocomplete(self, ctx: interactions.AutocompleteContext):
+        await self.send_available_species(ctx)
+
+    @draft_pick.autocomplete("species")
+    async def draft_pick_species_autocomplete(self, ctx: interactions.AutocompleteContext):
+        await self.send_available_species(ctx)
+
+    async def send_available_species(self, ctx: interactions.AutocompleteContext):
+        """
+        Suggests species that are still available in the draft named by the tournament_id option.
+        """
+        search = ctx.client.winona.species_search
+        tournament_id = ctx.kwargs.get("tournament_id")
+        draft = None
+        if tournament_id is not None and self.find_tournament(ctx, tournament_id) is not None:
+            draft = ctx.client.winona.draft_manager.get(tournament_id)
+        if draft is None:
+            species = search.search(ctx.input_text or "")
+        else:
+            # over-fetch, since some results may already be banned or taken
+            species = draft.keep_available(search.search(ctx.input_text or "", limit=100))[:25]
+        await ctx.send(choices=species_choices(species))
+
+    @interactions.slash_command(
+        name="winona",
+        description="Winona Bot commands.",
+        group_name="draft",
+        group_description="Draft commands.",
+        sub_cmd_name="available",
+        sub_cmd_description="List the species that can still be picked.",
+    )
+    @interactions.slash_option(
+        name="tournament_id",
+        description="The tournament's ID.",
+        opt_type=interactions.OptionType.INTEGER,
+        required=True,
+    )
+    @interactions.check(tournament_channel_check)
+    async def draft_available(self, ctx: interactions.SlashContext, tournament_id: int):
+        tournament = self.find_tournament(ctx, tournament_id)
+        if tournament is None:
+            await ctx.send(f"There is no tournament {tournament_id}.")
+            return
+        draft = await self.get_draft(ctx, tournament)
+        if draft is None:
+            await ctx.send(f"Tournament {tournament_id} has no running draft.")
+            return
+        names = [p.name for p in draft.available()]
+        embed = interactions.Embed(title=f"{len(names)} species available", color=0x00FF00)
+        if names:
+            embed.add_field(name="Species", value=join_limited(names), inline=False)
+        await ctx.send(embeds=embed)
+
+    @interactions.slash_command(
+        name="winona",
+        description="Winona Bot commands.",
+        group_name="draft",
+        group_description="Draft commands.",
+        sub_cmd_name="status",
+        sub_cmd_description="Show whose turn it is and everyone's bans and picks.",
+    )
+    @interactions.slash_option(
+        name="tournament_id",
+        description="The tournament's ID.",
+        opt_type=interactions.OptionType.INTEGER,
+        required=True,
+    )
+    @interactions.check(tournament_channel_check)
+    async def draft_status(self, ctx: interactions.SlashContext, tournament_id: int):
+        tournament = self.find_tournament(ctx, tournament_id)
+        if tournament is None:
+            await ctx.send(f"There is no tournament {tournament_id}.")
+            return
+        manager = ctx.client.winona.draft_manager
+        draft = await self.get_draft(ctx, tournament)
+        if draft is None:
+            lobby = manager.lobbies.get(tournament_id, {})
+            if lobby:
+                await ctx.send(f"Draft not started. Joined: {', '.join(lobby.values())}.")
+            else:
+                await ctx.send(f"Tournament {tournament_id} has no draft.")
+            return
+
+        if draft.current_player is None:
+            description = "The draft is complete."
+        else:
+            description = (f"{draft.status.capitalize()}, round {draft.round_number}. "
+                           f"{draft.name_of(draft.current_player)} is up.")
+        embed = interactions.Embed(title=f"Draft {tournament_id}", description=description, color=0x00FF00)
+        for player in draft.players:
+            bans = [draft.species[position].name for position in draft.bans[player]]
+            picks = [draft.species[position].name for position in draft.picks[player]]
+            value = ""
+            if bans:
+                value += "Bans: " + ", ".join(bans) + "\n"
+            value += "Picks: " + (", ".join(picks) if picks else "none")
+            embed.add_field(name=draft.name_of(player), value=value[:MAX_FIELD_LENGTH], inline=False)
+        await ctx.send(embeds=embed)
+
+    @interactions.slash_command(
+        name="winona",
+        description="Winona Bot commands.",
+        group_name="draft",
+        group_description="Draft commands.",
+        sub_cmd_name="undo",
+        sub_cmd_description="Take back the latest ban or pick.",
+    )
+    @interactions.slash_option(
+        name="tournament_id",
+        description="The tournament's ID.",
+        opt_type=interactions.OptionType.INTEGER,
+        required=True,
+    )
+    @interactions.check(admin_channel_check)
+    async def draft_undo(self, ctx: interactions.SlashContext, tournament_id: int):
+        tournament = self.find_tournament(ctx, tournament_id)
+        draft = await self.get_draft(ctx, tournament) if tournament is not None else None
+        if draft is None:
+            await ctx.send(f"Tournament {tournament_id} has no running draft.")
+            return
+        try:
+            manager = ctx.client.winona.draft_manager
+            kind, player, position, _ = await ctx.client.winona.draft_queue.submit(tournament_id, manager.undo,
+                                                                                  tournament_id)
+        except DraftError as e:
+            await ctx.send(f"{e}")
+            return
+        await self.save_draft_status(ctx, tournament, draft)
+        verb = "ban" if kind == ACTION_BAN else "pick"
+        await ctx.send(f"Undid {draft.name_of(player)}'s {verb} of {draft.species[position].name}. "
+                       f"{draft.name_of(draft.current_player)} is up.")
+
+    @interactions.slash_command(
+        name="winona",
+        description="Winona Bot commands.",
+        group_name="draft",
+        group_description="Draft commands.",
+        sub_cmd_name="order",
+        sub_cmd_description="Change the draft order.",
+    )
+    @interactions.slash_option(
+        name="tournament_id",
+        description="The tournament's ID.",
+        opt_type=interactions.OptionType.INTEGER,
+        required=True,
+    )
+    @interactions.slash_option(
+        name="players",
+        description="Every player's name, comma-separated, in the new first-round order.",
+        opt_type=interactions.OptionType.STRING,
+        required=True,
+    )
+    @interactions.check(admin_channel_check)
+    async def draft_order(self, ctx: interactions.SlashContext, tournament_id: int, players: str):
+        tournament = self.find_tournament(ctx, tournament_id)
+        if tournament is None:
+            await ctx.send(f"There is no tournament {tournament_id}.")
+            return
+        draft = await self.get_draft(ctx, tournament)
+        if draft is None:
+            await ctx.send(f"Tournament {tournament_id} has no running draft.")
+            return
+        by_name = {draft.name_of(player).casefold(): player for player in draft.players}
+        order = []
+        for name in players.split(","):
+            player = by_name.get(name.strip().casefold())
+            if player is None:
+                await ctx.send(f"{name.strip()} is not in this draft.")
+                return
+            order.append(player)
+        try:
+            manager = ctx.client.winona.draft_manager
+            await ctx.client.winona.draft_queue.submit(tournament_id, manager.set_order, tournament_id, order)
+        except DraftError as e:
+            await ctx.send(f"{e}")
+            return
+        names = ", ".join(draft.name_of(player) for player in draft.players)
+        await ctx.send(f"New order: {names}. {draft.name_of(draft.current_player)} is up.")
+
+def setup(client: interactions.Client):
+    DraftCommands(client)
@@ -21,7 +21,10 @@ class ListUsersCommands(interactions.Extension):
             await ctx.send("This command can only be used in a server.")
             return
 
-        users = ctx.client.winona.db_manager.get_all_users()
+        await ctx.client.winona.job_runner.run(ctx, "list-users", self.list_users_job, ctx)
+
+    async def list_users_job(self, ctx):
+        users = await ctx.client.winona.async_db.get_all_users()
 
         if not users:
             await ctx.send("No users found in the database.")
@@ -59,7 +62,7 @@ class ListUsersCommands(interactions.Extension):
         embed.add_field(name="Mention", value=user.mention, inline=False)
         embed.add_field(name="Created At", value=str(user.created_at), inline=False)
 
-        user = ctx.client.winona.db_manager.get_user_by_discord_id(int(user.id))
+        user = await ctx.client.winona.async_db.get_user_by_discord_id(int(user.id))
         if user:
             embed.add_field(name="UID", value=user.user_id, inline=False)
             embed.add_field(name="UDN", value=user.discord_name, inline=False)
@@ -27,6 +27,8 @@ class ReloadCommand(interactions.Extension):
             interactions.SlashCommandChoice(name="reload", value="reload_command"),
             interactions.SlashCommandChoice(name="users", value="list_users_command"),
             interactions.SlashCommandChoice(name="spreadsheet", value="spreadsheet_commands"),
+            interactions.SlashCommandChoice(name="species", value="species_commands"),
+            interactions.SlashCommandChoice(name="draft", value="draft_commands"),
         ],
     )
     @interactions.check(admin_channel_check)
@@ -37,5 +39,36 @@ class ReloadCommand(interactions.Extension):
         except Exception as e:
             await ctx.send(f"Failed to reload extension '{extension}': {e}")
 
+    @interactions.slash_command(
+        name="winona",
+        description="Winona Bot commands.",
+        group_name="admin",
+        group_description="Admin commands.",
+        sub_cmd_name="reload-species",
+        sub_cmd_description="Reloads the pokemon species catalog from the database.",
+    )
+    @interactions.check(admin_channel_check)
+    async def reload_species_command(self, ctx: interactions.SlashContext):
+        catalog = ctx.client.winona.species_catalog
+        await ctx.client.winona.async_db.run(catalog.reload)
+        await ctx.send(f"Species catalog reloaded: {len(catalog)} species.")
+
+    @interactions.slash_command(
+        name="winona",
+        description="Winona Bot commands.",
+        group_name="admin",
+        group_description="Admin commands.",
+        sub_cmd_name="reload-guilds",
+        sub_cmd_description="Reloads the admin and tournament channels of every guild.",
+    )
+    @interactions.check(admin_channel_check)
+    async def reload_guilds_command(self, ctx: interactions.SlashContext):
+        registry = ctx.client.winona.channel_registry
+        if registry.db_manager is None:
+            await ctx.send("No database; channels come from the environment.")
+            return
+        await ctx.client.winona.async_db.run(registry.reload)
+        await ctx.send(f"Guild channels reloaded: {len(registry.admin_channels)} guilds.")
+
 def setup(client):
     ReloadCommand(client)
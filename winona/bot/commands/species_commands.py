@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+import interactions
+from .checks import tournament_channel_check
+
+REGION_CHOICES = [
+    interactions.SlashCommandChoice(name="Alolan", value="Alolan"),
+    interactions.SlashCommandChoice(name="Galarian", value="Galarian"),
+    interactions.SlashCommandChoice(name="Hisuian", value="Hisuian"),
+    interactions.SlashCommandChoice(name="Paldean", value="Paldean"),
+]
+
+def species_choices(species):
+    """
+    Returns autocomplete choices for species, valued by species_id_str.
+    Discord limits choice names and values to 100 characters.
+    """
+    return [{"name": str(p)[:100], "value": p.species_id_str[:100]} for p in species]
+
+async def send_species_autocomplete(ctx: interactions.AutocompleteContext):
+    """
+    Answers a species autocomplete from the bot's SpeciesSearch.
+
+    The shadow, mega and region options, when the command has them and the
+    user has already filled them in, narrow the suggestions.
+    Any command with a species option can use this as its autocomplete callback.
+    """
+    search = ctx.client.winona.species_search
+    species = search.search(ctx.input_text or "",
+                            shadow=ctx.kwargs.get("shadow"),
+                            mega=ctx.kwargs.get("mega"),
+                            region=ctx.kwargs.get("region") or None)
+    await ctx.send(choices=species_choices(species))
+    return
+
+class SpeciesCommands(interactions.Extension):
+    def __init__(self, client):
+        self.client: interactions.Client = client
+
+    @interactions.slash_command(
+        name="winona",
+        description="Winona Bot commands.",
+        group_name="species",
+        group_description="Pokemon species commands.",
+        sub_cmd_name="lookup",
+        sub_cmd_description="Shows a pokemon species and its pvpoke id.",
+    )
+    @interactions.slash_option(
+        name="species",
+        description="Name or species id.",
+        opt_type=interactions.OptionType.STRING,
+        required=True,
+        autocomplete=True,
+    )
+    @interactions.slash_option(
+        name="shadow",
+        description="Only suggest shadow (True) or non-shadow (False) species.",
+        opt_type=interactions.OptionType.BOOLEAN,
+        required=False,
+    )
+    @interactions.slash_option(
+        name="mega",
+        description="Only suggest mega (True) or non-mega (False) species.",
+        opt_type=interactions.OptionType.BOOLEAN,
+        required=False,
+    )
+    @interactions.slash_option(
+        name="region",
+        description="Only suggest species of this region. Leave empty for any region.",
+        opt_type=interactions.OptionType.STRING,
+        required=False,
+        choices=REGION_CHOICES,
+    )
+    @interactions.check(tournament_channel_check)
+    async def lookup(self, ctx: interactions.SlashContext, species: str, shadow: bool = None,
+                     mega: bool = None, region: str = None):
+        catalog = ctx.client.winona.species_catalog
+        p = catalog.get_by_name_or_id(species)
+        if p is None:
+            matches = ctx.client.winona.species_search.search(species, shadow=shadow, mega=mega,
+                                                              region=region, limit=1)
+            if len(matches) == 0:
+                await ctx.send(f"No species matches '{species}'.")
+                return
+            p = matches[0]
+
+        embed = interactions.Embed(title=p.name, color=0x00FF00)
+        embed.add_field(name="Dex", value=f"{p.dex_number}", inline=True)
+        embed.add_field(name="pvpoke id", value=f"{p.species_id_str}", inline=True)
+        if p.region:
+            embed.add_field(name="Region", value=f"{p.region}", inline=True)
+        if p.form:
+            embed.add_field(name="Form", value=f"{p.form}", inline=True)
+        if p.shadow:
+            embed.add_field(name="Shadow", value="Yes", inline=True)
+        if p.mega:
+            embed.add_field(name="Mega", value="Yes", inline=True)
+        await ctx.send(embeds=embed)
+
+    @lookup.autocomplete("species")
+    async def lookup_species_autocomplete(self, ctx: interactions.AutocompleteContext):
+        await send_species_autocomplete(ctx)
+
+def setup(client: interactions.Client):
+    SpeciesCommands(client)
@@ -1,10 +1,70 @@
 #!/usr/bin/env python3
 
+import asyncio
+import io
+import re
 import interactions
 from .checks import admin_channel_check, tournament_channel_check
-from ...logic.sheet_validation import validate_draft_sheet_aux, parse_bans_aux
-from ...logic.sheet_validation import parse_picks_aux
-from ...api import read_public_google_sheet
+from ..report_renderer import Report
+from ...logic.incremental_validation import IncrementalDraftValidator
+
+REPORT_BUTTON_PREFIX = "winona_report"
+REPORT_BUTTON_PATTERN = re.compile(rf"^{REPORT_BUTTON_PREFIX}:")
+
+def report_embed(report, page):
+    embed = interactions.Embed(title=report.title, color=0x00FF00)
+    if len(report) == 0:
+        embed.description = "No issues found."
+    for name, value in report.page(page):
+        embed.add_field(name=name, value=value, inline=False)
+    embed.set_footer(text=report.footer(page))
+    return embed
+
+def report_buttons(report, page):
+    """
+    Previous/next buttons for a cached report, or no components for a single page.
+    """
+    if report.page_count <= 1 or report.report_id is None:
+        return []
+    return [interactions.ActionRow(
+        interactions.Button(style=interactions.ButtonStyle.SECONDARY, label="Previous",
+                            custom_id=f"{REPORT_BUTTON_PREFIX}:{report.report_id}:{page - 1}",
+                            disabled=page <= 0),
+        interactions.Button(style=interactions.ButtonStyle.SECONDARY, label="Next",
+                            custom_id=f"{REPORT_BUTTON_PREFIX}:{report.report_id}:{page + 1}",
+                            disabled=page >= report.page_count - 1),
+    )]
+
+def validation_report(validator, sheet_df):
+    """
+    Validates the sheet and returns its Report, ban messages first. Blocks.
+    """
+    ban_messages, messages = validator.validate(sheet_df)
+    return Report("Issues", ban_messages + messages)
+
+def player_picks(snapshot, catalog, player_name):
+    """
+    Finds a player's picks in a sheet snapshot.
+
+    Returns:
+        (picks, pick_ids, error_msg): the picked names, their lowercase species ids
+        for a pvpoke import, and an error message if the player is not in the sheet.
+    """
+    all_picks, users = snapshot.all_picks, snapshot.users
+    picks = []
+    pick_ids = []
+    error_msg = ""
+    if player_name in users:
+        for key in all_picks:
+            item = all_picks[key]
+            if item[1] == player_name:
+                picks.append(key)
+                p = catalog.get_by_name(key)
+                if p is not None:
+                    pick_ids.append(p.species_id_str.lower())
+    else:
+        error_msg = f"{player_name} is not in the list."
+    return picks, pick_ids, error_msg
 
 class SpreadsheetCommands(interactions.Extension):
     def __init__(self, client):
@@ -24,24 +84,66 @@ class SpreadsheetCommands(interactions.Extension):
             await ctx.send("This command can only be used in a server.")
             return
 
+        await ctx.client.winona.job_runner.run(ctx, "validate-draft-sheet", self.validate_draft_sheet_job, ctx)
+
+    async def validate_draft_sheet_job(self, ctx):
         sheet_url = ctx.client.winona.sheet_url
-        db_manager = ctx.client.winona.db_manager
-        sheet_df = read_public_google_sheet(sheet_url)
-        ban_messages, all_bans_by_name = parse_bans_aux(db_manager, sheet_df)
-        messages = validate_draft_sheet_aux(db_manager, sheet_df)
-
-        embed = interactions.Embed(title="Issues", color=0x00FF00)
-        if len(messages) == 0 and len(ban_messages) == 0:
-            pass
-        else:
-            for message in ban_messages:
-                embed.add_field(name=f"MSG:", value=f"Info: {message}", inline=False)
-            for message in messages:
-                embed.add_field(name=f"MSG:", value=f"Info: {message}", inline=False)
+        catalog = ctx.client.winona.species_catalog
+        snapshot = await ctx.client.winona.sheet_cache.get(sheet_url)
+        if snapshot is None:
+            await ctx.send("Unable to read the draft sheet.")
+            return
+        validators = ctx.client.winona.draft_validators
+        if sheet_url not in validators:
+            validators[sheet_url] = IncrementalDraftValidator(catalog, memo=ctx.client.winona.match_memo)
+        # matching and packing the pages are CPU work and the match memo reads SQLite
+        report = await asyncio.to_thread(validation_report, validators[sheet_url], snapshot.sheet_df)
+        await self.send_report(ctx, report)
 
-        await ctx.send(embeds=embed)
+    async def send_report(self, ctx, report):
+        """
+        Sends a report as one embed, as pages with buttons, or as a text file if it is too long.
+        """
+        if report.use_attachment:
+            embed = interactions.Embed(title=report.title, color=0x00FF00,
+                                       description=f"{len(report)} issues; the full report is attached.")
+            file = interactions.File(io.BytesIO(report.as_text().encode("utf-8")), file_name="report.txt")
+            await ctx.send(embeds=embed, file=file)
+            return
+        if report.page_count > 1:
+            ctx.client.winona.report_cache.put(report)
+        await ctx.send(embeds=report_embed(report, 0), components=report_buttons(report, 0))
+
+    @interactions.component_callback(REPORT_BUTTON_PATTERN)
+    async def report_page(self, ctx: interactions.ComponentContext):
+        _, report_id, page = ctx.custom_id.split(":")
+        report = ctx.client.winona.report_cache.get(report_id)
+        if report is None:
+            await ctx.send("This report has expired. Run the command again.", ephemeral=True)
+            return
+        page = max(0, min(int(page), report.page_count - 1))
+        await ctx.edit_origin(embeds=report_embed(report, page), components=report_buttons(report, page))
+
+    @interactions.slash_command(
+        name="winona",
+        description="Winona Bot commands.",
+        group_name="sheet",
+        group_description="Google Sheet commands.",
+        sub_cmd_name="refresh",
+        sub_cmd_description="Downloads the draft sheet again instead of using the cached copy.",
+    )
+    @interactions.check(admin_channel_check)
+    async def refresh_sheet(self, ctx: interactions.SlashContext):
+        await ctx.client.winona.job_runner.run(ctx, "refresh-sheet", self.refresh_sheet_job, ctx)
+
+    async def refresh_sheet_job(self, ctx):
+        sheet_url = ctx.client.winona.sheet_url
+        snapshot = await ctx.client.winona.sheet_cache.refresh(sheet_url)
+        if snapshot is None:
+            await ctx.send("Unable to read the draft sheet.")
+        else:
+            await ctx.send(f"Draft sheet refreshed: {len(snapshot.users)} trainers, {len(snapshot.all_picks)} picks.")
 
-        
     @interactions.slash_command(
         name="winona",
         description="Winona Bot commands.",
@@ -63,26 +165,17 @@ class SpreadsheetCommands(interactions.Extension):
             await ctx.send("This command can only be used in a server.")
             return
 
+        await ctx.client.winona.job_runner.run(ctx, "show-player-picks", self.show_player_picks_job, ctx, player_name)
+
+    async def show_player_picks_job(self, ctx, player_name: str):
         sheet_url = ctx.client.winona.sheet_url
-        sheet_df = read_public_google_sheet(sheet_url)
-        all_picks, users = parse_picks_aux(sheet_df)
-        db_manager = ctx.client.winona.db_manager
-        all_pokemon = db_manager.get_all_pokemon_species()
-
-        picks = []
-        pick_ids = []
-        error_msg = ""
-        if player_name in users:
-            for key in all_picks:
-                item = all_picks[key]
-                if item[1] == player_name:
-                    picks.append(key)
-                    for p in all_pokemon:
-                        if p.name.lower() == key.lower():
-                            pick_ids.append(p.species_id_str.lower())
-        else:
-            error_msg = f"{player_name} is not in the list."
-            
+        snapshot = await ctx.client.winona.sheet_cache.get(sheet_url)
+        if snapshot is None:
+            await ctx.send("Unable to read the draft sheet.")
+            return
+        picks, pick_ids, error_msg = await asyncio.to_thread(
+            player_picks, snapshot, ctx.client.winona.species_catalog, player_name)
+
         embed = interactions.Embed(title=player_name + " picks", color=0x00FF00)
         if error_msg:
             embed.add_field(name = "ERROR:", value = error_msg, inline=False)
@@ -103,16 +196,18 @@ class SpreadsheetCommands(interactions.Extension):
     @show_player_picks.autocomplete("player_name")
     async def show_player_picks_command_player_autocomplete(self, ctx: interactions.AutocompleteContext):
         sheet_url = ctx.client.winona.sheet_url
-        sheet_df = read_public_google_sheet(sheet_url)
-        all_picks, users = parse_picks_aux(sheet_df)
-        
-        current_value = ctx.input_text.lower()
-        filtered_users = [
-            user for user in users if current_value in user.lower()
-        ]
-        limited_users = filtered_users[:25]
+        sheet_cache = ctx.client.winona.sheet_cache
+        # answer from memory; a stale sheet is refreshed in the background
+        snapshot = sheet_cache.get_nowait(sheet_url)
+        if snapshot is None:
+            snapshot = await sheet_cache.get(sheet_url)
+        if snapshot is None:
+            await ctx.send(choices=[])
+            return
+
+        users = snapshot.player_index.search(ctx.input_text or "")
         choices = [
-            { "name": user, "value": user} for user in limited_users
+            { "name": user, "value": user} for user in users
         ]
         await ctx.send(choices=choices)
 
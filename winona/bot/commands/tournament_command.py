@@ -2,11 +2,11 @@
 
 import interactions
 from .checks import admin_channel_check
+from ...database.models.tournament import Tournament
 
 class TournamentCommand(interactions.Extension):
     def __init__(self, client):
         self.client: interactions.Client = client
-        self.tournaments = {}
 
     @interactions.slash_command(
         name="winona",
@@ -28,18 +28,45 @@ class TournamentCommand(interactions.Extension):
         opt_type=interactions.OptionType.INTEGER,
         required=True,
     )
+    @interactions.slash_option(
+        name="cp_cap",
+        description="The CP cap. Defaults to 1500.",
+        opt_type=interactions.OptionType.INTEGER,
+        required=False,
+    )
+    @interactions.slash_option(
+        name="ban_rounds",
+        description="The number of ban rounds before picks. Defaults to 0.",
+        opt_type=interactions.OptionType.INTEGER,
+        required=False,
+    )
     @interactions.check(admin_channel_check)
-    async def tournament_create(self, ctx: interactions.SlashContext, name: str, players: int):
-        tournament_id = len(self.tournaments) + 1
-        self.tournaments[tournament_id] = {
-            "name": name,
-            "players": players,
-            "participants": [],
-            "draft_status": "not started",
-        }
+    async def tournament_create(self, ctx: interactions.SlashContext, name: str, players: int,
+                                cp_cap: int = 1500, ban_rounds: int = 0):
+        if ctx.guild is None:
+            await ctx.send("This command can only be used in a server.")
+            return
+
+        tournament = Tournament(
+            discord_server_name=ctx.guild.name,
+            discord_server_id=int(ctx.guild_id),
+            trainer_role_id=0,
+            tournament_name=name,
+            tournament_description="",
+            cp_cap=cp_cap,
+            round_length=0,
+            ban_rounds=ban_rounds,
+            dracoviz_link="",
+            max_players=players,
+        )
+        registry = ctx.client.winona.tournament_registry
+        tournament = await ctx.client.winona.async_db.run(registry.create, tournament)
+        if tournament is None:
+            await ctx.send(f"Unable to create tournament '{name}'.")
+            return
         embed = interactions.Embed(
             title="Tournament Created",
-            description=f"Tournament '{name}' created with {players} players.",
+            description=f"Tournament '{name}' created with {players} players (ID {tournament.tournament_id}).",
             color=0x00FF00,
         )
         await ctx.send(embeds=embed)
@@ -54,19 +81,54 @@ class TournamentCommand(interactions.Extension):
     )
     @interactions.check(admin_channel_check)
     async def tournament_list(self, ctx: interactions.SlashContext):
-        if not self.tournaments:
+        if ctx.guild is None:
+            await ctx.send("This command can only be used in a server.")
+            return
+
+        # served from the registry's cache, no database round trip
+        tournaments = ctx.client.winona.tournament_registry.list(ctx.guild_id)
+        if not tournaments:
             await ctx.send("There are no active tournaments.")
             return
 
         embed = interactions.Embed(title="Current Tournaments", color=0x00FF00)
-        for tournament_id, tournament_data in self.tournaments.items():
+        for tournament in tournaments:
             embed.add_field(
-                name=f"Tournament ID: {tournament_id}",
-                value=f"Name: {tournament_data['name']}, Players: {tournament_data['players']}",
+                name=f"Tournament ID: {tournament.tournament_id}",
+                value=f"Name: {tournament.tournament_name}, Players: {tournament.max_players}, "
+                      f"Draft: {tournament.draft_status}",
                 inline=False,
             )
 
         await ctx.send(embeds=embed)
 
+    @interactions.slash_command(
+        name="winona",
+        description="Winona Bot commands.",
+        group_name="tournament",
+        group_description="Tournament commands.",
+        sub_cmd_name="delete",
+        sub_cmd_description="Delete a tournament and its draft.",
+    )
+    @interactions.slash_option(
+        name="tournament_id",
+        description="The tournament's ID.",
+        opt_type=interactions.OptionType.INTEGER,
+        required=True,
+    )
+    @interactions.check(admin_channel_check)
+    async def tournament_delete(self, ctx: interactions.SlashContext, tournament_id: int):
+        if ctx.guild is None:
+            await ctx.send("This command can only be used in a server.")
+            return
+
+        registry = ctx.client.winona.tournament_registry
+        if not await ctx.client.winona.async_db.run(registry.delete, int(ctx.guild_id), tournament_id):
+            await ctx.send(f"Unable to delete tournament {tournament_id}.")
+            return
+        # its draft log would otherwise stay in draft_events forever
+        await ctx.client.winona.draft_queue.remove(tournament_id)
+        await ctx.send(f"Tournament {tournament_id} deleted.")
+
 def setup(client):
     TournamentCommand(client)
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+
+import asyncio
+from typing import Dict
+
+from ..logic.draft_engine import DraftError
+
+DEFAULT_MAX_BATCH = 32
+
+
+class DraftQueue:
+    """
+    Serializes changes to each tournament's draft while different tournaments run in parallel.
+
+    Each tournament with pending changes has its own asyncio.Queue and one
+    worker task draining it, so two trainers submitting at the same moment
+    are applied one after the other, in arrival order. The worker takes
+    everything queued at once (up to max_batch) and applies it to the
+    drafts on the event loop, where commands read them, so no other thread
+    ever changes a Draft or lobby. Only the log rows the batch produced go
+    to a database thread, written in one transaction, so a burst of picks
+    costs a single COMMIT. The worker exits when its queue is empty.
+
+    A change the draft rules reject, or one that raises anything else,
+    fails on its own; the rest of the batch still applies, and after an
+    unexpected error the tournament is rebuilt from the log. If the
+    transaction fails, every change in the
+    batch fails and the tournament is rebuilt from the log. Until the
+    COMMIT returns, readers may see changes that are not saved yet; the
+    worker does not take the tournament's next batch before then.
+
+    The manager's DraftLog should be created with autoflush=False, or each
+    change is written on the event loop as it is made.
+    """
+
+    def __init__(self, draft_manager, async_db=None, max_batch: int = DEFAULT_MAX_BATCH):
+        """
+        Initializes the queue.
+
+        Args:
+            draft_manager (DraftManager): The manager whose methods are queued.
+            async_db (AsyncDatabaseManager, optional): Writes batches off the event loop.
+                                                       Without it they are written inline.
+            max_batch (int): Most changes applied in one transaction.
+        """
+        self.draft_manager = draft_manager
+        self.async_db = async_db
+        self.max_batch = max_batch
+        self._queues: Dict[int, asyncio.Queue] = {}
+        self._workers: Dict[int, asyncio.Task] = {}
+        return
+
+    async def submit(self, tournament_id: int, func, *args):
+        """
+        Queues func(*args), a DraftManager method changing tournament_id's draft, and waits for it.
+
+        Returns:
+            What func returned. Raises whatever func raised.
+        """
+        queue = self._queues.get(tournament_id)
+        if queue is None:
+            queue = asyncio.Queue()
+            self._queues[tournament_id] = queue
+        future = asyncio.get_running_loop().create_future()
+        queue.put_nowait((func, args, future))
+        if tournament_id not in self._workers:
+            self._workers[tournament_id] = asyncio.create_task(self._work(tournament_id, queue))
+        return await future
+
+    async def load(self, tournament_id: int):
+        """
+        Returns the tournament's draft, reading it from the log on a database
+        thread if it is not in memory, e.g. a finished draft recover() skipped.
+
+        Returns:
+            The Draft, or None if the log has none either.
+        """
+        manager = self.draft_manager
+        if manager.get(tournament_id) is None and tournament_id not in manager.lobbies and manager.log is not None:
+            draft, events = await self._run(manager.log.load, tournament_id, manager.catalog)
+            # a change may have started the draft while the log was read
+            if manager.get(tournament_id) is None and tournament_id not in manager.lobbies:
+                manager.restore(tournament_id, draft, events)
+        return manager.get(tournament_id)
+
+    async def remove(self, tournament_id: int):
+        """
+        Forgets a tournament's lobby, draft and logged history, after any changes already queued for it.
+        """
+        await self.submit(tournament_id, self.draft_manager.remove, tournament_id, False)
+        log = self.draft_manager.log
+        if log is not None:
+            await self._run(log.forget, tournament_id)
+        return
+
+    def pending(self, tournament_id: int) -> int:
+        """
+        Returns the number of changes waiting for tournament_id's worker.
+        """
+        queue = self._queues.get(tournament_id)
+        return queue.qsize() if queue is not None else 0
+
+    async def _work(self, tournament_id: int, queue: asyncio.Queue):
+        batch = []
+        try:
+            while not queue.empty():
+                batch = [queue.get_nowait()]
+                while len(batch) < self.max_batch and not queue.empty():
+                    batch.append(queue.get_nowait())
+                try:
+                    await self._run_batch(tournament_id, batch)
+                except Exception as e:
+                    print(f"Tournament {tournament_id}: draft changes failed: {e}")
+                    await self._rebuild(tournament_id)
+                    self._resolve(batch, [(None, e)] * len(batch))
+                batch = []
+        finally:
+            # a cancelled worker must not leave callers waiting
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            for _, _, future in batch:
+                if not future.done():
+                    future.cancel()
+            # nothing can be queued between the empty() check and here; both run on the event loop
+            del self._workers[tournament_id]
+            self._queues.pop(tournament_id, None)
+        return
+
+    async def _run_batch(self, tournament_id: int, batch):
+        outcomes, unexpected = self._apply_batch(batch)
+        error = await self._commit(tournament_id)
+        if error is not None:
+            outcomes = [(None, error)] * len(batch)
+        elif unexpected:
+            # the call that raised may have changed the draft half way; the log has everything else
+            await self._rebuild(tournament_id)
+        self._resolve(batch, outcomes)
+        return
+
+    def _resolve(self, batch, outcomes):
+        for (_, _, future), (result, error) in zip(batch, outcomes):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        return
+
+    def _apply_batch(self, batch):
+        """
+        Applies the batch's calls in order.
+
+        Returns:
+            (outcomes, unexpected): a (result, error) pair per call, and whether
+            any call raised something other than DraftError.
+        """
+        outcomes = []
+        unexpected = False
+        for func, args, _ in batch:
+            try:
+                outcomes.append((func(*args), None))
+            except DraftError as e:
+                outcomes.append((None, e))
+            except Exception as e:
+                print(f"Draft change {getattr(func, '__name__', func)} failed: {e}")
+                outcomes.append((None, e))
+                unexpected = True
+        return outcomes, unexpected
+
+    async def _commit(self, tournament_id: int):
+        """
+        Writes the tournament's queued log rows in one transaction.
+
+        Returns:
+            None once they are saved, or the error after rebuilding the tournament from the log.
+        """
+        log = self.draft_manager.log
+        if log is None:
+            return None
+        events, snapshot = log.take_pending(tournament_id)
+        if not events and snapshot is None:
+            return None
+        try:
+            await self._run(log.write, tournament_id, events, snapshot)
+        except Exception as e:
+            print(f"Tournament {tournament_id}: draft changes were not saved: {e}")
+            await self._rebuild(tournament_id)
+            return e
+        return None
+
+    async def _rebuild(self, tournament_id: int):
+        """
+        Replaces the tournament's lobby and draft with what the log holds.
+        """
+        log = self.draft_manager.log
+        if log is None:
+            return
+        try:
+            draft, replay = await self._run(log.load, tournament_id, self.draft_manager.catalog)
+            self.draft_manager.restore(tournament_id, draft, replay)
+        except Exception as e:
+            print(f"Tournament {tournament_id}: cannot rebuild the draft from the log: {e}")
+        return
+
+    async def _run(self, func, *args):
+        if self.async_db is not None:
+            return await self.async_db.run(func, *args)
+        return func(*args)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Optional
+
+DEFAULT_JOB_WORKERS = 4
+DEFAULT_LATENCY_SAMPLES = 256
+
+
+class JobStats:
+    """
+    Counts and recent wait/run times of one kind of job.
+    """
+
+    def __init__(self, samples: int = DEFAULT_LATENCY_SAMPLES):
+        self.completed = 0
+        self.failed = 0
+        self.wait_seconds: Deque[float] = deque(maxlen=samples)
+        self.run_seconds: Deque[float] = deque(maxlen=samples)
+        return
+
+    def record(self, wait: float, run: float, failed: bool):
+        if failed:
+            self.failed += 1
+        else:
+            self.completed += 1
+        self.wait_seconds.append(wait)
+        self.run_seconds.append(run)
+        return
+
+
+def percentile(samples, fraction: float) -> float:
+    """
+    Returns the sample at the given fraction (0 to 1) of the sorted samples, 0.0 if there are none.
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class JobRunner:
+    """
+    Runs slow command handlers on a fixed number of worker tasks, taking turns between guilds.
+
+    Each guild has its own FIFO of jobs. Workers visit the guilds with work
+    in round-robin order, so one guild queueing many jobs delays only its
+    own jobs, and at most max_workers jobs run at once. run() defers the
+    interaction first, so Discord's 3-second window is met however long
+    the job waits; the job's own ctx.send() then becomes the follow-up.
+
+    Jobs are coroutines and run on the event loop; blocking work inside a
+    job should still go through AsyncDatabaseManager.run() or a thread.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_JOB_WORKERS):
+        """
+        Initializes the runner. Workers start with the first job.
+
+        Args:
+            max_workers (int): Jobs that may run at the same time.
+        """
+        self.max_workers = max_workers
+        # guild id -> queued (name, func, args, future, queued_at)
+        self._queues: "OrderedDict[Optional[int], Deque[tuple]]" = OrderedDict()
+        self._ready: Optional[asyncio.Semaphore] = None
+        self._workers = []
+        self.running = 0
+        self.stats: Dict[str, JobStats] = {}
+        return
+
+    def _start(self):
+        if self._ready is None:
+            self._ready = asyncio.Semaphore(0)
+            self._workers = [asyncio.create_task(self._work()) for _ in range(self.max_workers)]
+        return
+
+    def submit(self, guild_id: Optional[int], name: str, func, *args) -> asyncio.Future:
+        """
+        Queues await func(*args) for a guild.
+
+        Args:
+            guild_id (int): The guild to charge the job to; None for direct messages.
+            name (str): The kind of job, for stats.
+
+        Returns:
+            A future with the job's result or exception.
+        """
+        self._start()
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(guild_id, deque()).append((name, func, args, future, time.perf_counter()))
+        self._ready.release()
+        return future
+
+    async def run(self, ctx, name: str, func, *args):
+        """
+        Defers the interaction, then queues func(*args) for ctx's guild and waits for it.
+        """
+        if not ctx.deferred and not ctx.responded:
+            await ctx.defer()
+        guild_id = int(ctx.guild_id) if ctx.guild_id is not None else None
+        return await self.submit(guild_id, name, func, *args)
+
+    def _next_job(self) -> tuple:
+        guild_id, queue = self._queues.popitem(last=False)
+        job = queue.popleft()
+        if queue:
+            # back of the line behind every other guild with work
+            self._queues[guild_id] = queue
+        return job
+
+    async def _work(self):
+        while True:
+            await self._ready.acquire()
+            name, func, args, future, queued_at = self._next_job()
+            if future.cancelled():
+                continue
+            started = time.perf_counter()
+            self.running += 1
+            failed = False
+            try:
+                result = await func(*args)
+                if not future.done():
+                    future.set_result(result)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                failed = True
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self.running -= 1
+                self.stats.setdefault(name, JobStats()).record(started - queued_at,
+                                                               time.perf_counter() - started, failed)
+
+    def queue_depth(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def queue_depth_by_guild(self) -> Dict[Optional[int], int]:
+        return {guild_id: len(queue) for guild_id, queue in self._queues.items()}
+
+    def shutdown(self):
+        """
+        Cancels the workers and every queued job.
+
+        Safe to call at exit after the event loop has closed, when there is nothing left to cancel.
+        """
+        for worker in self._workers:
+            if not worker.get_loop().is_closed():
+                worker.cancel()
+        for queue in self._queues.values():
+            for job in queue:
+                if not job[3].get_loop().is_closed():
+                    job[3].cancel()
+        self._queues.clear()
+        self._workers = []
+        self._ready = None
+        return
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+# Discord's embed limits
+EMBED_MAX_FIELDS = 25
+EMBED_MAX_CHARS = 6000
+FIELD_MAX_CHARS = 1024
+TITLE_MAX_CHARS = 256
+
+# room left in every page for the title and the "Page i/n" footer
+PAGE_RESERVED_CHARS = TITLE_MAX_CHARS + 64
+DEFAULT_FIELD_NAME = "MSG:"
+# reports longer than this many pages are sent as a text file instead
+DEFAULT_ATTACHMENT_PAGES = 5
+
+DEFAULT_MAX_REPORTS = 64
+DEFAULT_REPORT_TTL = 3600.0
+
+Field = Tuple[str, str]
+
+
+def split_line(line: str, limit: int = FIELD_MAX_CHARS) -> List[str]:
+    """
+    Splits a line into pieces of at most limit characters, preferring to break at spaces.
+    """
+    pieces = []
+    while len(line) > limit:
+        cut = line.rfind(" ", 0, limit)
+        if cut <= 0:
+            cut = limit
+        pieces.append(line[:cut])
+        line = line[cut:].lstrip(" ")
+    pieces.append(line)
+    return pieces
+
+
+def pack_fields(lines: Iterable[str], name: str = DEFAULT_FIELD_NAME) -> Iterable[Field]:
+    """
+    Greedily joins lines with newlines into field values of at most FIELD_MAX_CHARS.
+
+    Consumes lines lazily and yields each (name, value) field as soon as it is full.
+    """
+    value = ""
+    for line in lines:
+        for piece in split_line(line):
+            if value and len(value) + 1 + len(piece) > FIELD_MAX_CHARS:
+                yield name, value
+                value = ""
+            value = value + "\n" + piece if value else piece
+    if value:
+        yield name, value
+    return
+
+
+def pack_pages(fields: Iterable[Field]) -> List[List[Field]]:
+    """
+    Greedily fills pages with fields, each page fitting one embed's field and character limits.
+    """
+    pages = []
+    page = []
+    size = PAGE_RESERVED_CHARS
+    for field in fields:
+        field_size = len(field[0]) + len(field[1])
+        if page and (len(page) == EMBED_MAX_FIELDS or size + field_size > EMBED_MAX_CHARS):
+            pages.append(page)
+            page = []
+            size = PAGE_RESERVED_CHARS
+        page.append(field)
+        size += field_size
+    if page:
+        pages.append(page)
+    return pages
+
+
+class Report:
+    """
+    A validation report split into embed-sized pages, kept whole for the text attachment.
+
+    Reports are built in full, not streamed: validation messages are sorted
+    by cell and a pick's conflicts depend on every other pick, so none is
+    final until the whole sheet has been checked.
+    """
+
+    def __init__(self, title: str, messages: List[str], prefix: str = "Info: ",
+                 attachment_pages: int = DEFAULT_ATTACHMENT_PAGES):
+        """
+        Builds the report.
+
+        Args:
+            title (str): The embed title.
+            messages (list): The report lines, e.g. a validator's ban and pick messages.
+            prefix (str): Put in front of every line.
+            attachment_pages (int): Reports with more pages than this are sent as a file.
+        """
+        self.report_id: Optional[str] = None
+        self.title = title[:TITLE_MAX_CHARS]
+        self.lines: List[str] = [f"{prefix}{message}" for message in messages]
+        self.pages = pack_pages(pack_fields(self.lines))
+        self.use_attachment = len(self.pages) > attachment_pages
+        return
+
+    def __len__(self):
+        return len(self.lines)
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+
+    def page(self, number: int) -> List[Field]:
+        """
+        Returns a page's fields; number is clamped to the pages that exist.
+        """
+        if not self.pages:
+            return []
+        return self.pages[max(0, min(number, len(self.pages) - 1))]
+
+    def footer(self, number: int) -> str:
+        return f"Page {number + 1}/{max(1, self.page_count)}, {len(self.lines)} issues"
+
+    def as_text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+class ReportCache:
+    """
+    Recently sent reports by id, so pagination buttons never re-run validation.
+
+    Holds at most max_reports reports, evicting the least recently viewed,
+    and forgets reports older than ttl seconds. Safe to use from several threads.
+    """
+
+    def __init__(self, max_reports: int = DEFAULT_MAX_REPORTS, ttl: float = DEFAULT_REPORT_TTL):
+        self.max_reports = max_reports
+        self.ttl = ttl
+        self._reports: "OrderedDict[str, Tuple[float, Report]]" = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        return
+
+    def put(self, report: Report) -> str:
+        """
+        Stores the report and returns the id it was given.
+        """
+        with self._lock:
+            report.report_id = f"{int(time.time()):x}{next(self._ids):x}"
+            self._reports[report.report_id] = (time.monotonic(), report)
+            while len(self._reports) > self.max_reports:
+                self._reports.popitem(last=False)
+        return report.report_id
+
+    def get(self, report_id: str) -> Optional[Report]:
+        """
+        Returns the report, or None if it expired or was evicted.
+        """
+        with self._lock:
+            entry = self._reports.get(report_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            if time.monotonic() - entry[0] > self.ttl:
+                del self._reports[report_id]
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._reports.move_to_end(report_id)
+            return entry[1]
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+import threading
+from typing import Dict, List, Optional
+
+from ..database.models.tournament import Tournament
+
+
+class TournamentRegistry:
+    """
+    Every tournament the bot knows about, cached in memory by guild and tournament id.
+
+    The cache is write-through: create(), update() and delete() change the
+    tournaments table first and the cache only after the write succeeds,
+    so the cache never holds anything the database does not. Reads such as
+    list() never touch the database.
+
+    Writes block on SQLite and should run on a worker thread, e.g. with
+    AsyncDatabaseManager.run(). A lock keeps those threads from changing
+    the cache while the event loop reads it.
+    """
+
+    def __init__(self, db_manager=None):
+        """
+        Initializes the registry and loads every tournament.
+
+        Args:
+            db_manager (DatabaseManager, optional): Where tournaments are stored.
+                                                    Without it they only live in memory.
+        """
+        self.db_manager = db_manager
+        self._by_guild: Dict[int, Dict[int, Tournament]] = {}
+        self._lock = threading.Lock()
+        self._next_memory_id = 1
+        if db_manager is not None:
+            self.load()
+        return
+
+    def load(self):
+        """
+        Replaces the cache with the contents of the tournaments table.
+        """
+        by_guild = {}
+        for tournament in self.db_manager.get_all_tournaments():
+            by_guild.setdefault(tournament.discord_server_id, {})[tournament.tournament_id] = tournament
+        with self._lock:
+            self._by_guild = by_guild
+        return
+
+    def list(self, guild_id: int) -> List[Tournament]:
+        """
+        Returns a guild's tournaments, oldest first.
+        """
+        with self._lock:
+            return list(self._by_guild.get(int(guild_id), {}).values())
+
+    def list_all(self) -> List[Tournament]:
+        """
+        Returns every guild's tournaments.
+        """
+        with self._lock:
+            return [tournament for tournaments in self._by_guild.values() for tournament in tournaments.values()]
+
+    def get(self, guild_id: int, tournament_id: int) -> Optional[Tournament]:
+        """
+        Returns one of a guild's tournaments, or None.
+        """
+        with self._lock:
+            return self._by_guild.get(int(guild_id), {}).get(tournament_id)
+
+    def create(self, tournament: Tournament) -> Optional[Tournament]:
+        """
+        Stores a new tournament and caches it.
+
+        Returns:
+            The tournament with its tournament_id set, or None if the insert failed.
+        """
+        if self.db_manager is not None:
+            self.db_manager.create_tournament(tournament)
+            if tournament.tournament_id is None:
+                return None
+        else:
+            with self._lock:
+                tournament.tournament_id = self._next_memory_id
+                self._next_memory_id += 1
+        with self._lock:
+            self._by_guild.setdefault(tournament.discord_server_id, {})[tournament.tournament_id] = tournament
+        return tournament
+
+    def update(self, tournament: Tournament) -> bool:
+        """
+        Stores a changed tournament and caches it.
+
+        Cached tournaments are shared with readers, so pass a changed copy
+        rather than changing the cached object; it replaces the cached one
+        only once the write succeeds.
+
+        Returns:
+            True if the tournament was stored, False if the write failed.
+        """
+        if self.db_manager is not None:
+            if self.db_manager.update_tournament(tournament) == 0:
+                return False
+        with self._lock:
+            self._by_guild.setdefault(tournament.discord_server_id, {})[tournament.tournament_id] = tournament
+        return True
+
+    def delete(self, guild_id: int, tournament_id: int) -> bool:
+        """
+        Removes one of a guild's tournaments.
+
+        Returns:
+            True if the guild had the tournament and it was deleted.
+        """
+        if self.get(guild_id, tournament_id) is None:
+            return False
+        if self.db_manager is not None:
+            if self.db_manager.delete_tournament(tournament_id) == 0:
+                return False
+        with self._lock:
+            self._by_guild.get(int(guild_id), {}).pop(tournament_id, None)
+        return True
@@ -5,15 +5,16 @@ from ..database import DatabaseManager
 from .create_user_database import create_user_database
 from .list_users import list_users
 from .add_user import add_user
-from .ingest_pokemon_list import create_pokemon_database
+from .ingest_pokemon_list import create_pokemon_database, sync_pokemon_database
 from .google_commands import display_draft_sheet
 from ..logic.sheet_validation import validate_draft_sheet
 from ..logic.sheet_validation import parse_bans
 from ..logic.sheet_validation import show_player_picks
 from ..logic.dracoviz_io import read_dracoviz_data, report_dracoviz_data
-from .guild_commands import create_guild_database, add_guild, remove_guild, list_guilds, set_guild_admin_channel_id, add_guild_tournament_channel_id, remove_guild_tournament_channel_id
+from .guild_commands import create_guild_database, add_guild, remove_guild, list_guilds, set_guild_admin_channel_id, add_guild_tournament_channel_id, remove_guild_tournament_channel_id, find_guild_channel
 
 import argparse
+import os
 import sys
 
 g_sheet_url = "https://docs.google.com/spreadsheets/d/1IyUI18bP2hPjsvZhADDYe93q4QACJ97tpbn8P9CwNE0/edit?gid=0#gid=0"
@@ -24,9 +25,9 @@ def parse_arguments(argv):
 
     parser.add_argument(
         "action",
-        choices=["create-pokemon-db", "list-pokemon-by-dex", "list-pokemon-by-id", "list-all-pokemon",
+        choices=["create-pokemon-db", "sync-pokemon-db", "list-pokemon-by-dex", "list-pokemon-by-id", "list-all-pokemon",
                  "create-user-db", "add-user", "list-users",
-                 "create-guild-db", "add-guild", "remove-guild", "list-guilds", "set-admin-channel-id", "add-tournament-channel-id", "remove-tournament-channel-id",
+                 "create-guild-db", "add-guild", "remove-guild", "list-guilds", "set-admin-channel-id", "add-tournament-channel-id", "remove-tournament-channel-id", "find-channel",
                  "display-draft-sheet", "validate-draft-sheet", "parse-bans",
                  "show-player-picks",
                  "show-dracoviz-data", "report-dracoviz-data"],
@@ -78,11 +79,18 @@ def create_pokemon_database_UI(args):
     create_pokemon_database(db_file)
     return
 
+def sync_pokemon_database_UI(args):
+    db_file = args.db_file
+    print(f"Syncing pokemon database: {db_file}")
+    sync_pokemon_database(db_file)
+    return
+
 def list_pokemon_by_dex_UI(args):
     dex_number = args.dex
     db_file = args.db_file
     if dex_number is not None:
         print(f"Listing pokemon by dex: {dex_number} from {db_file}")
+        list_pokemon_by_dex(db_file, dex_number)
     else:
         print("Error: --dex argument is required for list-pokemon-by-dex")
         
@@ -93,11 +101,12 @@ def list_pokemon_by_id_UI(args):
     db_file = args.db_file
     if id_number is not None:
         print(f"Listing pokemon by id: {id_number} from {db_file}")
+        list_pokemon_by_id(db_file, id_number)
     else:
         print("Error: --id argument is required for list-pokemon-by-id")
     return
 
-from .commands import list_all_pokemon
+from .commands import list_all_pokemon, list_pokemon_by_dex, list_pokemon_by_id
 
 def list_all_pokemon_UI(args):
     db_file = args.db_file
@@ -201,12 +210,29 @@ def remove_guild_tournament_channel_id_UI(args):
     remove_guild_tournament_channel_id(db_file, guild_id, channel_id)
     return
 
+def find_guild_channel_UI(args):
+    db_file = args.db_file
+    channel_id = args.channel_id
+    find_guild_channel(db_file, channel_id)
+    return
+
+def migrate_database(db_file):
+    db_manager = DatabaseManager(db_file)
+    try:
+        db_manager.migrate()
+    finally:
+        db_manager.close()
+    return
+
 def main(argv):
     """Main function for the Winona CLI tool."""
     args = parse_arguments(argv)
+    if os.path.exists(args.db_file):
+        migrate_database(args.db_file)
     actions = {
         # POKEMON-START
         "create-pokemon-db": create_pokemon_database_UI,
+        "sync-pokemon-db": sync_pokemon_database_UI,
         "list-pokemon-by-dex": list_pokemon_by_dex_UI,
         "list-pokemon-by-id": list_pokemon_by_id_UI,
         "list-all-pokemon": list_all_pokemon_UI,
@@ -226,6 +252,7 @@ def main(argv):
         "set-admin-channel-id": set_guild_admin_channel_id_UI,
         "add-tournament-channel-id": add_guild_tournament_channel_id_UI,
         "remove-tournament-channel-id": remove_guild_tournament_channel_id_UI,
+        "find-channel": find_guild_channel_UI,
         # GUILD-END
         #
         # GOOGLE-SHEET-START
@@ -25,6 +25,35 @@ def list_all_pokemon(db_file):
         db_manager.close()
     return
 
+def list_pokemon_by_dex(db_file, dex_number):
+    try:
+        db_manager = DatabaseManager(db_file)
+        for p in db_manager.get_pokemon_species_by_dex_numbers([dex_number]):
+            print(p)
+    except FileNotFoundError:
+        print(f"Error: Database file not found at {db_file}")
+    except Exception as e:
+        print(f"An error occurred while listing pokemon: {e}")
+    finally:
+        db_manager.close()
+    return
+
+def list_pokemon_by_id(db_file, species_id):
+    try:
+        db_manager = DatabaseManager(db_file)
+        p = db_manager.get_pokemon_species_by_id(species_id)
+        if p:
+            print(p)
+        else:
+            print(f"No pokemon with id {species_id}.")
+    except FileNotFoundError:
+        print(f"Error: Database file not found at {db_file}")
+    except Exception as e:
+        print(f"An error occurred while listing pokemon: {e}")
+    finally:
+        db_manager.close()
+    return
+
 def main(argv):
     db_file = "my_database.db"
     if len(argv) > 1:
@@ -2,12 +2,12 @@
 
 import sqlite3
 from ..database import DatabaseManager
-from ..database.models.guild import Guild
+from ..database.models.guild import Guild, GUILD_CHANNEL_TOURNAMENT
 from typing import Optional, List
 
 def create_guild_database(db_file: str) -> bool:
     """
-    Creates the 'guilds' table in the specified SQLite database if it doesn't exist.
+    Creates the 'guilds' and 'guild_channels' tables in the specified SQLite database if they don't exist.
 
     Args:
         db_file: The path to the SQLite database file.
@@ -149,9 +149,10 @@ def set_guild_admin_channel_id(db_file: str, guild_id: int, admin_channel_id: in
     """
     try:
         db_manager = DatabaseManager(db_file)
-        guild = db_manager.get_guild_by_id(guild_id)
-        guild.admin_channel_id = admin_channel_id
-        db_manager.update_guild(guild)
+        if db_manager.get_guild_by_id(guild_id) is None:
+            print(f"Error: Guild with ID {guild_id} not found in database.")
+            return False
+        db_manager.set_guild_admin_channel(guild_id, admin_channel_id)
         return True
     except FileNotFoundError:
         print(f"Error: Database file not found at {db_file}")
@@ -177,10 +178,10 @@ def add_guild_tournament_channel_id(db_file: str, guild_id: int, channel_id: int
     """
     try:
         db_manager = DatabaseManager(db_file)
-        guild = db_manager.get_guild_by_id(guild_id)
-        if channel_id not in guild.tournament_channel_ids:
-            guild.tournament_channel_ids.append(channel_id)
-            db_manager.update_guild(guild)
+        if db_manager.get_guild_by_id(guild_id) is None:
+            print(f"Error: Guild with ID {guild_id} not found in database.")
+            return False
+        db_manager.add_guild_channel(guild_id, channel_id, GUILD_CHANNEL_TOURNAMENT)
         return True
     except FileNotFoundError:
         print(f"Error: Database file not found at {db_file}")
@@ -206,10 +207,7 @@ def remove_guild_tournament_channel_id(db_file: str, guild_id: int, channel_id:
     """
     try:
         db_manager = DatabaseManager(db_file)
-        guild = db_manager.get_guild_by_id(guild_id)
-        if channel_id in guild.tournament_channel_ids:
-            guild.tournament_channel_ids.remove(channel_id)
-            db_manager.update_guild(guild)
+        db_manager.remove_guild_channel(guild_id, channel_id, GUILD_CHANNEL_TOURNAMENT)
         return True
     except FileNotFoundError:
         print(f"Error: Database file not found at {db_file}")
@@ -223,3 +221,33 @@ def remove_guild_tournament_channel_id(db_file: str, guild_id: int, channel_id:
     finally:
         db_manager.close()
     return False
+
+def find_guild_channel(db_file: str, channel_id: int) -> bool:
+    """
+    Prints the guild that uses a channel, and what it uses it for.
+
+    Args:
+        db_file: The path to the SQLite database file.
+        channel_id: The ID of a Discord channel.
+    """
+    try:
+        db_manager = DatabaseManager(db_file)
+        found = db_manager.get_guild_for_channel(channel_id)
+        if found is None:
+            print(f"Channel {channel_id} is not used by any guild.")
+            return False
+        guild_id, kinds = found
+        print(f"Channel {channel_id} belongs to guild {guild_id}: {', '.join(sorted(kinds))}")
+        return True
+    except FileNotFoundError:
+        print(f"Error: Database file not found at {db_file}")
+        return False
+    except sqlite3.Error as e:
+        print(f"An SQLite error occurred while finding channel: {e}")
+        return False
+    except Exception as e:
+        print(f"An unexpected error occurred while finding channel: {e}")
+        return False
+    finally:
+        db_manager.close()
+    return False
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import hashlib
 import json
 import os
 import re
@@ -7,6 +8,14 @@ import sys
 from ..database import DatabaseManager
 from ..database.models.pokemon_species import PokemonSpecies
 
+# TODO: This is fragile
+g_gamemaster_json = "./external/pvpoke/src/data/gamemaster/pokemon.json"
+g_gamemaster_hash_key = "gamemaster_pokemon_sha256"
+
+def file_sha256(filename):
+    with open(filename, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
 def load_json(filename):
     data = {}
     if os.path.exists(filename):
@@ -72,8 +81,7 @@ def get_region_from_name(species_name):
             break
     return form
 
-def insert_one(dex_entry_json, db_manager):
-    print(dex_entry_json)
+def species_from_entry(dex_entry_json):
     name = dex_entry_json['speciesName']
     species_id = dex_entry_json['speciesId']
     dex_number = dex_entry_json['dex']
@@ -82,7 +90,10 @@ def insert_one(dex_entry_json, db_manager):
     shadow = is_shadow(dex_entry_json) # bool
     mega = is_mega(dex_entry_json)     # bool
     species = PokemonSpecies(name=name, species_id_str=species_id, dex_number=dex_number, region=region, form=form, shadow=shadow, mega=mega)
-    db_manager.create_pokemon_species(species)
+    return species
+
+def insert_one(dex_entry_json, db_manager):
+    db_manager.create_pokemon_species(species_from_entry(dex_entry_json))
     return
 
 def insert_all(data, db_manager):
@@ -91,19 +102,83 @@ def insert_all(data, db_manager):
     return
 
 def create_pokemon_database(db_file):
-    # TODO: This is fragile
-    source_json = "./external/pvpoke/src/data/gamemaster/pokemon.json"
+    source_json = g_gamemaster_json
     if not os.path.exists(source_json):
         raise FileNotFoundError(source_json)
     try:
         db_manager = DatabaseManager(db_file) 
+        source_hash = file_sha256(source_json)
+        data = load_json(source_json)
+        print(f"Read {len(data)} entries from {source_json}")
+        species_list = [species_from_entry(entry) for entry in data]
         # TODO: this needs a big warning, or something.
-        db_manager.clear_pokemon_species_table()
-        db_manager.drop_pokemon_species_table()
+        count = db_manager.replace_pokemon_species_table(species_list)
+        print(f"Wrote {count} species to pokemon_species")
+        db_manager.create_metadata_table()
+        db_manager.set_metadata(g_gamemaster_hash_key, source_hash)
+    except Exception as e:
+        raise e
+    finally:
+        db_manager.close()
+    return
 
+def diff_pokemon_species(species_list, sync_state):
+    """
+    Compares gamemaster species with the stored rows, keyed by species_id_str.
+
+    Args:
+        species_list (list): PokemonSpecies built from the gamemaster.
+        sync_state (dict): DatabaseManager.get_pokemon_species_sync_state() output.
+
+    Returns:
+        (inserts, updates, deleted_ids) ready for DatabaseManager.sync_pokemon_species().
+    """
+    inserts = []
+    updates = []
+    seen = set()
+    for species in species_list:
+        if species.species_id_str in seen:
+            continue
+        seen.add(species.species_id_str)
+        state = sync_state.get(species.species_id_str)
+        if state is None:
+            inserts.append(species)
+            continue
+        species_id, content_hash, deleted = state
+        if deleted or content_hash != species.content_hash():
+            species.species_id = species_id
+            updates.append(species)
+    deleted_ids = [state[0] for species_id_str, state in sync_state.items()
+                   if species_id_str not in seen and not state[2]]
+    return inserts, updates, deleted_ids
+
+def sync_pokemon_database(db_file):
+    """
+    Brings pokemon_species up to date with the gamemaster without changing existing IDs.
+
+    New species are inserted, changed species are updated in place, and
+    species missing from the gamemaster are marked deleted. If the
+    gamemaster file has not changed since the last ingest, nothing is read.
+    """
+    source_json = g_gamemaster_json
+    if not os.path.exists(source_json):
+        raise FileNotFoundError(source_json)
+    try:
+        db_manager = DatabaseManager(db_file)
         db_manager.create_pokemon_species_table()
+        db_manager.migrate()
+        source_hash = file_sha256(source_json)
+        if db_manager.get_metadata(g_gamemaster_hash_key) == source_hash:
+            print(f"{source_json} is unchanged. Nothing to do.")
+            return
         data = load_json(source_json)
-        insert_all(data, db_manager)
+        print(f"Read {len(data)} entries from {source_json}")
+        species_list = [species_from_entry(entry) for entry in data]
+        sync_state = db_manager.get_pokemon_species_sync_state()
+        inserts, updates, deleted_ids = diff_pokemon_species(species_list, sync_state)
+        db_manager.sync_pokemon_species(inserts, updates, deleted_ids)
+        db_manager.set_metadata(g_gamemaster_hash_key, source_hash)
+        print(f"Added {len(inserts)}, updated {len(updates)}, deleted {len(deleted_ids)} species")
     except Exception as e:
         raise e
     finally:
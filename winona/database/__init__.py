@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
 
 from .database_manager import DatabaseManager
+from .connection_pool import ConnectionPool
 
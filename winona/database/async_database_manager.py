@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncDatabaseManager:
+    """
+    Runs DatabaseManager calls on a thread pool so coroutines never block on SQLite.
+
+    Every public DatabaseManager method is available as a coroutine with
+    the same name and arguments, returning the same User, PokemonSpecies
+    and Guild objects:
+
+        users = await async_db.get_all_users()
+
+    Work that needs DatabaseManager.transaction() should be written as a
+    plain function and passed to run(), so the whole block executes on one
+    worker thread.
+    """
+
+    def __init__(self, db_manager, max_workers: int = 4, metrics=None):
+        """
+        Initializes the facade.
+
+        Args:
+            db_manager (DatabaseManager): The manager to run calls on.
+            max_workers (int): Worker threads; matching the pool's reader count
+                               lets every worker hold a read-only connection.
+            metrics (Metrics, optional): Records how long each call runs on its worker.
+        """
+        self.db_manager = db_manager
+        self.metrics = metrics
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="winona-db")
+        return
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Runs func(*args, **kwargs) on a worker thread and returns its result.
+        """
+        loop = asyncio.get_running_loop()
+        call = functools.partial(func, *args, **kwargs)
+        if self.metrics is not None:
+            call = functools.partial(self._timed, call, getattr(func, "__name__", "call"))
+        return await loop.run_in_executor(self._executor, call)
+
+    def _timed(self, call, name: str):
+        # timed on the worker, so time spent queued for a thread is not counted
+        with self.metrics.time("winona_db_call_seconds", call=name):
+            return call()
+
+    def __getattr__(self, name):
+        attr = getattr(self.db_manager, name)
+        if name.startswith("_") or not callable(attr):
+            raise AttributeError(f"'{type(self).__name__}' object has no coroutine '{name}'")
+
+        async def call(*args, **kwargs):
+            return await self.run(attr, *args, **kwargs)
+        call.__name__ = name
+        call.__doc__ = attr.__doc__
+        return call
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stops the worker threads after queued calls finish.
+        """
+        self._executor.shutdown(wait=wait)
+        return
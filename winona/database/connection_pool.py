@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+
+import os
+import queue
+import sqlite3
+import threading
+import urllib.parse
+from contextlib import contextmanager
+
+
+class ConnectionPool:
+    """
+    Hands out SQLite connections to one database file.
+
+    SQLite allows a single writer at a time, so there is exactly one
+    writable connection, guarded by a re-entrant lock. Reads go to a small
+    pool of read-only connections. The database is switched to WAL mode,
+    so readers never wait on the writer, and the bot and the CLI can use
+    the same file at the same time.
+
+    Connections are opened in autocommit mode (isolation_level=None);
+    DatabaseManager.transaction() issues BEGIN/COMMIT explicitly.
+    """
+
+    def __init__(self, db_file: str, max_readers: int = 4, timeout: float = 30.0):
+        """
+        Opens the writable connection. Readers are opened on first use.
+
+        Args:
+            db_file (str): Path to the SQLite database file.
+            max_readers (int): Most read-only connections open at once.
+            timeout (float): Seconds to wait on a locked database before failing.
+        """
+        self.db_file = db_file
+        self.timeout = timeout
+        self.in_memory = (db_file == ":memory:")
+        self._writer_lock = threading.RLock()
+        self._writer = self._connect(read_only=False)
+        self._readers = queue.LifoQueue()
+        self._reader_slots = threading.BoundedSemaphore(max_readers)
+        self._opened = [self._writer]
+        self._opened_lock = threading.Lock()
+        self._watcher = None
+        self._watcher_lock = threading.Lock()
+        return
+
+    def _connect(self, read_only: bool) -> sqlite3.Connection:
+        if read_only:
+            path = urllib.parse.quote(os.path.abspath(self.db_file))
+            conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=self.timeout,
+                                   isolation_level=None, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(self.db_file, timeout=self.timeout,
+                                   isolation_level=None, check_same_thread=False)
+            if not self.in_memory:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def writer(self):
+        """
+        Yields the writable connection, holding the writer lock.
+        The same thread may enter again, e.g. inside a transaction.
+        """
+        with self._writer_lock:
+            yield self._writer
+
+    @contextmanager
+    def reader(self):
+        """
+        Yields a read-only connection from the pool, opening one if needed.
+        Blocks while max_readers connections are already in use.
+        """
+        if self.in_memory:
+            # every connection to :memory: is a different database
+            with self.writer() as conn:
+                yield conn
+            return
+        with self._reader_slots:
+            try:
+                conn = self._readers.get_nowait()
+            except queue.Empty:
+                conn = self._connect(read_only=True)
+                with self._opened_lock:
+                    self._opened.append(conn)
+            try:
+                yield conn
+            finally:
+                self._readers.put(conn)
+
+    def data_version(self) -> int:
+        """
+        Returns PRAGMA data_version from a connection kept only for this.
+
+        The value changes whenever another connection, in this process or
+        any other, commits to the database. It is only comparable between
+        calls on the same connection, so pooled readers cannot be used.
+        """
+        if self.in_memory:
+            with self.writer() as conn:
+                return conn.execute("PRAGMA data_version").fetchone()[0]
+        with self._watcher_lock:
+            if self._watcher is None:
+                self._watcher = self._connect(read_only=True)
+                with self._opened_lock:
+                    self._opened.append(self._watcher)
+            return self._watcher.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self):
+        """
+        Closes every connection the pool has opened. The writer closes last
+        so it can checkpoint the WAL and remove the -wal and -shm files.
+        """
+        with self._opened_lock:
+            for conn in reversed(self._opened):
+                conn.close()
+            self._opened = []
+        return
@@ -1,49 +1,137 @@
 #!/usr/bin/env python3
 
+import ast
 import sqlite3
 import sys
+import threading
+from contextlib import contextmanager
 
-import sqlite3
-from typing import List, Optional, Tuple
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from .connection_pool import ConnectionPool
 from .models.user import User
 from .models.pokemon_species import PokemonSpecies
-from .models.guild import Guild
+from .models.guild import Guild, GUILD_CHANNEL_ADMIN, GUILD_CHANNEL_TOURNAMENT
+from .models.tournament import Tournament
 
 class DatabaseManager:
     """
     A class to manage database interactions for all models using SQLite3.
     """
 
-    def __init__(self, db_file):
+    # Column order expected by _map_pokemon_species
+    POKEMON_SPECIES_COLUMNS = "id, name, species_id_str, dex_number, region, form, shadow, mega"
+    # Column order expected by _map_tournament
+    TOURNAMENT_COLUMNS = ("id, discord_server_name, discord_server_id, trainer_role_id, tournament_name, "
+                          "tournament_description, cp_cap, round_length, ban_rounds, dracoviz_link, "
+                          "max_players, draft_status")
+    # metadata key bumped by every write to guilds or guild_channels
+    GUILD_CONFIG_VERSION_KEY = "guild_config_version"
+
+    def __init__(self, db_file, max_readers: int = 4):
         """
-        Initializes the database connection.
+        Initializes the database connection pool.
 
         Args:
             db_file (str): Path to the SQLite database file.
+            max_readers (int): Most read-only connections open at once.
         """
-        self.conn = sqlite3.connect(db_file)
-        self.cursor = self.conn.cursor()
+        self.db_file = db_file
+        self.pool = ConnectionPool(db_file, max_readers=max_readers)
+        self._local = threading.local()
         return
 
-    def execute(self, sql, params=()):
+    def _in_transaction(self) -> bool:
+        return getattr(self._local, "depth", 0) > 0
+
+    @contextmanager
+    def transaction(self):
+        """
+        Groups writes into one transaction on the writable connection.
+
+        Statements run through execute()/executemany() inside the block share
+        one COMMIT, and are rolled back together if the block raises. Reads in
+        the block see its uncommitted writes. Nested blocks join the outer one.
+
+        Yields:
+            The writable sqlite3.Connection.
+        """
+        with self.pool.writer() as conn:
+            depth = getattr(self._local, "depth", 0)
+            if depth == 0:
+                conn.execute("BEGIN IMMEDIATE")
+            self._local.depth = depth + 1
+            try:
+                yield conn
+            except BaseException:
+                self._local.depth = depth
+                if depth == 0:
+                    conn.execute("ROLLBACK")
+                raise
+            self._local.depth = depth
+            if depth == 0:
+                conn.execute("COMMIT")
+        return
+
+    def execute(self, sql, params=()) -> Optional[sqlite3.Cursor]:
         """
-        Executes an SQL statement.
+        Executes an SQL statement on a fresh cursor.
+
+        Outside transaction() the statement commits on its own, and errors are
+        printed and swallowed. Inside transaction() errors propagate so the
+        whole transaction rolls back.
 
         Args:
             sql (str): The SQL statement to execute.
             params (tuple): A tuple of parameters to substitute into the SQL statement.
+
+        Returns:
+            The cursor that ran the statement (for lastrowid and rowcount), or None on error.
         """
+        if self._in_transaction():
+            with self.pool.writer() as conn:
+                return conn.execute(sql, params)
         try:
-            self.cursor.execute(sql, params)
-            self.conn.commit()
+            with self.pool.writer() as conn:
+                return conn.execute(sql, params)
         except Exception as e:
             print(e)
             print(sql, params)
+        return None
+
+    def executemany(self, sql, seq_of_params):
+        """
+        Executes an SQL statement once per parameter tuple, with a single commit.
+
+        Args:
+            sql (str): The SQL statement to execute.
+            seq_of_params (iterable): Tuples of parameters, one per execution.
+        """
+        if self._in_transaction():
+            with self.pool.writer() as conn:
+                conn.executemany(sql, seq_of_params)
+            return
+        try:
+            with self.transaction() as conn:
+                conn.executemany(sql, seq_of_params)
+        except Exception as e:
+            print(e)
+            print(sql)
+        return
+
+    @contextmanager
+    def _read_connection(self):
+        if self._in_transaction():
+            with self.pool.writer() as conn:
+                yield conn
+        else:
+            with self.pool.reader() as conn:
+                yield conn
         return
 
     def fetchone(self, sql: str, params: tuple = ()) -> Optional[tuple]:
         """
         Executes an SQL statement and returns the first row as a tuple.
+        Runs on a read-only connection unless called inside transaction().
 
         Args:
             sql (str): The SQL statement to execute.
@@ -52,12 +140,13 @@ class DatabaseManager:
         Returns:
             The first row as a tuple, or None if no rows are found.
         """
-        self.cursor.execute(sql, params)
-        return self.cursor.fetchone()
+        with self._read_connection() as conn:
+            return conn.execute(sql, params).fetchone()
 
     def fetchall(self, sql: str, params: tuple = ()) -> List[tuple]:
         """
         Executes an SQL statement and returns all rows as a list of tuples.
+        Runs on a read-only connection unless called inside transaction().
 
         Args:
             sql (str): The SQL statement to execute.
@@ -66,8 +155,8 @@ class DatabaseManager:
         Returns:
             A list of tuples, or an empty list if no rows are found.
         """
-        self.cursor.execute(sql, params)
-        return self.cursor.fetchall()
+        with self._read_connection() as conn:
+            return conn.execute(sql, params).fetchall()
 
     def create_table(self, create_table_sql):
         """
@@ -81,9 +170,79 @@ class DatabaseManager:
 
     def close(self):
         """
-        Closes the database connection.
+        Closes every pooled database connection.
+        """
+        self.pool.close()
+        return
+
+    def get_table_columns(self, table_name: str) -> List[str]:
+        """
+        Lists the column names of a table.
+
+        Args:
+            table_name (str): The table to inspect.
+
+        Returns:
+            The column names, or an empty list if the table does not exist.
+        """
+        rows = self.fetchall(f"PRAGMA table_info({table_name})")
+        return [row[1] for row in rows]
+
+    def migrate(self):
+        """
+        Brings an existing database up to the current schema. Safe to run repeatedly.
+        """
+        self.create_metadata_table()
+        self.migrate_pokemon_species_table()
+        if self.get_table_columns("pokemon_species"):
+            self.create_pokemon_species_indexes()
+        if self.get_table_columns("users"):
+            self.create_users_indexes()
+        self.migrate_guild_table()
+        self.migrate_tournaments_table()
+        self.create_draft_tables()
+        self.create_fuzzy_match_memo_table()
+        return
+
+    # Key/value metadata, such as the hash of the last ingested gamemaster
+    def create_metadata_table(self):
+        """
+        Creates the 'metadata' table in the database.
+        """
+        create_table_sql = """
+        CREATE TABLE IF NOT EXISTS metadata (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        """
+        self.create_table(create_table_sql)
+        return
+
+    def get_metadata(self, key: str) -> Optional[str]:
+        """
+        Retrieves a metadata value.
+
+        Args:
+            key (str): The metadata key.
+
+        Returns:
+            The stored value, or None if the key is not set.
         """
-        self.conn.close()
+        row = self.fetchone("SELECT value FROM metadata WHERE key = ?", (key,))
+        if row:
+            return row[0]
+        return None
+
+    def set_metadata(self, key: str, value: str):
+        """
+        Stores a metadata value, replacing any previous value.
+
+        Args:
+            key (str): The metadata key.
+            value (str): The value to store.
+        """
+        sql = "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)"
+        self.execute(sql, (key, value))
         return
 
     # User-specific database operations
@@ -117,8 +276,9 @@ class DatabaseManager:
         """
         params = (user.discord_name, user.discord_name_in_server, user.discord_id,
                   user.pogo_trainer_name, user.pogo_trainer_code, user.timezone)
-        self.execute(sql, params)
-        user.user_id = self.cursor.lastrowid  # Update the User object with the new ID
+        cursor = self.execute(sql, params)
+        if cursor is not None:
+            user.user_id = cursor.lastrowid  # Update the User object with the new ID
         return
 
 
@@ -161,6 +321,20 @@ class DatabaseManager:
         rows = self.fetchall(sql)
         return [self._map_user(row) for row in rows]
 
+    def get_user_by_pogo_trainer_name(self, pogo_trainer_name: str) -> Optional[User]:
+        """
+        Retrieves a User object from the database by Pokémon Go trainer name, ignoring case.
+
+        Args:
+            pogo_trainer_name (str): The user's Pokémon Go trainer name.
+
+        Returns:
+            A User object if found, otherwise None.
+        """
+        sql = "SELECT id, discord_name, discord_name_in_server, discord_id, pogo_trainer_name, pogo_trainer_code, timezone FROM users WHERE lower(pogo_trainer_name) = lower(?)"
+        row = self.fetchone(sql, (pogo_trainer_name,))
+        return self._map_user(row)
+
     def update_user(self, user: User):
         """
         Updates an existing user in the database.
@@ -207,6 +381,15 @@ class DatabaseManager:
         );
         """
         self.create_table(create_table_sql)
+        self.create_users_indexes()
+        return
+
+    def create_users_indexes(self):
+        """
+        Creates the secondary indexes on the 'users' table.
+        discord_id is already indexed by its UNIQUE constraint.
+        """
+        self.execute("CREATE INDEX IF NOT EXISTS idx_users_pogo_trainer_name ON users (lower(pogo_trainer_name))")
         return
 
     # PokemonSpecies-specific database operations
@@ -235,13 +418,14 @@ class DatabaseManager:
             species (PokemonSpecies): The PokemonSpecies object to create.
         """
         sql = """
-        INSERT INTO pokemon_species (name, species_id_str, dex_number, region, form, shadow, mega)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
+        INSERT INTO pokemon_species (name, species_id_str, dex_number, region, form, shadow, mega, content_hash)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         """
         params = (species.name, species.species_id_str, species.dex_number, species.region, species.form,
-                  species.shadow, species.mega)
-        self.execute(sql, params)
-        species.species_id = self.cursor.lastrowid  # Get the new ID
+                  species.shadow, species.mega, species.content_hash())
+        cursor = self.execute(sql, params)
+        if cursor is not None:
+            species.species_id = cursor.lastrowid  # Get the new ID
         return
 
     def get_pokemon_species_by_dex_number(self, dex_number: int) -> Optional[PokemonSpecies]:
@@ -254,10 +438,55 @@ class DatabaseManager:
         Returns:
             A PokemonSpecies object if found, otherwise None.
         """
-        sql = "SELECT * FROM pokemon_species WHERE dex_number = ?"
+        sql = f"SELECT {self.POKEMON_SPECIES_COLUMNS} FROM pokemon_species WHERE dex_number = ? AND deleted = 0"
         row = self.fetchone(sql, (dex_number,))
         return self._map_pokemon_species(row)
 
+    def get_pokemon_species_by_dex_numbers(self, dex_numbers: List[int]) -> List[PokemonSpecies]:
+        """
+        Retrieves every PokemonSpecies sharing any of the Dex numbers, in one query.
+
+        Args:
+            dex_numbers (list): The Pokédex numbers to look up.
+
+        Returns:
+            A list of PokemonSpecies objects in table order.
+        """
+        if len(dex_numbers) == 0:
+            return []
+        placeholders = ", ".join("?" for _ in dex_numbers)
+        sql = f"SELECT {self.POKEMON_SPECIES_COLUMNS} FROM pokemon_species WHERE dex_number IN ({placeholders}) AND deleted = 0 ORDER BY id"
+        rows = self.fetchall(sql, tuple(dex_numbers))
+        return [self._map_pokemon_species(row) for row in rows]
+
+    def get_pokemon_species_by_name(self, name: str) -> Optional[PokemonSpecies]:
+        """
+        Retrieves a PokemonSpecies object from the database by name, ignoring case.
+
+        Args:
+            name (str): The name of the species.
+
+        Returns:
+            A PokemonSpecies object if found, otherwise None.
+        """
+        sql = f"SELECT {self.POKEMON_SPECIES_COLUMNS} FROM pokemon_species WHERE lower(name) = lower(?) AND deleted = 0 ORDER BY id"
+        row = self.fetchone(sql, (name,))
+        return self._map_pokemon_species(row)
+
+    def get_pokemon_species_by_id_str(self, species_id_str: str) -> Optional[PokemonSpecies]:
+        """
+        Retrieves a PokemonSpecies object from the database by its species_id_str.
+
+        Args:
+            species_id_str (str): The unique string identifier, e.g. 'stunfisk_galarian'.
+
+        Returns:
+            A PokemonSpecies object if found, otherwise None.
+        """
+        sql = f"SELECT {self.POKEMON_SPECIES_COLUMNS} FROM pokemon_species WHERE species_id_str = ? AND deleted = 0 ORDER BY id"
+        row = self.fetchone(sql, (species_id_str,))
+        return self._map_pokemon_species(row)
+
     def get_pokemon_species_by_id(self, species_id: int) -> Optional[PokemonSpecies]:
         """
         Retrieves a PokemonSpecies object from the database by ID.
@@ -268,7 +497,7 @@ class DatabaseManager:
         Returns:
             A PokemonSpecies object if found, otherwise None.
         """
-        sql = "SELECT * FROM pokemon_species WHERE id = ?"
+        sql = f"SELECT {self.POKEMON_SPECIES_COLUMNS} FROM pokemon_species WHERE id = ?"
         row = self.fetchone(sql, (species_id,))
         return self._map_pokemon_species(row)
 
@@ -279,7 +508,7 @@ class DatabaseManager:
         Returns:
             A list of PokemonSpecies objects.
         """
-        sql = "SELECT * FROM pokemon_species"
+        sql = f"SELECT {self.POKEMON_SPECIES_COLUMNS} FROM pokemon_species WHERE deleted = 0"
         rows = self.fetchall(sql)
         return [self._map_pokemon_species(row) for row in rows]
 
@@ -290,7 +519,7 @@ class DatabaseManager:
         Returns:
             A list of PokemonSpecies dex numbers.
         """
-        sql = "SELECT dex_number FROM pokemon_species"
+        sql = "SELECT dex_number FROM pokemon_species WHERE deleted = 0"
         rows = self.fetchall(sql)
         return [row[0] for row in rows]
 
@@ -301,7 +530,7 @@ class DatabaseManager:
         Returns:
             A list of PokemonSpecies id numbers.
         """
-        sql = "SELECT id FROM pokemon_species"
+        sql = "SELECT id FROM pokemon_species WHERE deleted = 0"
         rows = self.fetchall(sql)
         return [row[0] for row in rows]
 
@@ -314,11 +543,12 @@ class DatabaseManager:
         """
         sql = """
         UPDATE pokemon_species
-        SET name = ?, species_id_str = ?, dex_number = ?, region = ?, form = ?, shadow = ?, mega = ?
+        SET name = ?, species_id_str = ?, dex_number = ?, region = ?, form = ?, shadow = ?, mega = ?,
+            content_hash = ?
         WHERE id = ?
         """
         params = (species.name, species.species_id_str, species.dex_number, species.region, species.form,
-                  species.shadow, species.mega, species.species_id)
+                  species.shadow, species.mega, species.content_hash(), species.species_id)
         self.execute(sql, params)
         return
 
@@ -332,12 +562,12 @@ class DatabaseManager:
         self.execute(sql, (species_id,))
         return
         
-    def create_pokemon_species_table(self):
+    def _pokemon_species_table_sql(self, table_name: str) -> str:
         """
-        Creates the 'pokemon_species' table in the database.
+        Returns the CREATE TABLE statement for a pokemon_species shaped table.
         """
-        create_table_sql = """
-        CREATE TABLE IF NOT EXISTS pokemon_species (
+        return f"""
+        CREATE TABLE IF NOT EXISTS {table_name} (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             name TEXT NOT NULL,
             species_id_str TEXT NOT NULL,
@@ -345,11 +575,122 @@ class DatabaseManager:
             region TEXT,
             form TEXT,
             shadow BOOLEAN DEFAULT 0,
-            mega BOOLEAN DEFAULT 0
+            mega BOOLEAN DEFAULT 0,
+            content_hash TEXT,
+            deleted BOOLEAN DEFAULT 0
         );
         """
-        self.create_table(create_table_sql)
+
+    def create_pokemon_species_table(self):
+        """
+        Creates the 'pokemon_species' table in the database.
+        """
+        self.create_table(self._pokemon_species_table_sql("pokemon_species"))
+        self.create_pokemon_species_indexes()
+        return
+
+    def create_pokemon_species_indexes(self):
+        """
+        Creates the secondary indexes on the 'pokemon_species' table.
+        Name lookups compare lower(name), so the name index is on that expression.
+        """
+        for sql in self._pokemon_species_index_sql():
+            self.execute(sql)
+        return
+
+    def _pokemon_species_index_sql(self) -> List[str]:
+        return [
+            "CREATE INDEX IF NOT EXISTS idx_pokemon_species_dex_number ON pokemon_species (dex_number)",
+            "CREATE INDEX IF NOT EXISTS idx_pokemon_species_species_id_str ON pokemon_species (species_id_str)",
+            "CREATE INDEX IF NOT EXISTS idx_pokemon_species_name ON pokemon_species (lower(name))",
+        ]
+
+    def migrate_pokemon_species_table(self):
+        """
+        Adds columns introduced after the 'pokemon_species' table was first created.
+        """
+        columns = self.get_table_columns("pokemon_species")
+        if len(columns) == 0:
+            return
+        if "content_hash" not in columns:
+            self.execute("ALTER TABLE pokemon_species ADD COLUMN content_hash TEXT")
+        if "deleted" not in columns:
+            self.execute("ALTER TABLE pokemon_species ADD COLUMN deleted BOOLEAN DEFAULT 0")
         return
+
+    def get_pokemon_species_sync_state(self) -> Dict[str, Tuple[int, Optional[str], bool]]:
+        """
+        Retrieves what a gamemaster sync needs to know about every stored species.
+
+        Returns:
+            A dict of species_id_str -> (id, content_hash, deleted).
+        """
+        sql = "SELECT species_id_str, id, content_hash, deleted FROM pokemon_species"
+        rows = self.fetchall(sql)
+        return {row[0]: (row[1], row[2], bool(row[3])) for row in rows}
+
+    def sync_pokemon_species(self, inserts: List[PokemonSpecies], updates: List[PokemonSpecies],
+                             deleted_ids: List[int]):
+        """
+        Applies a gamemaster diff in one transaction. Existing IDs are kept.
+
+        Args:
+            inserts (list): New species to insert.
+            updates (list): Changed or restored species; species_id must be set.
+            deleted_ids (list): IDs of species to mark as deleted.
+        """
+        insert_sql = """
+        INSERT INTO pokemon_species (name, species_id_str, dex_number, region, form, shadow, mega, content_hash, deleted)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)
+        """
+        update_sql = """
+        UPDATE pokemon_species
+        SET name = ?, species_id_str = ?, dex_number = ?, region = ?, form = ?, shadow = ?, mega = ?,
+            content_hash = ?, deleted = 0
+        WHERE id = ?
+        """
+        delete_sql = "UPDATE pokemon_species SET deleted = 1 WHERE id = ?"
+        with self.transaction():
+            self.executemany(insert_sql, [
+                (s.name, s.species_id_str, s.dex_number, s.region, s.form, s.shadow, s.mega, s.content_hash())
+                for s in inserts])
+            self.executemany(update_sql, [
+                (s.name, s.species_id_str, s.dex_number, s.region, s.form, s.shadow, s.mega, s.content_hash(),
+                 s.species_id)
+                for s in updates])
+            self.executemany(delete_sql, [(species_id,) for species_id in deleted_ids])
+        return
+
+    def replace_pokemon_species_table(self, species_list: List[PokemonSpecies]) -> int:
+        """
+        Replaces the whole 'pokemon_species' table in one transaction.
+
+        The rows are bulk inserted into a shadow table, which is then renamed
+        over the old table. Other connections see either the old table or the
+        complete new one, never a half-populated table.
+
+        Args:
+            species_list (list): The PokemonSpecies objects to store.
+
+        Returns:
+            The number of rows inserted.
+        """
+        shadow_table = "pokemon_species_new"
+        sql = f"""
+        INSERT INTO {shadow_table} (name, species_id_str, dex_number, region, form, shadow, mega, content_hash)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        params = [(species.name, species.species_id_str, species.dex_number, species.region, species.form,
+                   species.shadow, species.mega, species.content_hash()) for species in species_list]
+        with self.transaction():
+            self.execute(f"DROP TABLE IF EXISTS {shadow_table}")
+            self.execute(self._pokemon_species_table_sql(shadow_table))
+            self.executemany(sql, params)
+            self.execute("DROP TABLE IF EXISTS pokemon_species")
+            self.execute(f"ALTER TABLE {shadow_table} RENAME TO pokemon_species")
+            for index_sql in self._pokemon_species_index_sql():
+                self.execute(index_sql)
+        return len(params)
        
     def clear_pokemon_species_table(self):
         """
@@ -368,84 +709,567 @@ class DatabaseManager:
         return
 
 
+    # Fuzzy match memo operations
+    def create_fuzzy_match_memo_table(self):
+        """
+        Creates the 'fuzzy_match_memo' table, a cache of resolved sheet spellings.
+        """
+        create_table_sql = """
+        CREATE TABLE IF NOT EXISTS fuzzy_match_memo (
+            normalized_input TEXT NOT NULL,
+            catalog_version TEXT NOT NULL,
+            best_match TEXT NOT NULL,
+            score REAL NOT NULL,
+            PRIMARY KEY (normalized_input, catalog_version)
+        );
+        """
+        self.create_table(create_table_sql)
+        return
+
+    def get_fuzzy_matches(self, normalized_inputs: List[str], catalog_version: str) -> Dict[str, Tuple[str, float]]:
+        """
+        Retrieves memoized matches for a catalog version.
+
+        Args:
+            normalized_inputs (list): The normalized cell texts to look up.
+            catalog_version (str): SpeciesCatalog.version the matches were made against.
+
+        Returns:
+            A dict of normalized input -> (best_match, score) for the inputs found.
+        """
+        found = {}
+        chunk_size = 500  # stay under SQLite's bound parameter limit
+        for start in range(0, len(normalized_inputs), chunk_size):
+            chunk = normalized_inputs[start:start + chunk_size]
+            placeholders = ", ".join("?" for _ in chunk)
+            sql = f"""
+            SELECT normalized_input, best_match, score FROM fuzzy_match_memo
+            WHERE catalog_version = ? AND normalized_input IN ({placeholders})
+            """
+            for row in self.fetchall(sql, (catalog_version, *chunk)):
+                found[row[0]] = (row[1], row[2])
+        return found
+
+    def put_fuzzy_matches(self, rows: List[Tuple[str, str, str, float]]):
+        """
+        Stores memoized matches.
+
+        Args:
+            rows (list): (normalized_input, catalog_version, best_match, score) tuples.
+        """
+        sql = """
+        INSERT OR REPLACE INTO fuzzy_match_memo (normalized_input, catalog_version, best_match, score)
+        VALUES (?, ?, ?, ?)
+        """
+        self.executemany(sql, rows)
+        return
+
+    def purge_fuzzy_matches(self, keep_catalog_version: str):
+        """
+        Deletes memoized matches made against any other catalog version.
+        """
+        sql = "DELETE FROM fuzzy_match_memo WHERE catalog_version != ?"
+        self.execute(sql, (keep_catalog_version,))
+        return
+
+    def get_data_version(self) -> int:
+        """
+        Returns a number that changes whenever any connection commits a change.
+        Poll it to learn when tables edited elsewhere (e.g. by the CLI) need rereading.
+        """
+        return self.pool.data_version()
+
     # Guild-specific database operations
-    def _map_guild(self, row: Optional[tuple]) -> Optional[Guild]:
+    def _map_guild(self, row: Optional[tuple], channels: List[tuple]) -> Optional[Guild]:
         """
-        Helper method to map a database row to a Guild object.
+        Helper method to map a guilds row and its guild_channels rows to a Guild object.
+
+        Args:
+            row (tuple): (guild_id, guild_name)
+            channels (list): (channel_id, kind) rows for the guild.
         """
         if row:
+            admin_channel_id = 0
+            tournament_channel_ids = []
+            for channel_id, kind in channels:
+                if kind == GUILD_CHANNEL_ADMIN:
+                    admin_channel_id = channel_id
+                elif kind == GUILD_CHANNEL_TOURNAMENT:
+                    tournament_channel_ids.append(channel_id)
             return Guild(
                 guild_id=row[0],
-                admin_channel_id=row[1],
-                tournament_channel_ids=eval(row[2]),  # Convert string representation of list back to list
-                guild_name=row[3]
+                admin_channel_id=admin_channel_id,
+                tournament_channel_ids=tournament_channel_ids,
+                guild_name=row[1]
             )
         return None
 
     def create_guild_table(self):
         """
-        Creates the 'guilds' table in the database.
+        Creates the 'guilds' and 'guild_channels' tables in the database.
         """
         create_table_sql = """
         CREATE TABLE IF NOT EXISTS guilds (
             guild_id INTEGER PRIMARY KEY,  -- Discord's guild ID (unique)
-            admin_channel_id INTEGER NOT NULL,
-            tournament_channel_ids TEXT NOT NULL,  -- Stored as a string representation of a Python list
             guild_name TEXT
         );
         """
         self.create_table(create_table_sql)
+        self.create_guild_channels_table()
+        return
+
+    def create_guild_channels_table(self):
+        """
+        Creates the 'guild_channels' table, one row per channel a guild
+        uses for admin or tournament commands.
+        """
+        create_table_sql = """
+        CREATE TABLE IF NOT EXISTS guild_channels (
+            guild_id INTEGER NOT NULL,
+            channel_id INTEGER NOT NULL,
+            kind TEXT NOT NULL,  -- 'admin' or 'tournament'
+            PRIMARY KEY (guild_id, channel_id, kind)
+        );
+        """
+        self.create_table(create_table_sql)
+        self.execute("CREATE INDEX IF NOT EXISTS idx_guild_channels_channel_id ON guild_channels (channel_id)")
+        # holds the guild config version
+        self.create_metadata_table()
+        return
+
+    def _bump_guild_config_version(self):
+        """
+        Increments the guild config version. Call inside the transaction that changes the guild tables.
+        """
+        sql = """
+        INSERT INTO metadata (key, value) VALUES (?, '1')
+        ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1
+        """
+        self.execute(sql, (self.GUILD_CONFIG_VERSION_KEY,))
+        return
+
+    def get_guild_config_version(self) -> int:
+        """
+        Returns a number that changes whenever a guild or its channels change, from any process.
+        """
+        value = self.get_metadata(self.GUILD_CONFIG_VERSION_KEY)
+        return int(value) if value else 0
+
+    def migrate_guild_table(self):
+        """
+        Moves channel ids out of the old guilds columns into guild_channels.
+
+        Older databases kept admin_channel_id in its own column and the
+        tournament channels as the string form of a Python list. The list
+        is parsed with ast.literal_eval, never eval, and the guilds table
+        is rebuilt with only guild_id and guild_name. The whole migration
+        is one transaction.
+        """
+        columns = self.get_table_columns("guilds")
+        if not columns:
+            return
+        if "tournament_channel_ids" not in columns:
+            self.create_guild_channels_table()
+            return
+        with self.transaction():
+            self.create_guild_channels_table()
+            rows = self.fetchall("SELECT guild_id, admin_channel_id, tournament_channel_ids, guild_name FROM guilds")
+            channels = []
+            for guild_id, admin_channel_id, tournament_channel_ids, guild_name in rows:
+                if admin_channel_id:
+                    channels.append((guild_id, admin_channel_id, GUILD_CHANNEL_ADMIN))
+                try:
+                    tournament_channel_ids = ast.literal_eval(tournament_channel_ids or "[]")
+                except (ValueError, SyntaxError):
+                    print(f"Guild {guild_id}: cannot parse tournament_channel_ids {tournament_channel_ids!r}")
+                    tournament_channel_ids = []
+                for channel_id in tournament_channel_ids:
+                    channels.append((guild_id, int(channel_id), GUILD_CHANNEL_TOURNAMENT))
+            self.executemany("INSERT OR IGNORE INTO guild_channels (guild_id, channel_id, kind) VALUES (?, ?, ?)",
+                             channels)
+            self.execute("""
+            CREATE TABLE guilds_new (
+                guild_id INTEGER PRIMARY KEY,  -- Discord's guild ID (unique)
+                guild_name TEXT
+            );
+            """)
+            self.execute("INSERT INTO guilds_new (guild_id, guild_name) SELECT guild_id, guild_name FROM guilds")
+            self.execute("DROP TABLE guilds")
+            self.execute("ALTER TABLE guilds_new RENAME TO guilds")
+            self._bump_guild_config_version()
+        return
+
+    def _insert_guild_channels(self, guild: Guild):
+        channels = []
+        if guild.admin_channel_id:
+            channels.append((guild.guild_id, guild.admin_channel_id, GUILD_CHANNEL_ADMIN))
+        for channel_id in guild.tournament_channel_ids:
+            channels.append((guild.guild_id, channel_id, GUILD_CHANNEL_TOURNAMENT))
+        self.executemany("INSERT OR IGNORE INTO guild_channels (guild_id, channel_id, kind) VALUES (?, ?, ?)",
+                         channels)
         return
 
     def create_guild(self, guild: Guild):
         """
-        Creates a new guild record in the database.
+        Creates a new guild record, and its channel records, in the database.
         """
         sql = """
-        INSERT INTO guilds (guild_id, admin_channel_id, tournament_channel_ids, guild_name)
-        VALUES (?, ?, ?, ?)
+        INSERT INTO guilds (guild_id, guild_name)
+        VALUES (?, ?)
         """
-        params = (guild.guild_id, guild.admin_channel_id, str(guild.tournament_channel_ids), guild.guild_name) # Store list as string
-        self.execute(sql, params)
+        with self.transaction():
+            self.execute(sql, (guild.guild_id, guild.guild_name))
+            self._insert_guild_channels(guild)
+            self._bump_guild_config_version()
         return
 
     def get_guild_by_id(self, guild_id: int) -> Optional[Guild]:
         """
         Retrieves a guild from the database by its guild_id.
         """
-        sql = "SELECT * FROM guilds WHERE guild_id = ?"
+        sql = "SELECT guild_id, guild_name FROM guilds WHERE guild_id = ?"
         row = self.fetchone(sql, (guild_id,))
-        return self._map_guild(row)
+        if row is None:
+            return None
+        channels = self.fetchall("SELECT channel_id, kind FROM guild_channels WHERE guild_id = ?", (guild_id,))
+        return self._map_guild(row, channels)
 
     def update_guild(self, guild: Guild):
         """
-        Updates an existing guild record in the database.
+        Updates an existing guild record, replacing its channel records.
         """
         sql = """
         UPDATE guilds
-        SET admin_channel_id = ?, tournament_channel_ids = ?, guild_name = ?
+        SET guild_name = ?
         WHERE guild_id = ?
         """
-        params = (guild.admin_channel_id, str(guild.tournament_channel_ids), guild.guild_name, guild.guild_id)
-        self.execute(sql, params)
+        with self.transaction():
+            self.execute(sql, (guild.guild_name, guild.guild_id))
+            self.execute("DELETE FROM guild_channels WHERE guild_id = ?", (guild.guild_id,))
+            self._insert_guild_channels(guild)
+            self._bump_guild_config_version()
         return
 
     def delete_guild(self, guild_id: int):
         """
-        Deletes a guild from the database by its guild_id.
+        Deletes a guild, and its channel records, from the database by its guild_id.
         """
-        sql = "DELETE FROM guilds WHERE guild_id = ?"
-        self.execute(sql, (guild_id,))
+        with self.transaction():
+            self.execute("DELETE FROM guild_channels WHERE guild_id = ?", (guild_id,))
+            self.execute("DELETE FROM guilds WHERE guild_id = ?", (guild_id,))
+            self._bump_guild_config_version()
         return
 
     def get_all_guilds(self) -> List[Guild]:
         """
         Retrieves all guilds from the database.
         """
-        sql = "SELECT * FROM guilds"
+        rows = self.fetchall("SELECT guild_id, guild_name FROM guilds")
+        channels_by_guild = {}
+        for guild_id, channel_id, kind in self.get_all_guild_channels():
+            channels_by_guild.setdefault(guild_id, []).append((channel_id, kind))
+        return [self._map_guild(row, channels_by_guild.get(row[0], [])) for row in rows]
+
+    def get_all_guild_channels(self) -> List[Tuple[int, int, str]]:
+        """
+        Retrieves every (guild_id, channel_id, kind) row, in insertion order.
+        """
+        return self.fetchall("SELECT guild_id, channel_id, kind FROM guild_channels ORDER BY rowid")
+
+    def set_guild_admin_channel(self, guild_id: int, channel_id: int):
+        """
+        Makes channel_id the guild's only admin channel.
+        """
+        with self.transaction():
+            self.execute("DELETE FROM guild_channels WHERE guild_id = ? AND kind = ?", (guild_id, GUILD_CHANNEL_ADMIN))
+            if channel_id:
+                self.execute("INSERT INTO guild_channels (guild_id, channel_id, kind) VALUES (?, ?, ?)",
+                             (guild_id, channel_id, GUILD_CHANNEL_ADMIN))
+            self._bump_guild_config_version()
+        return
+
+    def add_guild_channel(self, guild_id: int, channel_id: int, kind: str):
+        """
+        Adds a channel of the given kind to a guild. Adding it twice is harmless.
+        """
+        sql = "INSERT OR IGNORE INTO guild_channels (guild_id, channel_id, kind) VALUES (?, ?, ?)"
+        with self.transaction():
+            self.execute(sql, (guild_id, channel_id, kind))
+            self._bump_guild_config_version()
+        return
+
+    def remove_guild_channel(self, guild_id: int, channel_id: int, kind: str):
+        """
+        Removes a channel of the given kind from a guild.
+        """
+        sql = "DELETE FROM guild_channels WHERE guild_id = ? AND channel_id = ? AND kind = ?"
+        with self.transaction():
+            self.execute(sql, (guild_id, channel_id, kind))
+            self._bump_guild_config_version()
+        return
+
+    def get_guild_for_channel(self, channel_id: int) -> Optional[Tuple[int, FrozenSet[str]]]:
+        """
+        Finds the guild a channel belongs to, using the channel_id index.
+
+        Args:
+            channel_id (int): The Discord channel id.
+
+        Returns:
+            (guild_id, kinds), where kinds holds 'admin' and/or 'tournament',
+            or None if no guild uses the channel.
+        """
+        rows = self.fetchall("SELECT guild_id, kind FROM guild_channels WHERE channel_id = ?", (channel_id,))
+        if not rows:
+            return None
+        return (rows[0][0], frozenset(kind for guild_id, kind in rows))
+
+    # Tournament-specific database operations
+    def _map_tournament(self, row: Optional[tuple]) -> Optional[Tournament]:
+        """
+        Helper method to map a row selected with TOURNAMENT_COLUMNS to a Tournament object.
+        """
+        if row:
+            return Tournament(
+                discord_server_name=row[1],
+                discord_server_id=row[2],
+                trainer_role_id=row[3],
+                tournament_name=row[4],
+                tournament_description=row[5],
+                cp_cap=row[6],
+                round_length=row[7],
+                ban_rounds=row[8],
+                dracoviz_link=row[9],
+                max_players=row[10],
+                draft_status=row[11],
+                tournament_id=row[0],
+                db_manager=self
+            )
+        return None
+
+    def create_tournaments_table(self):
+        """
+        Creates the 'tournaments' table in the database, and its index.
+        """
+        create_table_sql = """
+        CREATE TABLE IF NOT EXISTS tournaments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            discord_server_name TEXT,
+            discord_server_id INTEGER NOT NULL,
+            trainer_role_id INTEGER,
+            tournament_name TEXT,
+            tournament_description TEXT,
+            cp_cap INTEGER,
+            round_length INTEGER,
+            ban_rounds INTEGER,
+            dracoviz_link TEXT,
+            max_players INTEGER DEFAULT 0,
+            draft_status TEXT DEFAULT 'not started'
+        );
+        """
+        self.create_table(create_table_sql)
+        self.execute("CREATE INDEX IF NOT EXISTS idx_tournaments_discord_server_id ON tournaments (discord_server_id)")
+        return
+
+    def migrate_tournaments_table(self):
+        """
+        Creates the 'tournaments' table, or adds the columns older tables lack.
+        """
+        columns = self.get_table_columns("tournaments")
+        if "max_players" not in columns and columns:
+            self.execute("ALTER TABLE tournaments ADD COLUMN max_players INTEGER DEFAULT 0")
+        if "draft_status" not in columns and columns:
+            self.execute("ALTER TABLE tournaments ADD COLUMN draft_status TEXT DEFAULT 'not started'")
+        self.create_tournaments_table()
+        return
+
+    def create_tournament(self, tournament: Tournament):
+        """
+        Creates a new tournament in the database, setting tournament.tournament_id.
+
+        Args:
+            tournament (Tournament): The Tournament object to create.
+        """
+        sql = """
+        INSERT INTO tournaments (discord_server_name, discord_server_id,
+                                 trainer_role_id, tournament_name,
+                                 tournament_description, cp_cap,
+                                 round_length, ban_rounds, dracoviz_link,
+                                 max_players, draft_status)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        params = (tournament.discord_server_name, tournament.discord_server_id,
+                  tournament.trainer_role_id, tournament.tournament_name,
+                  tournament.tournament_description, tournament.cp_cap,
+                  tournament.round_length, tournament.ban_rounds, tournament.dracoviz_link,
+                  tournament.max_players, tournament.draft_status)
+        cursor = self.execute(sql, params)
+        if cursor is not None:
+            tournament.tournament_id = cursor.lastrowid
+            tournament.db_manager = self
+        return
+
+    def update_tournament(self, tournament: Tournament) -> int:
+        """
+        Updates an existing tournament in the database.
+
+        Returns:
+            The number of rows updated: 1 on success, 0 if there is no such tournament or the write failed.
+        """
+        sql = """
+        UPDATE tournaments
+        SET discord_server_name = ?, discord_server_id = ?, trainer_role_id = ?,
+            tournament_name = ?, tournament_description = ?, cp_cap = ?,
+            round_length = ?, ban_rounds = ?, dracoviz_link = ?,
+            max_players = ?, draft_status = ?
+        WHERE id = ?
+        """
+        params = (tournament.discord_server_name, tournament.discord_server_id,
+                  tournament.trainer_role_id, tournament.tournament_name,
+                  tournament.tournament_description, tournament.cp_cap,
+                  tournament.round_length, tournament.ban_rounds, tournament.dracoviz_link,
+                  tournament.max_players, tournament.draft_status,
+                  tournament.tournament_id)
+        cursor = self.execute(sql, params)
+        return cursor.rowcount if cursor is not None else 0
+
+    def delete_tournament(self, tournament_id: int) -> int:
+        """
+        Deletes a tournament from the database by its ID.
+
+        Returns:
+            The number of rows deleted: 1 on success, 0 if there is no such tournament or the write failed.
+        """
+        cursor = self.execute("DELETE FROM tournaments WHERE id = ?", (tournament_id,))
+        return cursor.rowcount if cursor is not None else 0
+
+    def get_tournament_by_id(self, tournament_id: int) -> Optional[Tournament]:
+        """
+        Retrieves a tournament from the database by its ID.
+        """
+        sql = f"SELECT {self.TOURNAMENT_COLUMNS} FROM tournaments WHERE id = ?"
+        return self._map_tournament(self.fetchone(sql, (tournament_id,)))
+
+    def get_tournaments_by_server_id(self, discord_server_id: int) -> List[Tournament]:
+        """
+        Retrieves a Discord server's tournaments, oldest first.
+        """
+        sql = f"SELECT {self.TOURNAMENT_COLUMNS} FROM tournaments WHERE discord_server_id = ? ORDER BY id"
+        rows = self.fetchall(sql, (discord_server_id,))
+        return [self._map_tournament(row) for row in rows]
+
+    def get_all_tournaments(self) -> List[Tournament]:
+        """
+        Retrieves every tournament from the database, oldest first.
+        """
+        sql = f"SELECT {self.TOURNAMENT_COLUMNS} FROM tournaments ORDER BY id"
         rows = self.fetchall(sql)
-        return [self._map_guild(row) for row in rows]    
+        return [self._map_tournament(row) for row in rows]
+
+    # Draft event log operations
+    def create_draft_tables(self):
+        """
+        Creates the 'draft_events' and 'draft_snapshots' tables in the database.
+        """
+        create_events_sql = """
+        CREATE TABLE IF NOT EXISTS draft_events (
+            tournament_id INTEGER NOT NULL,
+            seq INTEGER NOT NULL,           -- 1, 2, 3... per tournament
+            kind TEXT NOT NULL,             -- join, leave, start, ban, pick, undo, order
+            player INTEGER,
+            species_id_str TEXT,
+            payload TEXT,                   -- JSON, only for start, order and join
+            created_at REAL NOT NULL,
+            PRIMARY KEY (tournament_id, seq)
+        ) WITHOUT ROWID;
+        """
+        create_snapshots_sql = """
+        CREATE TABLE IF NOT EXISTS draft_snapshots (
+            tournament_id INTEGER NOT NULL,
+            seq INTEGER NOT NULL,           -- last event included in the state
+            state TEXT NOT NULL,            -- JSON from Draft.to_state()
+            created_at REAL NOT NULL,
+            PRIMARY KEY (tournament_id, seq)
+        ) WITHOUT ROWID;
+        """
+        self.create_table(create_events_sql)
+        self.create_table(create_snapshots_sql)
+        return
+
+    def append_draft_events(self, events: List[tuple]):
+        """
+        Appends draft events in one transaction.
+
+        Args:
+            events (list): (tournament_id, seq, kind, player, species_id_str, payload, created_at) tuples.
+        """
+        sql = """
+        INSERT INTO draft_events (tournament_id, seq, kind, player, species_id_str, payload, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """
+        self.executemany(sql, events)
+        return
+
+    def get_draft_events(self, tournament_id: int, after_seq: int = 0) -> List[tuple]:
+        """
+        Retrieves a tournament's events after a sequence number, oldest first.
+
+        Returns:
+            A list of (seq, kind, player, species_id_str, payload) tuples.
+        """
+        sql = """
+        SELECT seq, kind, player, species_id_str, payload FROM draft_events
+        WHERE tournament_id = ? AND seq > ? ORDER BY seq
+        """
+        return self.fetchall(sql, (tournament_id, after_seq))
 
+    def get_last_draft_event_seq(self, tournament_id: int) -> int:
+        """
+        Returns the sequence number of a tournament's latest event, or 0 if it has none.
+        """
+        row = self.fetchone("SELECT MAX(seq) FROM draft_events WHERE tournament_id = ?", (tournament_id,))
+        if row and row[0] is not None:
+            return row[0]
+        return 0
+
+    def get_draft_tournament_ids(self) -> List[int]:
+        """
+        Returns the ids of every tournament with draft events.
+        """
+        rows = self.fetchall("SELECT DISTINCT tournament_id FROM draft_events ORDER BY tournament_id")
+        return [row[0] for row in rows]
+
+    def put_draft_snapshot(self, tournament_id: int, seq: int, state: str, keep: int = 2):
+        """
+        Stores a draft snapshot and deletes all but the newest keep snapshots of the tournament.
+        """
+        with self.transaction():
+            self.execute("""
+            INSERT OR REPLACE INTO draft_snapshots (tournament_id, seq, state, created_at)
+            VALUES (?, ?, ?, strftime('%s', 'now'))
+            """, (tournament_id, seq, state))
+            self.execute("""
+            DELETE FROM draft_snapshots WHERE tournament_id = ? AND seq NOT IN (
+                SELECT seq FROM draft_snapshots WHERE tournament_id = ? ORDER BY seq DESC LIMIT ?
+            )
+            """, (tournament_id, tournament_id, keep))
+        return
+
+    def get_latest_draft_snapshot(self, tournament_id: int) -> Optional[Tuple[int, str]]:
+        """
+        Returns (seq, state) of a tournament's newest snapshot, or None.
+        """
+        sql = "SELECT seq, state FROM draft_snapshots WHERE tournament_id = ? ORDER BY seq DESC LIMIT 1"
+        return self.fetchone(sql, (tournament_id,))
+
+    def delete_draft_log(self, tournament_id: int):
+        """
+        Deletes a tournament's draft events and snapshots.
+        """
+        with self.transaction():
+            self.execute("DELETE FROM draft_events WHERE tournament_id = ?", (tournament_id,))
+            self.execute("DELETE FROM draft_snapshots WHERE tournament_id = ?", (tournament_id,))
+        return
 
 def main(argv):
     db_manager = DatabaseManager("my_database.db")
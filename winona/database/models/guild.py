@@ -2,6 +2,10 @@
 
 from typing import List, Optional
 
+# guild_channels.kind values
+GUILD_CHANNEL_ADMIN = "admin"
+GUILD_CHANNEL_TOURNAMENT = "tournament"
+
 class Guild:
     """
     Represents a Discord guild.
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import hashlib
 from typing import Optional
 
 class PokemonSpecies:
@@ -43,6 +44,15 @@ class PokemonSpecies:
         self.species_id = species_id
         return
 
+    def content_hash(self) -> str:
+        """
+        Returns a hash of every stored attribute except the database ID.
+        Two rows with the same hash describe the same species.
+        """
+        fields = (self.name, self.species_id_str, self.dex_number, self.region or "",
+                  self.form or "", bool(self.shadow), bool(self.mega))
+        return hashlib.sha1(repr(fields).encode("utf-8")).hexdigest()
+
     def __repr__(self):
         """
         Returns a string representation of the PokemonSpecies object.
@@ -1,9 +1,13 @@
 #!/usr/bin/env python3
 
-import sqlite3
-from typing import Optional
-from ..database_manager import DatabaseManager
 import sys
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # imported for annotations only; database_manager imports this module
+    from ..database_manager import DatabaseManager
+
+DRAFT_NOT_STARTED = "not started"
 
 
 class Tournament:
@@ -21,8 +25,10 @@ class Tournament:
                  round_length: int, 
                  ban_rounds: int, 
                  dracoviz_link: str, 
+                 max_players: int = 0,
+                 draft_status: str = DRAFT_NOT_STARTED,
                  tournament_id: Optional[int] = None, 
-                 db_manager: Optional[DatabaseManager] = None):
+                 db_manager: Optional["DatabaseManager"] = None):
         """
         Initializes a Tournament object.
 
@@ -36,6 +42,8 @@ class Tournament:
             round_length (int): The length of each round in minutes.
             ban_rounds (int): The number of ban rounds in the tournament.
             dracoviz_link (str): The link to the Dracoviz tournament page.
+            max_players (int): The most trainers that may join. Defaults to 0 (no limit).
+            draft_status (str): Where the draft stands. Defaults to "not started".
             tournament_id (int, optional): The ID of the tournament in the database. 
                                         Defaults to None.
             db_manager (DatabaseManager, optional): The database manager instance. 
@@ -50,8 +58,11 @@ class Tournament:
         self.round_length = round_length
         self.ban_rounds = ban_rounds
         self.dracoviz_link = dracoviz_link
+        self.max_players = max_players
+        self.draft_status = draft_status
         self.tournament_id = tournament_id
         self.db_manager = db_manager
+        return
 
     def save(self):
         """
@@ -59,36 +70,11 @@ class Tournament:
         """
         if self.tournament_id:
             # Update existing tournament
-            sql = """
-            UPDATE tournaments 
-            SET discord_server_name = ?, discord_server_id = ?, trainer_role_id = ?, 
-                tournament_name = ?, tournament_description = ?, cp_cap = ?, 
-                round_length = ?, ban_rounds = ?, dracoviz_link = ?
-            WHERE id = ?
-            """
-            params = (self.discord_server_name, self.discord_server_id, 
-                      self.trainer_role_id, self.tournament_name, 
-                      self.tournament_description, self.cp_cap, 
-                      self.round_length, self.ban_rounds, self.dracoviz_link, 
-                      self.tournament_id)
+            self.db_manager.update_tournament(self)
         else:
-            # Create new tournament
-            sql = """
-            INSERT INTO tournaments (discord_server_name, discord_server_id, 
-                                     trainer_role_id, tournament_name, 
-                                     tournament_description, cp_cap, 
-                                     round_length, ban_rounds, dracoviz_link)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            params = (self.discord_server_name, self.discord_server_id, 
-                      self.trainer_role_id, self.tournament_name, 
-                      self.tournament_description, self.cp_cap, 
-                      self.round_length, self.ban_rounds, self.dracoviz_link)
-
-        self.db_manager.execute(sql, params)
-        if not self.tournament_id:
-            # Get the inserted tournament ID
-            self.tournament_id = self.db_manager.cursor.lastrowid
+            # Create new tournament; sets tournament_id
+            self.db_manager.create_tournament(self)
+        return
 
     @classmethod
     def get_by_server_id(cls, discord_server_id, db_manager):
@@ -100,12 +86,11 @@ class Tournament:
             db_manager (DatabaseManager): The database manager instance.
 
         Returns:
-            A Tournament object if found, otherwise None.
+            The server's first Tournament if found, otherwise None.
         """
-        sql = "SELECT * FROM tournaments WHERE discord_server_id = ?"
-        row = db_manager.fetchone(sql, (discord_server_id,))
-        if row:
-            return cls(*row[1:], tournament_id=row[0], db_manager=db_manager)
+        tournaments = db_manager.get_tournaments_by_server_id(discord_server_id)
+        if tournaments:
+            return tournaments[0]
         return None
 
     @classmethod
@@ -113,21 +98,8 @@ class Tournament:
         """
         Creates the 'tournaments' table in the database.
         """
-        create_table_sql = """
-        CREATE TABLE IF NOT EXISTS tournaments (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            discord_server_name TEXT,
-            discord_server_id INTEGER NOT NULL,
-            trainer_role_id INTEGER,
-            tournament_name TEXT,
-            tournament_description TEXT,
-            cp_cap INTEGER,
-            round_length INTEGER,
-            ban_rounds INTEGER,
-            dracoviz_link TEXT
-        );
-        """
-        db_manager.create_table(create_table_sql)
+        db_manager.create_tournaments_table()
+        return
 
     def __str__(self):
         """
@@ -137,6 +109,7 @@ class Tournament:
 
 # Example usage (assuming you have a `DatabaseManager` instance)
 def main(argv):
+    from ..database_manager import DatabaseManager
     db_manager = DatabaseManager("my_database.db") 
 
     # Create the tournaments table
@@ -0,0 +1,561 @@
+#!/usr/bin/env python3
+
+from typing import Dict, Hashable, Iterable, List, Optional
+
+from ..database.models.pokemon_species import PokemonSpecies
+
+ORDER_SNAKE = "snake"
+ORDER_LINEAR = "linear"
+DRAFT_ORDERS = (ORDER_SNAKE, ORDER_LINEAR)
+
+STATUS_BANNING = "banning"
+STATUS_PICKING = "picking"
+STATUS_COMPLETE = "complete"
+
+ACTION_BAN = "ban"
+ACTION_PICK = "pick"
+
+STATE_FORMAT = 1
+
+DEFAULT_PICK_ROUNDS = 6
+
+
+class DraftError(Exception):
+    """
+    A ban or pick that the draft rules do not allow. The message is meant for the player.
+    """
+    pass
+
+
+def iter_bits(mask: int):
+    """
+    Yields the positions of the set bits of mask, lowest first.
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+    return
+
+
+class Draft:
+    """
+    The state of one tournament's draft: turn order, bans and picks.
+
+    Species are identified by their position in the SpeciesCatalog, and
+    the taken, banned and eligible sets are Python ints used as bitsets
+    over those positions. Checking one species is a shift and a mask,
+    "what's left" is one AND NOT over the whole catalog, and comparing a
+    list of species against the board is a single AND.
+
+    A ban covers every species sharing the banned dex number, as bans do
+    on the draft sheet. A pick takes only the species picked.
+
+    The draft keeps the catalog's species list and lookup dicts as they
+    were when it started, so reloading the catalog does not move any bits.
+    """
+
+    def __init__(self, catalog, players: List[Hashable], order: str = ORDER_SNAKE, ban_rounds: int = 0,
+                 pick_rounds: int = DEFAULT_PICK_ROUNDS, eligible: Optional[int] = None,
+                 player_names: Optional[Dict[Hashable, str]] = None):
+        """
+        Initializes the draft.
+
+        Args:
+            catalog (SpeciesCatalog): The species that can be drafted.
+            players (list): Player ids, in first-round order.
+            order (str): "snake" reverses the order every other round, "linear" never does.
+            ban_rounds (int): Rounds of bans before the first pick, e.g. Tournament.ban_rounds.
+            pick_rounds (int): Picks each player makes.
+            eligible (int, optional): Bitset of the species allowed in this tournament.
+                                      Defaults to the whole catalog.
+            player_names (dict, optional): Display names by player id.
+        """
+        if len(players) == 0:
+            raise DraftError("A draft needs at least one player.")
+        if len(set(players)) != len(players):
+            raise DraftError("A player can only join a draft once.")
+        if order not in DRAFT_ORDERS:
+            raise DraftError(f"Unknown draft order '{order}'. Use one of: {', '.join(DRAFT_ORDERS)}.")
+        self.catalog_version = catalog.version
+        self.species: List[PokemonSpecies] = catalog.species
+        self._positions = catalog.position_by_species_id_str
+        self._dex_masks = catalog.dex_masks
+        self.all_mask = (1 << len(self.species)) - 1
+        self.eligible = self.all_mask if eligible is None else eligible & self.all_mask
+
+        self.players = list(players)
+        self.player_names = dict(player_names or {})
+        self.order = order
+        self.ban_rounds = ban_rounds
+        self.pick_rounds = pick_rounds
+        self.total_turns = len(self.players) * (ban_rounds + pick_rounds)
+
+        self.turn = 0
+        self.taken = 0
+        self.banned = 0
+        self.owner: Dict[int, Hashable] = {}
+        self.picks: Dict[Hashable, List[int]] = {player: [] for player in self.players}
+        self.bans: Dict[Hashable, List[int]] = {player: [] for player in self.players}
+        # (action, player, position, bits the action set), oldest first
+        self.actions: List[tuple] = []
+        return
+
+    # Turn order
+    def player_for_turn(self, turn: int) -> Hashable:
+        """
+        Returns the player who acts on a turn, counting ban and pick rounds together.
+        """
+        round_number, index = divmod(turn, len(self.players))
+        if self.order == ORDER_SNAKE and round_number % 2 == 1:
+            index = len(self.players) - 1 - index
+        return self.players[index]
+
+    @property
+    def status(self) -> str:
+        if self.turn >= self.total_turns:
+            return STATUS_COMPLETE
+        if self.turn // len(self.players) < self.ban_rounds:
+            return STATUS_BANNING
+        return STATUS_PICKING
+
+    @property
+    def current_player(self) -> Optional[Hashable]:
+        if self.turn >= self.total_turns:
+            return None
+        return self.player_for_turn(self.turn)
+
+    @property
+    def round_number(self) -> int:
+        """
+        The current round, from 1, counting ban rounds and pick rounds separately.
+        """
+        round_number = self.turn // len(self.players)
+        if round_number >= self.ban_rounds:
+            round_number -= self.ban_rounds
+        return round_number + 1
+
+    def name_of(self, player: Hashable) -> str:
+        return self.player_names.get(player, str(player))
+
+    # Board queries
+    def available_mask(self) -> int:
+        """
+        Returns the bitset of species that are eligible and neither banned nor taken.
+        """
+        return self.eligible & ~(self.taken | self.banned)
+
+    def is_available(self, position: int) -> bool:
+        return (self.available_mask() >> position) & 1 == 1
+
+    def count_available(self) -> int:
+        return bin(self.available_mask()).count("1")
+
+    def available(self, limit: Optional[int] = None) -> List[PokemonSpecies]:
+        """
+        Returns the species still available, in catalog order.
+        """
+        found = []
+        for position in iter_bits(self.available_mask()):
+            if limit is not None and len(found) >= limit:
+                break
+            found.append(self.species[position])
+        return found
+
+    def keep_available(self, species: Iterable[PokemonSpecies]) -> List[PokemonSpecies]:
+        """
+        Returns the species from a list, e.g. search results, that are still available.
+        """
+        available = self.available_mask()
+        kept = []
+        for p in species:
+            position = self._positions.get(p.species_id_str.casefold())
+            if position is not None and (available >> position) & 1:
+                kept.append(p)
+        return kept
+
+    def mask_of(self, positions: Iterable[int]) -> int:
+        mask = 0
+        for position in positions:
+            mask |= 1 << position
+        return mask
+
+    def conflicts(self, positions: Iterable[int]) -> List[int]:
+        """
+        Returns the positions in a planned list that can no longer be picked.
+        """
+        return list(iter_bits(self.mask_of(positions) & ~self.available_mask()))
+
+    def position_of(self, species_id_str: str) -> int:
+        """
+        Returns the catalog position of a species, or raises DraftError.
+        """
+        position = self._positions.get(species_id_str.casefold())
+        if position is None:
+            raise DraftError(f"'{species_id_str}' is not a known species.")
+        return position
+
+    # Moves
+    def _check_turn(self, player: Hashable, status: str):
+        if self.status == STATUS_COMPLETE:
+            raise DraftError("The draft is complete.")
+        if self.status != status:
+            raise DraftError(f"The draft is {self.status}, not {status}.")
+        if player != self.current_player:
+            raise DraftError(f"It is {self.name_of(self.current_player)}'s turn.")
+        return
+
+    def ban(self, player: Hashable, species_id_str: str) -> List[PokemonSpecies]:
+        """
+        Bans a species, and every other species with its dex number.
+
+        Returns:
+            The species the ban removed from the draft.
+
+        Raises:
+            DraftError: If it is not the player's turn to ban, the dex is already banned,
+                        or none of its species is allowed in the tournament.
+        """
+        self._check_turn(player, STATUS_BANNING)
+        position = self.position_of(species_id_str)
+        species = self.species[position]
+        mask = self._dex_masks.get(species.dex_number, 0) & ~self.banned
+        if mask == 0:
+            raise DraftError(f"{species.name} is already banned.")
+        if mask & self.eligible == 0:
+            # the ban would take nothing off the board
+            raise DraftError(f"{species.name} is not allowed in this tournament.")
+        self.banned |= mask
+        self.bans[player].append(position)
+        self.actions.append((ACTION_BAN, player, position, mask))
+        self.turn += 1
+        return [self.species[bit] for bit in iter_bits(mask)]
+
+    def pick(self, player: Hashable, species_id_str: str) -> PokemonSpecies:
+        """
+        Picks a species for the player.
+
+        Returns:
+            The species picked.
+
+        Raises:
+            DraftError: If it is not the player's turn to pick, or the species is not available.
+        """
+        self._check_turn(player, STATUS_PICKING)
+        position = self.position_of(species_id_str)
+        species = self.species[position]
+        bit = 1 << position
+        if self.banned & bit:
+            raise DraftError(f"{species.name} is banned.")
+        if self.taken & bit:
+            raise DraftError(f"{species.name} already picked by '{self.name_of(self.owner[position])}'.")
+        if not self.eligible & bit:
+            raise DraftError(f"{species.name} is not allowed in this tournament.")
+        self.taken |= bit
+        self.owner[position] = player
+        self.picks[player].append(position)
+        self.actions.append((ACTION_PICK, player, position, bit))
+        self.turn += 1
+        return species
+
+    def undo(self) -> tuple:
+        """
+        Takes back the latest ban or pick and gives the turn back.
+
+        Returns:
+            The (action, player, position, bits) entry that was undone.
+        """
+        if len(self.actions) == 0:
+            raise DraftError("There is nothing to undo.")
+        action = self.actions.pop()
+        kind, player, position, mask = action
+        if kind == ACTION_BAN:
+            self.banned &= ~mask
+            self.bans[player].pop()
+        else:
+            self.taken &= ~mask
+            self.owner.pop(position, None)
+            self.picks[player].pop()
+        self.turn -= 1
+        return action
+
+    def set_order(self, players: List[Hashable]):
+        """
+        Replaces the first-round order. Turns already taken are unaffected.
+        """
+        if len(players) != len(self.players) or set(players) != set(self.players):
+            raise DraftError("The new order must list every player exactly once.")
+        self.players = list(players)
+        return
+
+    # Snapshots
+    def to_state(self) -> dict:
+        """
+        Returns everything needed to rebuild the draft, as JSON-friendly values.
+        Bitsets are hex strings and species are catalog positions.
+        """
+        return {
+            "format": STATE_FORMAT,
+            "catalog_version": self.catalog_version,
+            "players": self.players,
+            "names": [[player, name] for player, name in self.player_names.items()],
+            "order": self.order,
+            "ban_rounds": self.ban_rounds,
+            "pick_rounds": self.pick_rounds,
+            "eligible": format(self.eligible, "x"),
+            "turn": self.turn,
+            "taken": format(self.taken, "x"),
+            "banned": format(self.banned, "x"),
+            "actions": [[kind, player, position, format(mask, "x")] for kind, player, position, mask in self.actions],
+        }
+
+    @classmethod
+    def from_state(cls, catalog, state: dict) -> "Draft":
+        """
+        Rebuilds a draft from to_state() output.
+
+        Raises:
+            DraftError: If the state was saved against a different catalog,
+                        whose positions may not match this one's.
+        """
+        if state.get("format") != STATE_FORMAT or state.get("catalog_version") != catalog.version:
+            raise DraftError("The snapshot was taken with a different species catalog.")
+        draft = cls(catalog, state["players"], order=state["order"], ban_rounds=state["ban_rounds"],
+                    pick_rounds=state["pick_rounds"], eligible=int(state["eligible"], 16),
+                    player_names={player: name for player, name in state["names"]})
+        draft.turn = state["turn"]
+        draft.taken = int(state["taken"], 16)
+        draft.banned = int(state["banned"], 16)
+        for kind, player, position, mask in state["actions"]:
+            draft.actions.append((kind, player, position, int(mask, 16)))
+            if kind == ACTION_BAN:
+                draft.bans[player].append(position)
+            else:
+                draft.picks[player].append(position)
+                draft.owner[position] = player
+        return draft
+
+
+EVENT_JOIN = "join"
+EVENT_LEAVE = "leave"
+EVENT_START = "start"
+EVENT_BAN = ACTION_BAN
+EVENT_PICK = ACTION_PICK
+EVENT_UNDO = "undo"
+EVENT_ORDER = "order"
+
+
+class DraftManager:
+    """
+    Every running draft, keyed by tournament id, plus the players waiting for each to start.
+
+    Every change goes through _apply(), both when a command makes it and
+    when recover() replays it from a DraftLog, so a replayed draft ends up
+    exactly where the live one was. With a log, each change is recorded
+    only after the rules have accepted it.
+    """
+
+    def __init__(self, catalog, log=None):
+        """
+        Initializes the manager.
+
+        Args:
+            catalog (SpeciesCatalog): The species new drafts are run over.
+            log (DraftLog, optional): Where changes are recorded and recovered from.
+        """
+        self.catalog = catalog
+        self.log = log
+        self.drafts: Dict[int, Draft] = {}
+        # tournament id -> {player id: display name}, in join order
+        self.lobbies: Dict[int, Dict[Hashable, str]] = {}
+        return
+
+    def _apply(self, tournament_id: int, kind: str, player=None, species_id_str=None, payload=None):
+        """
+        Makes one change to a lobby or draft. Raises DraftError if the rules do not allow it.
+        """
+        draft = self.drafts.get(tournament_id)
+        if kind == EVENT_JOIN or kind == EVENT_LEAVE:
+            if draft is not None:
+                raise DraftError("The draft has already started.")
+            lobby = self.lobbies.setdefault(tournament_id, {})
+            if kind == EVENT_LEAVE:
+                if lobby.pop(player, None) is None:
+                    raise DraftError("That player has not joined.")
+                return None
+            if player in lobby:
+                raise DraftError(f"{payload['name']} has already joined.")
+            if payload.get("max_players") and len(lobby) >= payload["max_players"]:
+                raise DraftError(f"The tournament is full ({payload['max_players']} players).")
+            lobby[player] = payload["name"]
+            return len(lobby)
+        if kind == EVENT_START:
+            if draft is not None:
+                raise DraftError("The draft has already started.")
+            eligible = None
+            if payload.get("eligible") is not None:
+                eligible = self._eligible_mask(payload["eligible"])
+            draft = Draft(self.catalog, payload["players"], order=payload["order"],
+                          ban_rounds=payload["ban_rounds"], pick_rounds=payload["pick_rounds"],
+                          eligible=eligible, player_names={p: name for p, name in payload["names"]})
+            self.drafts[tournament_id] = draft
+            self.lobbies.pop(tournament_id, None)
+            return draft
+        if draft is None:
+            raise DraftError("The draft has not started.")
+        if kind == EVENT_BAN:
+            return draft.ban(player, species_id_str)
+        if kind == EVENT_PICK:
+            return draft.pick(player, species_id_str)
+        if kind == EVENT_UNDO:
+            return draft.undo()
+        if kind == EVENT_ORDER:
+            return draft.set_order(payload["players"])
+        raise DraftError(f"Unknown draft event '{kind}'.")
+
+    def _eligible_mask(self, species_id_strs: List[str]) -> int:
+        """
+        Turns logged species ids back into a bitset over the current catalog's positions.
+        Ids the catalog no longer has are left out.
+        """
+        mask = 0
+        for species_id_str in species_id_strs:
+            position = self.catalog.position_of(species_id_str)
+            if position is None:
+                print(f"Eligible species '{species_id_str}' is not in the species catalog; skipping it.")
+                continue
+            mask |= 1 << position
+        return mask
+
+    def _change(self, tournament_id: int, kind: str, player=None, species_id_str=None, payload=None):
+        result = self._apply(tournament_id, kind, player, species_id_str, payload)
+        if self.log is not None:
+            self.log.record(tournament_id, kind, player, species_id_str, payload)
+            self.log.maybe_snapshot(tournament_id, self.drafts.get(tournament_id))
+        return result
+
+    def join(self, tournament_id: int, player: Hashable, name: str, max_players: int = 0) -> int:
+        """
+        Adds a player to a tournament's lobby.
+
+        Args:
+            max_players (int): Lobby size limit, 0 for none.
+
+        Returns:
+            The number of players in the lobby.
+        """
+        return self._change(tournament_id, EVENT_JOIN, player, payload={"name": name, "max_players": max_players})
+
+    def leave(self, tournament_id: int, player: Hashable):
+        """
+        Removes a player from a lobby.
+        """
+        self._change(tournament_id, EVENT_LEAVE, player)
+        return
+
+    def start(self, tournament_id: int, order: str = ORDER_SNAKE, ban_rounds: int = 0,
+              pick_rounds: int = DEFAULT_PICK_ROUNDS, eligible: Optional[int] = None) -> Draft:
+        """
+        Starts the draft with the lobby's players, in join order.
+        """
+        lobby = self.lobbies.get(tournament_id, {})
+        payload = {
+            "players": list(lobby),
+            "names": [[player, name] for player, name in lobby.items()],
+            "order": order,
+            "ban_rounds": ban_rounds,
+            "pick_rounds": pick_rounds,
+            # species ids, not positions: a reloaded catalog may put species at other positions
+            "eligible": None,
+        }
+        if eligible is not None:
+            payload["eligible"] = [self.catalog.species[position].species_id_str
+                                   for position in iter_bits(eligible & ((1 << len(self.catalog)) - 1))]
+        return self._change(tournament_id, EVENT_START, payload=payload)
+
+    def ban(self, tournament_id: int, player: Hashable, species_id_str: str) -> List[PokemonSpecies]:
+        """
+        Bans a species for the player. See Draft.ban().
+        """
+        return self._change(tournament_id, EVENT_BAN, player, species_id_str)
+
+    def pick(self, tournament_id: int, player: Hashable, species_id_str: str) -> PokemonSpecies:
+        """
+        Picks a species for the player. See Draft.pick().
+        """
+        return self._change(tournament_id, EVENT_PICK, player, species_id_str)
+
+    def undo(self, tournament_id: int) -> tuple:
+        """
+        Takes back the latest ban or pick. See Draft.undo().
+        """
+        return self._change(tournament_id, EVENT_UNDO)
+
+    def set_order(self, tournament_id: int, players: List[Hashable]):
+        """
+        Replaces the draft's first-round order. See Draft.set_order().
+        """
+        self._change(tournament_id, EVENT_ORDER, payload={"players": list(players)})
+        return
+
+    def get(self, tournament_id: int) -> Optional[Draft]:
+        return self.drafts.get(tournament_id)
+
+    def remove(self, tournament_id: int, forget: bool = True):
+        """
+        Forgets a draft and its lobby.
+
+        Args:
+            forget (bool): Also delete the logged history. This blocks on the
+                           database; DraftQueue.remove() does it on a thread instead.
+        """
+        self.drafts.pop(tournament_id, None)
+        self.lobbies.pop(tournament_id, None)
+        if forget and self.log is not None:
+            self.log.forget(tournament_id)
+        return
+
+    def recover(self, tournament_ids: Optional[Iterable[int]] = None) -> int:
+        """
+        Rebuilds logged lobbies and drafts: the newest snapshot, then the events after it.
+
+        Args:
+            tournament_ids (iterable, optional): Rebuild only these tournaments, e.g. the
+                                                 ones whose draft has not finished, so
+                                                 startup does not replay every draft ever run.
+                                                 Defaults to every logged tournament.
+
+        Returns:
+            The number of tournaments recovered.
+        """
+        if self.log is None:
+            return 0
+        # always listed, so the log knows which tournaments have no events yet
+        logged = self.log.tournament_ids()
+        if tournament_ids is not None:
+            wanted = set(tournament_ids)
+            logged = [tournament_id for tournament_id in logged if tournament_id in wanted]
+        count = 0
+        for tournament_id in logged:
+            draft, events = self.log.load(tournament_id, self.catalog)
+            self.restore(tournament_id, draft, events)
+            count += 1
+        return count
+
+    def restore(self, tournament_id: int, draft: Optional[Draft], events: list):
+        """
+        Replaces a tournament's lobby and draft with what DraftLog.load() returned.
+
+        Split from recover() so the loading can run on a database thread
+        while the state itself is only changed by the caller.
+        """
+        self.lobbies.pop(tournament_id, None)
+        self.drafts.pop(tournament_id, None)
+        if draft is not None:
+            self.drafts[tournament_id] = draft
+        for seq, kind, player, species_id_str, payload in events:
+            try:
+                self._apply(tournament_id, kind, player, species_id_str, payload)
+            except DraftError as e:
+                print(f"Tournament {tournament_id}: cannot replay event {seq} ({kind}): {e}")
+        return
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .draft_engine import Draft, DraftError
+
+DEFAULT_SNAPSHOT_EVERY = 32
+
+
+class DraftLog:
+    """
+    Stores every draft change as a row in draft_events, checkpointed by draft_snapshots.
+
+    Each tournament's events are numbered 1, 2, 3... A snapshot records the
+    whole Draft.to_state() as of one event. Recovery loads the newest
+    snapshot and replays only the events after it, so it reads at most
+    snapshot_every events per tournament however long the log grows.
+    Older snapshots are pruned as new ones are written.
+
+    With autoflush off, record() and snapshot() only queue their rows in
+    memory; take_pending() hands them over and write() stores them in one
+    transaction, so the caller decides which thread does the writing.
+    """
+
+    def __init__(self, db_manager, snapshot_every: int = DEFAULT_SNAPSHOT_EVERY, autoflush: bool = True):
+        """
+        Initializes the log.
+
+        Args:
+            db_manager (DatabaseManager): Where events and snapshots are stored.
+            snapshot_every (int): Events between snapshots of a running draft.
+            autoflush (bool): Write every event and snapshot as soon as it is recorded.
+        """
+        self.db_manager = db_manager
+        self.snapshot_every = snapshot_every
+        self.autoflush = autoflush
+        self._next_seq: Dict[int, int] = {}
+        self._snapshot_seq: Dict[int, int] = {}
+        # tournament id -> event rows and the newest (seq, state) snapshot not yet written
+        self._pending_events: Dict[int, List[tuple]] = {}
+        self._pending_snapshots: Dict[int, Tuple[int, str]] = {}
+        # set once tournament_ids() has listed every logged tournament
+        self._knows_all = False
+        return
+
+    def _seq(self, tournament_id: int) -> int:
+        if tournament_id not in self._next_seq:
+            if self._knows_all:
+                # not among the logged tournaments, so nothing to look up
+                self._next_seq[tournament_id] = 1
+            else:
+                self._next_seq[tournament_id] = self.db_manager.get_last_draft_event_seq(tournament_id) + 1
+        return self._next_seq[tournament_id]
+
+    def record(self, tournament_id: int, kind: str, player=None, species_id_str: Optional[str] = None,
+               payload: Optional[dict] = None) -> int:
+        """
+        Appends one event, or queues it if autoflush is off.
+
+        Returns:
+            The event's sequence number.
+        """
+        seq = self._seq(tournament_id)
+        if payload is not None:
+            payload = json.dumps(payload, separators=(",", ":"))
+        self._pending_events.setdefault(tournament_id, []).append(
+            (tournament_id, seq, kind, player, species_id_str, payload, time.time()))
+        self._next_seq[tournament_id] = seq + 1
+        if self.autoflush:
+            self.flush(tournament_id)
+        return seq
+
+    def maybe_snapshot(self, tournament_id: int, draft: Optional[Draft]):
+        """
+        Snapshots the draft if snapshot_every events have been recorded since the last snapshot.
+        """
+        if draft is None:
+            return
+        last_seq = self._seq(tournament_id) - 1
+        if last_seq - self._snapshot_seq.get(tournament_id, 0) >= self.snapshot_every:
+            self.snapshot(tournament_id, draft)
+        return
+
+    def snapshot(self, tournament_id: int, draft: Draft):
+        """
+        Stores the draft's state as of the latest recorded event, or queues it if autoflush is off.
+        """
+        seq = self._seq(tournament_id) - 1
+        state = json.dumps(draft.to_state(), separators=(",", ":"))
+        self._pending_snapshots[tournament_id] = (seq, state)
+        self._snapshot_seq[tournament_id] = seq
+        if self.autoflush:
+            self.flush(tournament_id)
+        return
+
+    def take_pending(self, tournament_id: int) -> Tuple[List[tuple], Optional[Tuple[int, str]]]:
+        """
+        Removes and returns a tournament's queued events and snapshot, for write().
+        """
+        return (self._pending_events.pop(tournament_id, []),
+                self._pending_snapshots.pop(tournament_id, None))
+
+    def write(self, tournament_id: int, events: List[tuple], snapshot: Optional[Tuple[int, str]]):
+        """
+        Stores what take_pending() returned in one transaction. Blocks, and raises on error.
+
+        Touches no other state of the log, so it may run on a database thread.
+        """
+        with self.db_manager.transaction():
+            if events:
+                self.db_manager.append_draft_events(events)
+            if snapshot is not None:
+                self.db_manager.put_draft_snapshot(tournament_id, snapshot[0], snapshot[1])
+        return
+
+    def flush(self, tournament_id: int):
+        """
+        Writes a tournament's queued events and snapshot now.
+        """
+        events, snapshot = self.take_pending(tournament_id)
+        if events or snapshot is not None:
+            self.write(tournament_id, events, snapshot)
+        return
+
+    def load(self, tournament_id: int, catalog):
+        """
+        Reads what is needed to rebuild a tournament's draft, dropping anything still queued for it.
+
+        Returns:
+            (draft, events): the draft from the newest usable snapshot (or None),
+            and the (seq, kind, player, species_id_str, payload) events after it,
+            with payloads decoded.
+        """
+        self.take_pending(tournament_id)
+        draft = None
+        after_seq = 0
+        snapshot = self.db_manager.get_latest_draft_snapshot(tournament_id)
+        if snapshot is not None:
+            try:
+                draft = Draft.from_state(catalog, json.loads(snapshot[1]))
+                after_seq = snapshot[0]
+            except (DraftError, ValueError, KeyError) as e:
+                # e.g. the species catalog was reloaded; replaying every event still works
+                print(f"Tournament {tournament_id}: ignoring draft snapshot {snapshot[0]}: {e}")
+        events = []
+        for seq, kind, player, species_id_str, payload in self.db_manager.get_draft_events(tournament_id, after_seq):
+            events.append((seq, kind, player, species_id_str, json.loads(payload) if payload else None))
+        if events:
+            self._next_seq[tournament_id] = events[-1][0] + 1
+        else:
+            self._next_seq[tournament_id] = after_seq + 1
+        self._snapshot_seq[tournament_id] = after_seq
+        return draft, events
+
+    def tournament_ids(self):
+        """
+        Returns the ids of every tournament with a logged draft.
+        """
+        tournament_ids = self.db_manager.get_draft_tournament_ids()
+        self._knows_all = True
+        return tournament_ids
+
+    def forget(self, tournament_id: int):
+        """
+        Deletes a tournament's events and snapshots.
+        """
+        self.take_pending(tournament_id)
+        self.db_manager.delete_draft_log(tournament_id)
+        self._next_seq.pop(tournament_id, None)
+        self._snapshot_seq.pop(tournament_id, None)
+        return
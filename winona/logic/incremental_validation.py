@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+
+import threading
+from typing import Dict, List, Set, Tuple
+
+from .sheet_validation import extract_picks, pick_columns, parse_bans_aux
+from .sheet_validation import pick_mismatch_message, already_picked_message, already_banned_message
+from .species_matcher import match_pokemon_batch
+
+
+class IncrementalDraftValidator:
+    """
+    Validates the same draft sheet over and over, redoing only what changed.
+
+    The validator remembers every pick cell from the previous run along
+    with its match result and report message. Each run diffs the new sheet
+    cell by cell, fuzzy-matches only new or edited cells, and uses a
+    name -> cells reverse index to update duplicate and ban conflicts for
+    the names those cells touched. Reading the sheet is still linear, but
+    matching and conflict work is proportional to the number of edits.
+
+    The messages are the same as validate_draft_sheet_aux() produces for
+    the same sheet, in the same order. Runs from different threads take
+    turns, since each one rewrites what the validator remembers.
+    """
+
+    def __init__(self, catalog, memo=None):
+        """
+        Initializes the validator.
+
+        Args:
+            catalog (SpeciesCatalog): The species to match picks against.
+            memo (MatchMemo, optional): Shared memo of fuzzy match results.
+        """
+        self.catalog = catalog
+        self.memo = memo
+        self._lock = threading.Lock()
+        self.reset()
+        return
+
+    def reset(self):
+        """
+        Forgets the previous run, so the next run validates every cell.
+        """
+        self._catalog_version = None
+        # (column, row) -> (trainer, value, order)
+        self._cells: Dict[Tuple[str, int], tuple] = {}
+        # (column, row) -> name, for cells that name a species exactly
+        self._claim_of: Dict[Tuple[str, int], str] = {}
+        # name -> cells that name it exactly
+        self._claims: Dict[str, Set[Tuple[str, int]]] = {}
+        # (column, row) -> report message
+        self._messages: Dict[Tuple[str, int], str] = {}
+        self._bans_by_name = {}
+        self.last_changed = 0
+        return
+
+    def validate(self, sheet_df) -> Tuple[List[str], List[str]]:
+        """
+        Validates the sheet, reusing everything the last run learned about unchanged cells.
+
+        Args:
+            sheet_df (DataFrame): The current draft sheet.
+
+        Returns:
+            (ban_messages, messages), as parse_bans_aux() and validate_draft_sheet_aux() return them.
+        """
+        with self._lock:
+            return self._validate(sheet_df)
+
+    def _validate(self, sheet_df) -> Tuple[List[str], List[str]]:
+        if self._catalog_version != self.catalog.version:
+            self.reset()
+            self._catalog_version = self.catalog.version
+
+        picks = extract_picks(sheet_df)
+        column_position = {column: i for i, column in enumerate(pick_columns(sheet_df))}
+        cells = {}
+        for row, trainer, column, value in zip(picks["row"].tolist(), picks["trainer"].tolist(),
+                                               picks["column"].tolist(), picks["value"].tolist()):
+            cells[(column, row)] = (trainer, value, (column_position[column], row))
+
+        changed = [cell for cell, entry in cells.items() if self._cells.get(cell) != entry]
+        removed = [cell for cell in self._cells if cell not in cells]
+        self.last_changed = len(changed) + len(removed)
+
+        dirty_names = set()
+        for cell in changed + removed:
+            self._messages.pop(cell, None)
+            name = self._claim_of.pop(cell, None)
+            if name is not None:
+                self._claims[name].discard(cell)
+                dirty_names.add(name)
+        self._cells = cells
+
+        matches = match_pokemon_batch([cells[cell][1] for cell in changed], self.catalog, memo=self.memo)
+        for cell in changed:
+            trainer, value, order = cells[cell]
+            column, row = cell
+            result = matches[value]
+            if len(result) == 0 or result[0] != value:
+                self._messages[cell] = pick_mismatch_message(column, row, trainer, value, result)
+            else:
+                name = result[0]
+                self._claim_of[cell] = name
+                self._claims.setdefault(name, set()).add(cell)
+                dirty_names.add(name)
+
+        ban_messages, bans_by_name = parse_bans_aux(self.catalog, sheet_df)
+        for name in set(bans_by_name) | set(self._bans_by_name):
+            if bans_by_name.get(name) != self._bans_by_name.get(name):
+                dirty_names.add(name)
+        self._bans_by_name = bans_by_name
+
+        for name in dirty_names:
+            self._update_conflicts(name)
+
+        ordered = sorted(self._messages, key=lambda cell: self._cells[cell][2])
+        messages = [self._messages[cell] for cell in ordered]
+        return ban_messages, messages
+
+    def _record(self, cell):
+        column, row = cell
+        return [row, self._cells[cell][0], column]
+
+    def _update_conflicts(self, name):
+        """
+        Rewrites the conflict messages of every cell that picked name.
+        The first claimant owns the pick unless the name is banned.
+        """
+        claimants = sorted(self._claims.get(name, ()), key=lambda cell: self._cells[cell][2])
+        if len(claimants) == 0:
+            self._claims.pop(name, None)
+            return
+        ban = self._bans_by_name.get(name)
+        if ban is not None:
+            for cell in claimants:
+                self._messages[cell] = already_banned_message(name, ban, self._record(cell))
+            return
+        owner = self._record(claimants[0])
+        self._messages.pop(claimants[0], None)
+        for cell in claimants[1:]:
+            self._messages[cell] = already_picked_message(name, owner, self._record(cell))
+        return
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Tuple
+
+
+def normalize_pick_text(value: str) -> str:
+    """
+    Collapses runs of whitespace and trims the ends.
+
+    token_sort_ratio splits on whitespace before scoring, so this never
+    changes a match, but "Registeel " and "Registeel" share one memo entry.
+    """
+    return " ".join(value.split())
+
+
+class MatchMemo:
+    """
+    Remembers fuzzy match results so common misspellings are scored once.
+
+    An in-process LRU sits in front of the fuzzy_match_memo table. Entries
+    are keyed by (normalized input, catalog version). When the species
+    catalog's version changes, the LRU is cleared and rows for other
+    versions are purged from the table.
+
+    get_many() and put_many() block on SQLite, so the bot calls them only
+    from database worker threads (see AsyncDatabaseManager.run()). A lock
+    lets several threads share one memo.
+    """
+
+    def __init__(self, catalog, db_manager=None, maxsize: int = 4096):
+        """
+        Initializes the memo.
+
+        Args:
+            catalog (SpeciesCatalog): The catalog the matches are made against.
+            db_manager (DatabaseManager, optional): Where matches persist. Without it
+                                                    the memo only lives in memory.
+            maxsize (int): Most entries kept in the LRU.
+        """
+        self.catalog = catalog
+        self.db_manager = db_manager
+        self.maxsize = maxsize
+        self._lru: OrderedDict = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        return
+
+    def _check_version(self):
+        if self._version == self.catalog.version:
+            return
+        self._lru.clear()
+        if self.db_manager is not None:
+            self.db_manager.purge_fuzzy_matches(self.catalog.version)
+        self._version = self.catalog.version
+        return
+
+    def get_many(self, normalized_inputs: Iterable[str]) -> Dict[str, Tuple[str, float]]:
+        """
+        Looks up normalized inputs in the LRU, then in the table.
+
+        Returns:
+            A dict of normalized input -> (best_match, score) for the inputs found.
+        """
+        with self._lock:
+            self._check_version()
+            keys = list(normalized_inputs)
+            found = {}
+            missing = []
+            for key in keys:
+                if key in self._lru:
+                    self._lru.move_to_end(key)
+                    found[key] = self._lru[key]
+                else:
+                    missing.append(key)
+            if missing and self.db_manager is not None:
+                stored = self.db_manager.get_fuzzy_matches(missing, self._version)
+                for key, value in stored.items():
+                    self._remember(key, value)
+                found.update(stored)
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+            return found
+
+    def put_many(self, matches: Dict[str, Tuple[str, float]]):
+        """
+        Records new matches in the LRU and the table.
+
+        Args:
+            matches (dict): normalized input -> (best_match, score).
+        """
+        with self._lock:
+            self._check_version()
+            for key, value in matches.items():
+                self._remember(key, value)
+            if matches and self.db_manager is not None:
+                rows = [(key, self._version, best, score) for key, (best, score) in matches.items()]
+                self.db_manager.put_fuzzy_matches(rows)
+        return
+
+    def _remember(self, key, value):
+        self._lru[key] = value
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.maxsize:
+            self._lru.popitem(last=False)
+        return
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+from bisect import bisect_left, bisect_right
+from typing import List
+
+DEFAULT_PLAYER_LIMIT = 25
+# never appears in a trainer name, so a substring match cannot span two names
+SEPARATOR = "\x00"
+
+class PlayerIndex:
+    """
+    Case-folded prefix and substring lookups over the trainers in one sheet.
+
+    Prefix lookups bisect a sorted copy of the names. Substring lookups
+    run str.find over all names joined into one string, then map each hit
+    back to its name, so the scan happens in C instead of a Python loop.
+    """
+
+    def __init__(self, users: List[str]):
+        """
+        Initializes the index.
+
+        Args:
+            users (list): Trainer names in sheet order.
+        """
+        self.users = list(users)
+        folded = [user.casefold() for user in self.users]
+        order = sorted(range(len(folded)), key=lambda i: folded[i])
+        self._sorted_keys = [folded[i] for i in order]
+        self._sorted_positions = order
+        self._starts = []
+        offset = 0
+        for key in folded:
+            self._starts.append(offset)
+            offset += len(key) + len(SEPARATOR)
+        self._haystack = SEPARATOR.join(folded)
+        return
+
+    def prefix(self, text: str) -> List[int]:
+        """
+        Returns the sheet positions of names starting with text, alphabetically.
+        """
+        key = text.casefold()
+        i = bisect_left(self._sorted_keys, key)
+        positions = []
+        while i < len(self._sorted_keys) and self._sorted_keys[i].startswith(key):
+            positions.append(self._sorted_positions[i])
+            i += 1
+        return positions
+
+    def substring(self, text: str) -> List[int]:
+        """
+        Returns the sheet positions of names containing text, in sheet order.
+        """
+        key = text.casefold()
+        positions = []
+        at = self._haystack.find(key)
+        while at != -1:
+            position = bisect_right(self._starts, at) - 1
+            positions.append(position)
+            # continue after this name, so a name is reported once
+            if position + 1 >= len(self._starts):
+                break
+            at = self._haystack.find(key, self._starts[position + 1])
+        return positions
+
+    def search(self, text: str, limit: int = DEFAULT_PLAYER_LIMIT) -> List[str]:
+        """
+        Returns names for an autocomplete: prefix matches, then other names containing text.
+
+        Args:
+            text (str): What the user has typed so far.
+            limit (int): Most names to return.
+
+        Returns:
+            A list of trainer names. Empty text returns the first names in sheet order.
+        """
+        if text == "":
+            return self.users[:limit]
+        positions = self.prefix(text)
+        if len(positions) < limit:
+            seen = set(positions)
+            positions += [position for position in self.substring(text) if position not in seen]
+        return [self.users[position] for position in positions[:limit]]
+
+    def __len__(self):
+        return len(self.users)
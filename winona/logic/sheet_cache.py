@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+
+import asyncio
+import time
+from typing import Dict, Optional
+
+from ..api import read_public_google_sheet_async
+from .sheet_validation import parse_picks_aux
+from .player_index import PlayerIndex
+
+
+class SheetSnapshot:
+    """
+    One download of a draft sheet, with the parsed picks kept beside it.
+    """
+
+    def __init__(self, url: str, sheet_df, version: int):
+        """
+        Initializes a SheetSnapshot object.
+
+        Args:
+            url (str): The sheet's public URL.
+            sheet_df (DataFrame): The sheet contents.
+            version (int): Increases every time any sheet is fetched.
+        """
+        self.url = url
+        self.sheet_df = sheet_df
+        self.version = version
+        self.fetched_at = time.monotonic()
+        self.all_picks, self.users = parse_picks_aux(sheet_df)
+        self._player_index: Optional[PlayerIndex] = None
+        return
+
+    @property
+    def player_index(self) -> PlayerIndex:
+        """
+        The index over this snapshot's trainers, built on first use.
+        A new download makes a new snapshot, and so a new index.
+        """
+        if self._player_index is None:
+            self._player_index = PlayerIndex(self.users)
+        return self._player_index
+
+    def age(self) -> float:
+        """
+        Returns the number of seconds since the sheet was downloaded.
+        """
+        return time.monotonic() - self.fetched_at
+
+
+class SheetCache:
+    """
+    Shares sheet snapshots between commands and autocomplete callbacks.
+
+    Snapshots are keyed by URL and live for ttl seconds. Callers that ask
+    for the same URL while a download is running wait on that download
+    instead of starting their own.
+    """
+
+    def __init__(self, ttl: float = 60.0, fetch=read_public_google_sheet_async, metrics=None):
+        """
+        Initializes the cache.
+
+        Args:
+            ttl (float): Seconds a snapshot is served before it is fetched again.
+            fetch (coroutine function): Returns a DataFrame for a URL, or None on error.
+            metrics (Metrics, optional): Records how long each download takes.
+        """
+        self.ttl = ttl
+        self._fetch = fetch
+        self.metrics = metrics
+        self.hits = 0
+        self.misses = 0
+        self._snapshots: Dict[str, SheetSnapshot] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._version = 0
+        return
+
+    async def get(self, url: str, refresh: bool = False) -> Optional[SheetSnapshot]:
+        """
+        Returns a snapshot of the sheet, downloading it if needed.
+
+        Args:
+            url (str): The sheet's public URL.
+            refresh (bool): Ignore the TTL and download the sheet now.
+
+        Returns:
+            The snapshot, or None if the sheet has never been read successfully.
+            A stale snapshot is returned if a new download fails.
+        """
+        snapshot = self._snapshots.get(url)
+        if not refresh and snapshot is not None and snapshot.age() < self.ttl:
+            self.hits += 1
+            return snapshot
+        self.misses += 1
+
+        # shield so one cancelled caller does not cancel the shared download
+        return await asyncio.shield(self._start_load(url))
+
+    def get_nowait(self, url: str) -> Optional[SheetSnapshot]:
+        """
+        Returns the cached snapshot at once, even if it is stale.
+
+        A missing or stale snapshot starts a download in the background, so
+        later calls see the new sheet. Autocomplete callbacks use this to
+        answer without waiting on Google.
+
+        Returns:
+            The cached snapshot, or None if the sheet has not been read yet.
+        """
+        snapshot = self._snapshots.get(url)
+        if snapshot is None or snapshot.age() >= self.ttl:
+            self.misses += 1
+            self._start_load(url)
+        else:
+            self.hits += 1
+        return snapshot
+
+    def _start_load(self, url: str) -> asyncio.Task:
+        """
+        Returns the running download of url, starting one if there is none.
+        """
+        task = self._inflight.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._load(url))
+            self._inflight[url] = task
+            task.add_done_callback(lambda t: self._inflight.pop(url, None))
+        return task
+
+    async def refresh(self, url: str) -> Optional[SheetSnapshot]:
+        """
+        Downloads the sheet now, replacing any cached snapshot.
+        """
+        return await self.get(url, refresh=True)
+
+    def peek(self, url: str) -> Optional[SheetSnapshot]:
+        """
+        Returns the cached snapshot without checking its age or downloading.
+        """
+        return self._snapshots.get(url)
+
+    def invalidate(self, url: Optional[str] = None):
+        """
+        Forgets the snapshot for url, or every snapshot if url is None.
+        """
+        if url is None:
+            self._snapshots.clear()
+        else:
+            self._snapshots.pop(url, None)
+        return
+
+    async def _load(self, url: str) -> Optional[SheetSnapshot]:
+        # get_nowait() never awaits this task, so nothing may escape it; keep the stale snapshot instead
+        start = time.perf_counter()
+        try:
+            sheet_df = await self._fetch(url)
+        except Exception as e:
+            print(f"An error occurred reading {url}: {e}")
+            sheet_df = None
+        if self.metrics is not None:
+            self.metrics.observe("winona_sheet_fetch_seconds", time.perf_counter() - start,
+                                 result="error" if sheet_df is None else "ok")
+        if sheet_df is None:
+            return self._snapshots.get(url)
+        try:
+            snapshot = SheetSnapshot(url, sheet_df, self._version + 1)
+        except Exception as e:
+            print(f"Unable to read the draft sheet at {url}: {e}")
+            return self._snapshots.get(url)
+        self._version += 1
+        self._snapshots[url] = snapshot
+        return snapshot
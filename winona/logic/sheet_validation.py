@@ -1,21 +1,51 @@
 from ..api import read_public_google_sheet
 from ..database import DatabaseManager
 from ..database.models.pokemon_species import PokemonSpecies
+from .species_catalog import SpeciesCatalog
+from .species_matcher import match_pokemon_batch
+from .match_memo import MatchMemo
 import pandas as pd
+import re
 
 import rapidfuzz
 
+PICK_COLUMN_PATTERN = re.compile(r"^PICK\s*(\d+)$")
+
+def pick_columns(sheet_df):
+    """
+    Returns the sheet's PICK n columns ordered by n, however many there are.
+    """
+    found = []
+    for column in sheet_df.columns:
+        match = PICK_COLUMN_PATTERN.match(str(column).strip())
+        if match:
+            found.append((int(match.group(1)), column))
+    return [column for n, column in sorted(found)]
+
+def extract_picks(sheet_df):
+    """
+    Melts the PICK columns into one long frame with a row per filled cell.
+
+    Rows are ordered column by column (all of PICK 1, then PICK 2, ...),
+    which is the order the validators report in.
+
+    Returns:
+        A DataFrame with columns row (sheet index), trainer, column and value.
+    """
+    columns = pick_columns(sheet_df)
+    wide = sheet_df[columns].copy()
+    wide.insert(0, "trainer", sheet_df["Trainer"])
+    wide.insert(0, "row", sheet_df.index)
+    picks = wide.melt(id_vars=["row", "trainer"], value_vars=columns, var_name="column", value_name="value")
+    return picks.dropna(subset=["value"]).reset_index(drop=True)
+
 def parse_picks_aux(sheet_df):
-    users = sheet_df["Trainer"]
+    picks = extract_picks(sheet_df)
     all_picks = {}
-    messages = []
-    for column in ["PICK 1", "PICK 2", "PICK 3", "PICK 4", "PICK 5", "PICK 6"]:
-        for index, value in sheet_df[column].items():
-            if pd.isna(value):
-                continue
-            else:
-                all_picks[value] = [index, users[index], column]
-    users = [ u for index, u in users.items() ]
+    for row, trainer, column, value in zip(picks["row"].tolist(), picks["trainer"].tolist(),
+                                           picks["column"].tolist(), picks["value"].tolist()):
+        all_picks[value] = [row, trainer, column]
+    users = sheet_df["Trainer"].tolist()
     return all_picks, users
 
 def fuzz_choice(possible, choices):
@@ -26,45 +56,48 @@ def match_pokemon(possible_pokemon_name, all_pokemon_names):
     fits = [ best_fit[0] ]
     return fits
 
-def validate_draft_sheet_aux(db_manager, sheet_df):
-    ban_messages, all_bans_by_name = parse_bans_aux(db_manager, sheet_df)
-    all_pokemon = db_manager.get_all_pokemon_species()
-    all_pokemon_names = [p.name for p in all_pokemon]
-    users = sheet_df["Trainer"]
+def pick_mismatch_message(column, index, trainer, value, result):
+    user_size = 15
+    value_size = 20
+    return f"{column:6s} {index:4d} {trainer[:user_size]:{user_size}s} {value[:value_size]:{value_size}s} {result} <----------------"
+
+def already_picked_message(name, owner, pick):
+    return "{} already picked by '{}'. '{}' needs to try again.".format(name, owner, pick)
+
+def already_banned_message(name, owner, pick):
+    return "{} already banned by '{}'. '{}' needs to try again.".format(name, owner, pick)
+
+def validate_draft_sheet_aux(catalog, sheet_df, memo=None):
+    ban_messages, all_bans_by_name = parse_bans_aux(catalog, sheet_df)
+    picks = extract_picks(sheet_df)
     all_picks = {}
     messages = []
-    for column in ["PICK 1", "PICK 2", "PICK 3", "PICK 4", "PICK 5", "PICK 6"]:
-        for index, value in sheet_df[column].items():
-            if pd.isna(value):
-                continue
-            result = match_pokemon(value, all_pokemon_names)
-            user_size = 15
-            value_size = 20
-            if len(result) == 0:
-                msg = f"{column:6s} {index:4d} {users[index][:user_size]:{user_size}s} {value[:value_size]:{value_size}s} {result} <----------------"
-                messages.append(msg)
-            elif result[0] != value:
-                msg = f"{column:6s} {index:4d} {users[index][:user_size]:{user_size}s} {value[:value_size]:{value_size}s} {result} <----------------"
-                messages.append(msg)
+    values = picks["value"].tolist()
+    matches = match_pokemon_batch(values, catalog, memo=memo)
+    for column, index, trainer, value in zip(picks["column"].tolist(), picks["row"].tolist(),
+                                             picks["trainer"].tolist(), values):
+        result = matches[value]
+        if len(result) == 0 or result[0] != value:
+            messages.append(pick_mismatch_message(column, index, trainer, value, result))
+        else:
+            if False:
+                pass
+            elif result[0] in all_picks:
+                messages.append(already_picked_message(result[0], all_picks[result[0]], [index, trainer, column]))
+            elif result[0] in all_bans_by_name:
+                messages.append(already_banned_message(result[0], all_bans_by_name[result[0]], [index, trainer, column]))
             else:
-                if False:
-                    pass
-                elif result[0] in all_picks:
-                    msg = "{} already picked by '{}'. '{}' needs to try again.".format(result[0], all_picks[result[0]], [index, users[index], column])
-                    messages.append(msg)
-                elif result[0] in all_bans_by_name:
-                    msg = "{} already banned by '{}'. '{}' needs to try again.".format(result[0], all_bans_by_name[result[0]], [index, users[index], column])
-                    messages.append(msg)
-                else:
-                    all_picks[result[0]] = [index, users[index], column]
+                all_picks[result[0]] = [index, trainer, column]
     return messages
 
 def validate_draft_sheet(db_file, sheet_url):
     df = read_public_google_sheet(sheet_url)
     try:
         db_manager = DatabaseManager(db_file)
-        ban_messages, all_bans_by_name = parse_bans_aux(db_manager, df)
-        messages = validate_draft_sheet_aux(db_manager, df)
+        catalog = SpeciesCatalog(db_manager)
+        memo = MatchMemo(catalog, db_manager)
+        ban_messages, all_bans_by_name = parse_bans_aux(catalog, df)
+        messages = validate_draft_sheet_aux(catalog, df, memo=memo)
         for m in ban_messages:
             print(m)
         for m in messages:
@@ -77,15 +110,14 @@ def validate_draft_sheet(db_file, sheet_url):
     return
 
 
-def name_or_id_to_dex(value, all_pokemon):
+def name_or_id_to_dex(value, catalog):
     dex = -1
-    for p in all_pokemon:
-        if p.name.lower() == value.lower() or p.species_id_str.lower() == value.lower():
-            dex = p.dex_number
-            break
+    p = catalog.get_by_name_or_id(value)
+    if p is not None:
+        dex = p.dex_number
     return dex
 
-def ban_to_dex_numbers(value, all_pokemon):
+def ban_to_dex_numbers(value, catalog):
     """
     Given cell's entry for the ban column,
     return a list of dex numbers.
@@ -95,25 +127,22 @@ def ban_to_dex_numbers(value, all_pokemon):
     """
     dexes = []
     for v in value.split(","):
-        dex = name_or_id_to_dex(v, all_pokemon)
+        dex = name_or_id_to_dex(v, catalog)
         if (dex >= 0) and (dex not in dexes):
             dexes.append(dex)
     return dexes
 
-def dexes_to_species_id_strings(dexes, all_pokemon):
+def dexes_to_species_id_strings(dexes, catalog):
     species_id_strings = []
     names = []
     for dex in dexes:
-        for p in all_pokemon:
-            if p.dex_number == dex:
-                species_id_strings.append(p.species_id_str)
-                names.append(p.name)
+        for p in catalog.get_by_dex(dex):
+            species_id_strings.append(p.species_id_str)
+            names.append(p.name)
     species_id_strings = sorted(species_id_strings)
     return species_id_strings, names
 
-def parse_bans_aux(db_manager, sheet_df):
-    all_pokemon = db_manager.get_all_pokemon_species()
-    all_pokemon_names = [p.name for p in all_pokemon]
+def parse_bans_aux(catalog, sheet_df):
     users = sheet_df["Trainer"]
     all_bans = {}
     all_bans_by_name = {}
@@ -127,8 +156,8 @@ def parse_bans_aux(db_manager, sheet_df):
             if pd.isna(value):
                 continue
 
-            dexes = ban_to_dex_numbers(value, all_pokemon)
-            species_id_strings, species_names = dexes_to_species_id_strings(dexes, all_pokemon)
+            dexes = ban_to_dex_numbers(value, catalog)
+            species_id_strings, species_names = dexes_to_species_id_strings(dexes, catalog)
             species_id_strings_to_names = dict(zip(species_id_strings, species_names))
             best_ban_string = ",".join(species_id_strings)
             current_ban_string = value.lower()
@@ -161,7 +190,8 @@ def parse_bans(db_file, sheet_url):
     df = read_public_google_sheet(sheet_url)
     try:
         db_manager = DatabaseManager(db_file)
-        messages, all_bans_by_name = parse_bans_aux(db_manager, df)
+        catalog = SpeciesCatalog(db_manager)
+        messages, all_bans_by_name = parse_bans_aux(catalog, df)
         for m in messages:
             print(m)
     except FileNotFoundError:
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+
+import hashlib
+from typing import Dict, List, Optional
+from ..database.models.pokemon_species import PokemonSpecies
+from .trigram_index import TrigramIndex
+
+
+class SpeciesCatalog:
+    """
+    An in-memory copy of the pokemon_species table with hash indexes.
+
+    The catalog is built once from DatabaseManager.get_all_pokemon_species()
+    and answers name, species_id_str and dex number lookups in O(1).
+    All keys are case-folded.
+
+    trigram_index maps names and species_id_strs to positions in names.
+    It is built the first time fuzzy matching asks for it.
+
+    Positions in species are also the bit numbers of the draft engine's
+    bitsets; position_of() and dex_mask() translate to them.
+
+    version is a hash of the catalog's contents. It changes whenever a
+    reload brings in different species, so anything cached against the
+    catalog can tell when it is stale.
+    """
+
+    def __init__(self, db_manager=None, species: Optional[List[PokemonSpecies]] = None):
+        """
+        Initializes the catalog.
+
+        Args:
+            db_manager (DatabaseManager, optional): Source of the species rows.
+            species (list, optional): Species to index instead of reading db_manager.
+        """
+        self.db_manager = db_manager
+        self.version = ""
+        self.species: List[PokemonSpecies] = []
+        self.names: List[str] = []
+        self.by_exact_name: Dict[str, PokemonSpecies] = {}
+        self.by_name: Dict[str, PokemonSpecies] = {}
+        self.by_species_id_str: Dict[str, PokemonSpecies] = {}
+        self.by_name_or_id: Dict[str, PokemonSpecies] = {}
+        self.by_dex: Dict[int, List[PokemonSpecies]] = {}
+        self.position_by_species_id_str: Dict[str, int] = {}
+        self.dex_masks: Dict[int, int] = {}
+        self._trigram_index: Optional[TrigramIndex] = None
+        if species is not None:
+            self._build(species)
+        elif db_manager is not None:
+            self.reload()
+        return
+
+    def reload(self, db_manager=None):
+        """
+        Rebuilds every index from the database.
+
+        Args:
+            db_manager (DatabaseManager, optional): Replaces the stored manager.
+        """
+        if db_manager is not None:
+            self.db_manager = db_manager
+        self._build(self.db_manager.get_all_pokemon_species())
+        return
+
+    def _build(self, species: List[PokemonSpecies]):
+        """
+        Builds the indexes. Table order is kept so that the first row wins
+        whenever two rows share a key, as the old linear scans did.
+        """
+        by_exact_name = {}
+        by_name = {}
+        by_species_id_str = {}
+        by_name_or_id = {}
+        by_dex = {}
+        position_by_species_id_str = {}
+        dex_masks = {}
+        digest = hashlib.sha1()
+        for position, p in enumerate(species):
+            digest.update(f"{p.species_id}\t{p.name}\t{p.species_id_str}\t{p.dex_number}\n".encode("utf-8"))
+            name_key = p.name.casefold()
+            id_key = p.species_id_str.casefold()
+            by_exact_name.setdefault(p.name, p)
+            by_name.setdefault(name_key, p)
+            by_species_id_str.setdefault(id_key, p)
+            by_name_or_id.setdefault(name_key, p)
+            by_name_or_id.setdefault(id_key, p)
+            by_dex.setdefault(p.dex_number, []).append(p)
+            position_by_species_id_str.setdefault(id_key, position)
+            dex_masks[p.dex_number] = dex_masks.get(p.dex_number, 0) | (1 << position)
+        self.species = list(species)
+        self.names = [p.name for p in self.species]
+        self.by_exact_name = by_exact_name
+        self.by_name = by_name
+        self.by_species_id_str = by_species_id_str
+        self.by_name_or_id = by_name_or_id
+        self.by_dex = by_dex
+        self.position_by_species_id_str = position_by_species_id_str
+        self.dex_masks = dex_masks
+        self._trigram_index = None
+        self.version = digest.hexdigest()
+        return
+
+    @property
+    def trigram_index(self) -> TrigramIndex:
+        """
+        The trigram index over every name and species_id_str, built on first use.
+        """
+        if self._trigram_index is None:
+            index = TrigramIndex()
+            for position, p in enumerate(self.species):
+                index.add(p.name, position)
+                index.add(p.species_id_str, position)
+            self._trigram_index = index
+        return self._trigram_index
+
+    def get_by_name(self, name: str) -> Optional[PokemonSpecies]:
+        """
+        Returns the species whose name matches, ignoring case.
+        """
+        return self.by_name.get(name.casefold())
+
+    def get_by_species_id_str(self, species_id_str: str) -> Optional[PokemonSpecies]:
+        """
+        Returns the species whose species_id_str matches, ignoring case.
+        """
+        return self.by_species_id_str.get(species_id_str.casefold())
+
+    def get_by_name_or_id(self, value: str) -> Optional[PokemonSpecies]:
+        """
+        Returns the species whose name or species_id_str matches, ignoring case.
+        """
+        return self.by_name_or_id.get(value.casefold())
+
+    def get_by_dex(self, dex_number: int) -> List[PokemonSpecies]:
+        """
+        Returns every species sharing the dex number, in table order.
+        """
+        return self.by_dex.get(dex_number, [])
+
+    def position_of(self, species_id_str: str) -> Optional[int]:
+        """
+        Returns the position in species of the row with this species_id_str, ignoring case.
+        """
+        return self.position_by_species_id_str.get(species_id_str.casefold())
+
+    def dex_mask(self, dex_number: int) -> int:
+        """
+        Returns a bitset with the position of every species sharing the dex number.
+        """
+        return self.dex_masks.get(dex_number, 0)
+
+    def __len__(self):
+        return len(self.species)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import rapidfuzz
+
+from .match_memo import normalize_pick_text
+
+def match_pokemon_batch(values, catalog, score_cutoff: Optional[float] = None, workers: int = -1,
+                        memo=None) -> Dict[str, List[str]]:
+    """
+    Resolves many raw sheet cells against the catalog's species names at once.
+
+    Exact and case-folded hits come straight from the catalog's dicts.
+    Everything else is scored against all names in a single
+    rapidfuzz.process.cdist call, which picks the same best fit as one
+    extractOne call per cell. With a memo, spellings resolved on earlier
+    runs skip scoring entirely.
+
+    Args:
+        values (iterable): Raw cell strings.
+        catalog (SpeciesCatalog): The species to match against.
+        score_cutoff (float, optional): Scores below this are not a match.
+        workers (int): Number of cores cdist may use, -1 for all of them.
+        memo (MatchMemo, optional): Remembers fuzzy results between calls.
+
+    Returns:
+        A dict of value -> list of fits, the same shape match_pokemon returns.
+        The list is empty when nothing reaches score_cutoff.
+    """
+    results = {}
+    pending = []
+    exact_names = catalog.by_exact_name
+    for value in values:
+        if value in results:
+            continue
+        if value in exact_names:
+            results[value] = [value]
+            continue
+        p = catalog.get_by_name(value)
+        if p is not None:
+            results[value] = [p.name]
+            continue
+        results[value] = []
+        pending.append(value)
+
+    choices = catalog.names
+    if len(pending) == 0 or len(choices) == 0:
+        return results
+
+    # whitespace does not change a token_sort_ratio score, so score each spelling once
+    queries = {}
+    for value in pending:
+        queries.setdefault(normalize_pick_text(value), []).append(value)
+    known = memo.get_many(queries) if memo is not None else {}
+    unknown = [query for query in queries if query not in known]
+
+    found = dict(known)
+    computed = {}
+    if len(unknown) > 0:
+        scores = rapidfuzz.process.cdist(unknown, choices,
+                                         scorer=rapidfuzz.fuzz.token_sort_ratio,
+                                         score_cutoff=score_cutoff,
+                                         dtype=np.float64,
+                                         workers=workers)
+        best = np.argmax(scores, axis=1)
+        for row, query in enumerate(unknown):
+            column = best[row]
+            score = float(scores[row, column])
+            if score_cutoff and score < score_cutoff:
+                continue
+            computed[query] = (choices[column], score)
+
+    if memo is not None and len(computed) > 0:
+        memo.put_many(computed)
+    found.update(computed)
+
+    for query, (best_match, score) in found.items():
+        if score_cutoff and score < score_cutoff:
+            continue
+        for value in queries[query]:
+            results[value] = [best_match]
+    return results
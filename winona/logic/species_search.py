@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+from bisect import bisect_left
+from typing import List, Optional
+
+from ..database.models.pokemon_species import PokemonSpecies
+from .trigram_index import TOKEN_SPLIT_PATTERN
+
+DEFAULT_SEARCH_LIMIT = 25
+
+class SpeciesSearch:
+    """
+    Answers species autocomplete queries from in-memory indexes.
+
+    Typed text is looked up in three passes, and each pass only adds species
+    the earlier ones did not find:
+
+    1. names and species_id_strs that start with the text, from a sorted array,
+    2. names with a later word that starts with the text ("galar" finds
+       "Stunfisk (Galarian)"), from a second sorted array,
+    3. the catalog's trigram index, for misspellings.
+
+    The arrays are rebuilt whenever the catalog's version changes.
+    """
+
+    def __init__(self, catalog):
+        """
+        Initializes the search.
+
+        Args:
+            catalog (SpeciesCatalog): The species to search.
+        """
+        self.catalog = catalog
+        self._version = None
+        self._full_keys: List[str] = []
+        self._full_positions: List[int] = []
+        self._word_keys: List[str] = []
+        self._word_positions: List[int] = []
+        self._by_name: List[int] = []
+        return
+
+    def _check_version(self):
+        if self._version == self.catalog.version:
+            return
+        full = []
+        words = []
+        for position, p in enumerate(self.catalog.species):
+            name_key = p.name.casefold()
+            full.append((name_key, position))
+            full.append((p.species_id_str.casefold(), position))
+            for token in TOKEN_SPLIT_PATTERN.split(name_key)[1:]:
+                if token:
+                    words.append((token, position))
+        full.sort()
+        words.sort()
+        self._full_keys = [key for key, position in full]
+        self._full_positions = [position for key, position in full]
+        self._word_keys = [key for key, position in words]
+        self._word_positions = [position for key, position in words]
+        self._by_name = sorted(range(len(self.catalog.species)),
+                               key=lambda position: self.catalog.names[position].casefold())
+        self._version = self.catalog.version
+        return
+
+    @staticmethod
+    def _prefix_range(keys, positions, prefix):
+        """
+        Yields the positions whose key starts with prefix, in key order.
+        """
+        i = bisect_left(keys, prefix)
+        while i < len(keys) and keys[i].startswith(prefix):
+            yield positions[i]
+            i += 1
+        return
+
+    def search(self, text: str, shadow: Optional[bool] = None, mega: Optional[bool] = None,
+               region: Optional[str] = None, limit: int = DEFAULT_SEARCH_LIMIT) -> List[PokemonSpecies]:
+        """
+        Returns the species that best complete text.
+
+        Args:
+            text (str): What the user has typed so far.
+            shadow (bool, optional): Only shadow (True) or only non-shadow (False) species.
+            mega (bool, optional): Only mega (True) or only non-mega (False) species.
+            region (str, optional): Only species of this region, e.g. "Galarian".
+                                    An empty string means species without a region.
+            limit (int): Most species to return.
+
+        Returns:
+            A list of PokemonSpecies, best completion first.
+        """
+        self._check_version()
+        species = self.catalog.species
+        region_key = region.casefold() if region is not None else None
+
+        def allowed(p):
+            if shadow is not None and bool(p.shadow) != shadow:
+                return False
+            if mega is not None and bool(p.mega) != mega:
+                return False
+            if region_key is not None and (p.region or "").casefold() != region_key:
+                return False
+            return True
+
+        found = []
+        seen = set()
+
+        def take(positions):
+            for position in positions:
+                if len(found) >= limit:
+                    return
+                if position in seen:
+                    continue
+                seen.add(position)
+                p = species[position]
+                if allowed(p):
+                    found.append(p)
+            return
+
+        query = " ".join(text.casefold().split())
+        if query == "":
+            take(self._by_name)
+            return found
+
+        take(self._prefix_range(self._full_keys, self._full_positions, query))
+        take(self._prefix_range(self._word_keys, self._word_positions, query))
+        if len(found) < limit:
+            # filtering may reject many candidates, so ask for more than are needed
+            ranked = self.catalog.trigram_index.ranked(query, limit=4 * limit)
+            take(position for position, similarity in ranked)
+        return found
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+import re
+from collections import Counter
+from itertools import chain
+from typing import Dict, Iterable, List, Set, Tuple
+
+TOKEN_SPLIT_PATTERN = re.compile(r"[\s_()]+")
+
+def trigrams(text: str) -> Set[str]:
+    """
+    Returns the case-folded character trigrams of every token in text.
+
+    Tokens are padded ("  ab " -> "  a", " ab", "ab ") so short words and
+    word starts still produce trigrams. Splitting on spaces, underscores and
+    parentheses makes "Stunfisk (Galarian)" and "stunfisk_galarian" share
+    all their trigrams, and word order does not matter, just like
+    token_sort_ratio.
+    """
+    grams = set()
+    for token in TOKEN_SPLIT_PATTERN.split(text.casefold()):
+        if not token:
+            continue
+        padded = f"  {token} "
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+
+class TrigramIndex:
+    """
+    An inverted index from character trigram to the strings containing it.
+
+    Each indexed string points at a target, typically a position in a list
+    of names, and several strings may share a target. ranked() orders
+    targets by trigram similarity to a query, which finds misspelled names
+    without scoring every name.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, int]] = ()):
+        """
+        Initializes the index.
+
+        Args:
+            entries (iterable): (text, target) pairs to index.
+        """
+        self._postings: Dict[str, List[int]] = {}
+        self._sizes: List[int] = []
+        self._targets: List[int] = []
+        for text, target in entries:
+            self.add(text, target)
+        return
+
+    def add(self, text: str, target: int):
+        """
+        Indexes text as another way to reach target.
+        """
+        entry = len(self._targets)
+        grams = trigrams(text)
+        self._targets.append(target)
+        self._sizes.append(len(grams))
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(entry)
+        return
+
+    def ranked(self, query: str, limit: int = 32, min_similarity: float = 0.2) -> List[Tuple[int, float]]:
+        """
+        Returns the targets most similar to query, best first.
+
+        Similarity is the Dice coefficient of the trigram sets. A target's
+        score is its best score over all the strings indexed for it.
+        Equal scores are broken by target order.
+
+        Args:
+            query (str): The text to look up.
+            limit (int): Most targets to return.
+            min_similarity (float): Targets scoring below this are dropped.
+
+        Returns:
+            A list of (target, similarity), empty if nothing shares enough trigrams.
+        """
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        postings = self._postings
+        overlap = Counter(chain.from_iterable(postings[gram] for gram in query_grams if gram in postings))
+
+        best: Dict[int, float] = {}
+        query_size = len(query_grams)
+        sizes = self._sizes
+        targets = self._targets
+        for entry, count in overlap.items():
+            similarity = 2.0 * count / (query_size + sizes[entry])
+            if similarity < min_similarity:
+                continue
+            target = targets[entry]
+            if similarity > best.get(target, 0.0):
+                best[target] = similarity
+
+        ranked = sorted(best, key=lambda target: (-best[target], target))[:limit]
+        return [(target, best[target]) for target in ranked]
+
+    def __len__(self):
+        return len(self._targets)
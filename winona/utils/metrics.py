@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# upper bounds in seconds, from a fast autocomplete reply to a slow sheet download
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def make_labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(labels)
+    if extra is not None:
+        items.append(extra)
+    if not items:
+        return ""
+    escaped = [(key, value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+               for key, value in items]
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Histogram:
+    """
+    Counts observations into fixed buckets, as Prometheus histograms do.
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # counts[i] observations fell in (buckets[i-1], buckets[i]]; the last slot is +Inf
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        return
+
+    def observe(self, value: float):
+        i = 0
+        while i < len(self.buckets) and value > self.buckets[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+        return
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """
+        Returns (upper bound, observations at or below it) for every bucket, ending with +Inf.
+        """
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, fraction: float) -> float:
+        """
+        Estimates a quantile as the upper bound of the bucket it falls in.
+        Observations beyond the last bucket report the last bound.
+        """
+        if self.count == 0:
+            return 0.0
+        target = fraction * self.count
+        for bound, total in self.cumulative():
+            if total >= target:
+                return bound if bound != float("inf") else self.buckets[-1]
+        return self.buckets[-1]
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+
+class Metrics:
+    """
+    Counters and histograms keyed by metric name and labels, rendered in the Prometheus text format.
+
+    Safe to update from the event loop and from database threads. Values
+    owned by other objects, such as cache hit counts, are read when the
+    metrics are rendered through collectors added with add_collector().
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.started_at = time.time()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._help: Dict[str, str] = {}
+        self._collectors: List[Callable[[], Iterable[tuple]]] = []
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        return
+
+    def describe(self, name: str, help_text: str):
+        """
+        Sets the HELP text rendered for a metric.
+        """
+        self._help[name] = help_text
+        return
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = make_labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+        return
+
+    def observe(self, name: str, value: float, **labels):
+        key = make_labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = Histogram(self.buckets)
+                series[key] = histogram
+            histogram.observe(value)
+        return
+
+    @contextmanager
+    def time(self, name: str, **labels):
+        """
+        Observes the seconds spent in the block, whether or not it raises.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def add_collector(self, collector: Callable[[], Iterable[tuple]]):
+        """
+        Adds a function returning (name, kind, labels dict, value) tuples, called at render time.
+        kind is "counter" or "gauge".
+        """
+        self._collectors.append(collector)
+        return
+
+    def counter(self, name: str, **labels) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(make_labels(labels), 0)
+
+    def counters(self, name: str) -> Dict[Labels, float]:
+        with self._lock:
+            return dict(self._counters.get(name, {}))
+
+    def histograms(self, name: str) -> Dict[Labels, Histogram]:
+        """
+        Returns copies of a metric's histograms by labels.
+        """
+        with self._lock:
+            result = {}
+            for key, histogram in self._histograms.get(name, {}).items():
+                copy = Histogram(histogram.buckets)
+                copy.counts = list(histogram.counts)
+                copy.count = histogram.count
+                copy.sum = histogram.sum
+                result[key] = copy
+            return result
+
+    def collected(self) -> Dict[str, Tuple[str, Dict[Labels, float]]]:
+        """
+        Runs the collectors. Returns name -> (kind, {labels: value}).
+        """
+        result = {}
+        for collector in self._collectors:
+            try:
+                for name, kind, labels, value in collector():
+                    result.setdefault(name, (kind, {}))[1][make_labels(labels)] = value
+            except Exception as e:
+                print(f"Metrics collector failed: {e}")
+        return result
+
+    def render_prometheus(self) -> str:
+        """
+        Returns every metric in the Prometheus text exposition format.
+        """
+        lines = []
+
+        def header(name, kind):
+            if name in self._help:
+                lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        header("winona_uptime_seconds", "gauge")
+        lines.append(f"winona_uptime_seconds {format_value(round(time.time() - self.started_at, 3))}")
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+        for name in sorted(counters):
+            header(name, "counter")
+            for labels, value in sorted(counters[name].items()):
+                lines.append(f"{name}{format_labels(labels)} {format_value(value)}")
+        for name, (kind, series) in sorted(self.collected().items()):
+            header(name, kind)
+            for labels, value in sorted(series.items()):
+                lines.append(f"{name}{format_labels(labels)} {format_value(value)}")
+        for name in sorted(self._histograms):
+            header(name, "histogram")
+            for labels, histogram in sorted(self.histograms(name).items()):
+                for bound, total in histogram.cumulative():
+                    bucket_labels = format_labels(labels, ("le", format_value(bound)))
+                    lines.append(f"{name}_bucket{bucket_labels} {total}")
+                lines.append(f"{name}_sum{format_labels(labels)} {format_value(round(histogram.sum, 6))}")
+                lines.append(f"{name}_count{format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """
+        Writes the metrics to path, replacing it atomically so readers never see half a file.
+        Suitable for node_exporter's textfile collector.
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp_path, path)
+        return
+
+    def start_http_server(self, port: int, host: str = "127.0.0.1"):
+        """
+        Serves the metrics at http://host:port/metrics from a daemon thread.
+        """
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+
+            def log_message(self, format, *args):
+                return
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        thread = threading.Thread(target=self._server.serve_forever, name="winona-metrics", daemon=True)
+        thread.start()
+        return
+
+    def stop_http_server(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        return